@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 原子写入
+先写同目录下的临时文件，完成后 os.replace 到目标路径，
+读者要么看到旧文件，要么看到完整的新文件
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+from scan_model import json_default
+
+
+@contextmanager
+def atomic_open(path, mode="w", encoding="utf-8"):
+    """以原子替换方式打开待写文件，退出 with 块时才生效"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        kwargs = {} if "b" in mode else {"encoding": encoding}
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp 创建的文件权限为 0600，改为常规的 0644 方便 Web 服务读取
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path, text, encoding="utf-8"):
+    """原子写入文本文件"""
+    with atomic_open(path, "w", encoding=encoding) as f:
+        f.write(text)
+
+
+def _dumps(value, pretty):
+    # 项目可以是 scan_model 对象，由 json_default 转换
+    if pretty:
+        return json.dumps(value, indent=2, ensure_ascii=False, default=json_default)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=json_default)
+
+
+def write_dashboard_json(path, projects, meta=None, pretty=False):
+    """流式写出看板数据 {"projects": [...], **meta}
+
+    projects 可以是任意可迭代对象（包括生成器），逐个项目编码后写入，
+    内存中同时只保留一个项目的编码结果；pretty=True 时输出缩进格式便于调试
+    """
+    meta = meta or {}
+    count = 0
+    with atomic_open(path) as f:
+        f.write('{\n  "projects": [' if pretty else '{"projects":[')
+        for project in projects:
+            chunk = _dumps(project, pretty)
+            if pretty:
+                chunk = "\n    " + chunk.replace("\n", "\n    ")
+            f.write(("," if count else "") + chunk)
+            count += 1
+        if pretty:
+            f.write("\n  ]" if count else "]")
+        else:
+            f.write("]")
+        for key, value in meta.items():
+            if pretty:
+                value_text = _dumps(value, True).replace("\n", "\n  ")
+                f.write(f',\n  {_dumps(key, False)}: {value_text}')
+            else:
+                f.write(f',{_dumps(key, False)}:{_dumps(value, False)}')
+        f.write("\n}\n" if pretty else "}")
+    return count
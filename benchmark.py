@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 性能基准
+在临时目录中生成参数化的合成扫描数据（N 个项目 × M 个目标 × 各工具文件），
+分阶段计时收集、聚合、序列化、渲染和同步，并记录峰值内存，
+结果保存为 JSON，便于跨提交比较
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import dashboard
+import data_collector
+import sync_github
+from atomic_writer import write_dashboard_json
+from binary_snapshot import load_snapshot, write_snapshot
+from scan_model import Project
+from search_index import SearchIndex
+
+# 合成数据用到的素材
+ENDPOINT_WORDS = ["api", "v1", "v2", "login", "admin", "search", "users", "orders",
+                  "hotels", "reviews", "graphql", "static", "upload", "export", "health"]
+VULN_TITLES = ["X-Frame-Options missing", "Apache negotiation", "Server-Leaks-Information via X-Powered-By",
+               "Cookie without HttpOnly flag", "Directory indexing found", "Outdated TLS version",
+               "Strict-Transport-Security missing", "Content-Security-Policy missing"]
+COMMON_PORTS = [21, 22, 25, 53, 80, 110, 143, 443, 445, 993, 995, 3306, 5432, 6379, 8080, 8443, 9200]
+STATUSES = ["pending", "scanning", "completed"]
+
+
+def generate_fleet(root, projects, targets, endpoints, vulns, ports, seed=0):
+    """在 root 下生成合成目标文件和工具文件，返回 (targets_file, scan_dir)"""
+    rng = random.Random(seed)
+    scan_dir = os.path.join(root, "scans")
+    os.makedirs(scan_dir, exist_ok=True)
+
+    configs = []
+    for p in range(projects):
+        urls = [f"t{t}.project{p}.example.com" for t in range(targets)]
+        configs.append({"name": f"Project {p:05d}", "targets": urls})
+        for url in urls:
+            status = rng.choice(STATUSES)
+            progress = 100 if status == "completed" else (0 if status == "pending" else rng.randint(1, 99))
+            eps = ["/" + "/".join(rng.sample(ENDPOINT_WORDS, 2)) for _ in range(endpoints)]
+            found_vulns = [f"{rng.choice(VULN_TITLES)} on /{rng.choice(ENDPOINT_WORDS)}" for _ in range(vulns)]
+            open_ports = rng.sample(COMMON_PORTS, min(ports, len(COMMON_PORTS)))
+            files = {
+                "strix": {"status": status, "progress": progress, "endpoints_scanned": rng.randint(0, 5000),
+                          "endpoints_found": len(eps), "discovered_endpoints": eps},
+                "nikto": {"status": status, "progress": progress, "items_scanned": rng.randint(0, 500),
+                          "vulns_found": len(found_vulns), "vulnerabilities": found_vulns},
+                "nmap": {"status": status, "progress": progress, "ports_scanned": 1000,
+                         "open_ports": len(open_ports), "open_ports_list": open_ports},
+            }
+            for tool, content in files.items():
+                with open(os.path.join(scan_dir, f"{url}_{tool}.json"), "w") as f:
+                    json.dump(content, f)
+
+    targets_file = os.path.join(root, "targets.json")
+    with open(targets_file, "w") as f:
+        json.dump({"projects": configs}, f)
+    return targets_file, scan_dir
+
+
+def _peak_rss_kb():
+    """进程峰值常驻内存 (KB)，macOS 上 ru_maxrss 单位为字节"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _git_revision():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+class StageTimer:
+    """记录各阶段耗时（多次取最小值）和阶段结束时的峰值内存"""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        sink = io.StringIO()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(sink):
+            yield
+        elapsed = time.perf_counter() - started
+        entry = self.stages.setdefault(name, {"seconds": elapsed, "runs": 0})
+        entry["seconds"] = min(entry["seconds"], elapsed)
+        entry["runs"] += 1
+        entry["peak_rss_kb"] = _peak_rss_kb()
+
+
+def run_benchmark(projects=100, targets=20, endpoints=20, vulns=5, ports=5, workers=None,
+                  repeat=3, seed=0):
+    """生成合成数据并逐阶段计时，返回结果字典"""
+    if workers is None:
+        workers = data_collector.COLLECT_WORKERS
+    root = tempfile.mkdtemp(prefix="vuln_bench_")
+    saved = {name: getattr(data_collector, name)
+             for name in ("TARGETS_FILE", "OUTPUT_FILE", "SCAN_PROC_DIR", "SCAN_LOG_DIR", "SHARD_DIR")}
+    timer = StageTimer()
+
+    try:
+        with timer.stage("generate"):
+            targets_file, scan_dir = generate_fleet(root, projects, targets, endpoints, vulns, ports, seed)
+
+        data_collector.TARGETS_FILE = targets_file
+        data_collector.SCAN_PROC_DIR = scan_dir
+        # 不读取 /tmp 下真实扫描留下的日志
+        data_collector.SCAN_LOG_DIR = root
+        data_collector.OUTPUT_FILE = os.path.join(root, "dashboard_data.json")
+        data_collector.SHARD_DIR = os.path.join(root, "shards")
+
+        for _ in range(repeat):
+            with timer.stage("load"):
+                data_collector.load_targets()
+
+        for _ in range(repeat):
+            # 冷启动: 清空增量缓存
+            data_collector._SCAN_INDEX.clear()
+            data_collector._TOOL_CACHE.clear()
+            data_collector._PROJECT_CACHE.clear()
+            data_collector._TARGETS_CACHE.clear()
+            with timer.stage("collect"):
+                data = data_collector.collect_data(workers=workers)
+
+        for _ in range(repeat):
+            with timer.stage("collect_incremental"):
+                data_collector.collect_data(workers=workers)
+
+        projects_data = data["projects"]
+        for _ in range(repeat):
+            with timer.stage("aggregate"):
+                for project in projects_data:
+                    Project(project.name, project.targets)
+
+        for _ in range(repeat):
+            with timer.stage("search_index"):
+                search = SearchIndex()
+                search.update(projects_data)
+
+        for _ in range(repeat):
+            with timer.stage("search_query"):
+                search.facets(search.search("port:443 status:scanning"))
+
+        serialized = os.path.join(root, "serialized.json")
+        for _ in range(repeat):
+            with timer.stage("serialize"):
+                write_dashboard_json(serialized, projects_data, {"version": data["version"]})
+
+        for _ in range(repeat):
+            with timer.stage("json_load"):
+                with open(serialized, "r") as f:
+                    json.load(f)
+
+        snapshot = os.path.join(root, "snapshot.snap")
+        for _ in range(repeat):
+            with timer.stage("snapshot_write"):
+                write_snapshot(snapshot, projects_data, {"version": data["version"]})
+
+        for _ in range(repeat):
+            with timer.stage("snapshot_load"):
+                load_snapshot(snapshot)
+
+        for _ in range(repeat):
+            with timer.stage("render"):
+                html = dashboard.render_html({
+                    "cards": dashboard.build_cards(projects_data),
+                    "projects": projects_data,
+                    "status": {"strix": 0, "nikto": 0, "nmap": 0, "total": 0},
+                    "total": len(projects_data)
+                }, "assets/")
+
+        sync_html = os.path.join(root, "index.html")
+        for _ in range(repeat):
+            with timer.stage("sync_render"):
+                sync_github.write_simple_html(data, sync_html)
+
+        sizes = {
+            "data_json_bytes": os.path.getsize(data_collector.OUTPUT_FILE),
+            "snapshot_bytes": os.path.getsize(snapshot),
+            "dashboard_html_bytes": len(html.encode("utf-8")),
+            "sync_html_bytes": os.path.getsize(sync_html),
+        }
+    finally:
+        for name, value in saved.items():
+            setattr(data_collector, name, value)
+        data_collector._SCAN_INDEX.clear()
+        data_collector._TOOL_CACHE.clear()
+        data_collector._PROJECT_CACHE.clear()
+        data_collector._TARGETS_CACHE.clear()
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "params": {"projects": projects, "targets": targets, "endpoints": endpoints, "vulns": vulns,
+                   "ports": ports, "workers": workers, "repeat": repeat, "seed": seed},
+        "fleet": {"projects": projects, "targets": projects * targets,
+                  "tool_files": projects * targets * len(data_collector.SCAN_TOOLS)},
+        "stages": timer.stages,
+        "sizes": sizes,
+    }
+
+
+def print_results(results, baseline=None):
+    """打印结果；给出基准结果时同时显示耗时比值"""
+    fleet = results["fleet"]
+    print(f"Fleet: {fleet['projects']} projects, {fleet['targets']} targets, {fleet['tool_files']} tool files"
+          f" @ {results['revision'] or 'unknown'}")
+    base_stages = (baseline or {}).get("stages", {})
+    for name, stage in results["stages"].items():
+        line = f"  {name:<20} {stage['seconds'] * 1000:10.1f} ms   peak RSS {stage['peak_rss_kb'] / 1024:8.1f} MB"
+        base = base_stages.get(name)
+        if base and base["seconds"] > 0:
+            line += f"   x{stage['seconds'] / base['seconds']:.2f} vs {baseline.get('revision') or 'baseline'}"
+        print(line)
+    for name, size in results["sizes"].items():
+        print(f"  {name:<20} {size / 1024:10.1f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the collector and renderers on a synthetic fleet")
+    parser.add_argument("-p", "--projects", type=int, default=100, help="Number of projects (default: 100)")
+    parser.add_argument("-t", "--targets", type=int, default=20, help="Targets per project (default: 20)")
+    parser.add_argument("--endpoints", type=int, default=20, help="Strix endpoints per target (default: 20)")
+    parser.add_argument("--vulns", type=int, default=5, help="Nikto findings per target (default: 5)")
+    parser.add_argument("--ports", type=int, default=5, help="Open ports per target (default: 5)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Collector workers")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Runs per stage, best is kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic data")
+    parser.add_argument("-o", "--output", help="Write results JSON to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.projects, args.targets, args.endpoints, args.vulns, args.ports,
+                            args.workers, max(1, args.repeat), args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
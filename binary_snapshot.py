@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 紧凑二进制快照
+与 vuln_dashboard_data.json 内容相同的列式二进制格式:
+所有字符串（名称、状态、端点、漏洞描述）只存一份，工具的数值字段按列存为定长数组，
+列表条目存为字符串 ID（端口直接存整数）。读取端 mmap 文件，
+可以只解码单个项目，也可以直接从数值列计算卡片而不解码列表。
+不符合列类型的值（浮点进度、混合类型的端口列表、缺失的字段等）以 JSON 存入附加字段，
+解码结果与编码前完全相同
+"""
+
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from atomic_writer import atomic_open
+
+SNAPSHOT_FILE = "/tmp/vuln_dashboard_data.snap"
+
+MAGIC = b"VSNP"
+FORMAT_VERSION = 2
+
+# 头部: 魔数, 版本, 项目数, 目标数, 工具数, 列表条目数, 字符串数, 之后是各段偏移
+_HEADER = struct.Struct("<4sHxxIIIII")
+_SECTIONS = (
+    "meta", "string_offsets", "strings",
+    "p_name", "p_status", "p_progress", "p_updated", "p_first_target", "p_targets", "p_extra",
+    "t_name", "t_first_tool", "t_tools", "t_extra",
+    "tool_name", "tool_status", "tool_progress", "tool_scanned", "tool_found", "tool_eta",
+    "tool_list_kind", "tool_list_start", "tool_list_len", "tool_extra",
+    "items",
+)
+_OFFSETS = struct.Struct(f"<{len(_SECTIONS)}Q")
+
+# 工具列表字段，序号存入 tool_list_kind（0 表示没有列表）
+LIST_KINDS = ("", "endpoints", "vulns", "ports")
+# 端口列表中有非整数值时，端口按字符串 ID 存储
+PORTS_AS_STRINGS = len(LIST_KINDS)
+# 按列存储的字段，其余字段以 JSON 存入 *_extra
+_PROJECT_COLUMNS = {"name", "status", "progress", "last_updated", "targets"}
+_TARGET_COLUMNS = {"name", "tools"}
+_TOOL_COLUMNS = {"name", "status", "progress", "scanned", "found", "eta_seconds"} | set(LIST_KINDS[1:])
+
+# 列类型: I = uint32（下标、字符串 ID、端口），q = int64（数值字段）；eta 用 -1 表示没有
+_TYPECODES = {"p_progress": "q", "tool_progress": "q", "tool_scanned": "q", "tool_found": "q",
+              "tool_eta": "q", "tool_list_kind": "B"}
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+for _code in "IqB":
+    assert array(_code).itemsize == {"I": 4, "q": 8, "B": 1}[_code]
+
+
+def _column(name, values=()):
+    return array(_TYPECODES.get(name, "I"), values)
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def intern(self, value):
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return sid
+
+
+def _str_col(record, key, strings, overrides, absent):
+    """字符串列的值（字符串 ID）；缺失的字段记入 absent，非字符串记入 overrides"""
+    if key not in record:
+        absent.append(key)
+        return 0
+    value = record[key]
+    if type(value) is str:
+        return strings.intern(value)
+    overrides[key] = value
+    return 0
+
+
+def _int_col(record, key, overrides, absent):
+    """int64 列的值；缺失的字段记入 absent，非整数（浮点、布尔、None 等）或越界记入 overrides"""
+    if key not in record:
+        absent.append(key)
+        return 0
+    value = record[key]
+    if type(value) is int and _INT64_MIN <= value <= _INT64_MAX:
+        return value
+    overrides[key] = value
+    return 0
+
+
+def _extra(strings, overrides, absent):
+    """附加字段: 只有覆盖值时为 {键: 值}，有缺失的列字段时为 [{键: 值}, [缺失的键]]；都没有时为 0"""
+    if absent:
+        value = [overrides, absent]
+    elif overrides:
+        value = overrides
+    else:
+        return 0
+    return strings.intern(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+
+
+def _apply_extra(record, text):
+    value = json.loads(text)
+    if isinstance(value, list):
+        value, absent = value
+        for key in absent:
+            record.pop(key, None)
+    record.update(value)
+    return record
+
+
+def encode_snapshot(projects, meta=None):
+    """把项目列表编码为快照字节串"""
+    strings = _StringTable()
+    strings.intern("")
+    cols = {name: _column(name) for name in _SECTIONS[3:]}
+    items = cols["items"]
+
+    for project in projects:
+        p_over = {k: v for k, v in project.items() if k not in _PROJECT_COLUMNS}
+        p_absent = []
+        cols["p_name"].append(_str_col(project, "name", strings, p_over, p_absent))
+        cols["p_status"].append(_str_col(project, "status", strings, p_over, p_absent))
+        cols["p_progress"].append(_int_col(project, "progress", p_over, p_absent))
+        # 0（空串）表示没有 last_updated
+        updated = project.get("last_updated")
+        if "last_updated" in project and not (type(updated) is str and updated):
+            p_over["last_updated"] = updated
+            updated = None
+        cols["p_updated"].append(strings.intern(updated) if updated else 0)
+        cols["p_first_target"].append(len(cols["t_name"]))
+        targets = project.get("targets", [])
+        if "targets" not in project:
+            p_absent.append("targets")
+        elif type(targets) is not list:
+            p_over["targets"] = targets
+            targets = []
+        cols["p_targets"].append(len(targets))
+        cols["p_extra"].append(_extra(strings, p_over, p_absent))
+        for target in targets:
+            t_over = {k: v for k, v in target.items() if k not in _TARGET_COLUMNS}
+            t_absent = []
+            cols["t_name"].append(_str_col(target, "name", strings, t_over, t_absent))
+            cols["t_first_tool"].append(len(cols["tool_name"]))
+            tools = target.get("tools", [])
+            if "tools" not in target:
+                t_absent.append("tools")
+            elif type(tools) is not list:
+                t_over["tools"] = tools
+                tools = []
+            cols["t_tools"].append(len(tools))
+            cols["t_extra"].append(_extra(strings, t_over, t_absent))
+            for tool in tools:
+                over = {k: v for k, v in tool.items() if k not in _TOOL_COLUMNS}
+                absent = []
+                cols["tool_name"].append(_str_col(tool, "name", strings, over, absent))
+                cols["tool_status"].append(_str_col(tool, "status", strings, over, absent))
+                cols["tool_progress"].append(_int_col(tool, "progress", over, absent))
+                cols["tool_scanned"].append(_int_col(tool, "scanned", over, absent))
+                cols["tool_found"].append(_int_col(tool, "found", over, absent))
+                eta = tool.get("eta_seconds")
+                if "eta_seconds" in tool and not (type(eta) is int and 0 <= eta <= _INT64_MAX):
+                    over["eta_seconds"] = eta
+                    eta = None
+                cols["tool_eta"].append(-1 if eta is None else eta)
+
+                # 第一个列表字段按列存储，其余列表字段存入附加字段
+                field = next((f for f in LIST_KINDS[1:] if f in tool), None)
+                for other in LIST_KINDS[1:]:
+                    if other in tool and other != field:
+                        over[other] = tool[other]
+                kind = 0
+                values = tool.get(field) if field else None
+                if type(values) is list:
+                    if field == "ports" and all(type(v) is int and 0 <= v < 2 ** 32 for v in values):
+                        kind = 3
+                    elif all(type(v) is str for v in values):
+                        # 端口全部为字符串时按字符串 ID 存储
+                        kind = PORTS_AS_STRINGS if field == "ports" else LIST_KINDS.index(field)
+                if kind == 0:
+                    values = []
+                    if field:
+                        # 混合类型的列表或非列表值原样存入附加字段
+                        over[field] = tool[field]
+                cols["tool_list_start"].append(len(items))
+                cols["tool_list_len"].append(len(values))
+                if kind == 3:
+                    items.extend(values)
+                else:
+                    items.extend(strings.intern(v) for v in values)
+                cols["tool_list_kind"].append(kind)
+                cols["tool_extra"].append(_extra(strings, over, absent))
+
+    blobs = [value.encode("utf-8") for value in strings.values]
+    string_offsets = array("I", [0])
+    total = 0
+    for blob in blobs:
+        total += len(blob)
+        string_offsets.append(total)
+
+    sections = {
+        "meta": json.dumps(meta or {}, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        "string_offsets": string_offsets,
+        "strings": b"".join(blobs),
+    }
+    sections.update(cols)
+
+    header_size = _HEADER.size + _OFFSETS.size
+    offsets = []
+    chunks = []
+    position = header_size
+    for name in _SECTIONS:
+        data = sections[name]
+        if isinstance(data, array):
+            if sys.byteorder == "big":
+                data = array(data.typecode, data)
+                data.byteswap()
+            data = data.tobytes()
+        # 每段按 8 字节对齐，便于 memoryview.cast
+        padding = -position % 8
+        chunks.append(b"\0" * padding)
+        position += padding
+        offsets.append(position)
+        chunks.append(data)
+        position += len(data)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(cols["p_name"]), len(cols["t_name"]),
+                          len(cols["tool_name"]), len(items), len(strings.values))
+    return header + _OFFSETS.pack(*offsets) + b"".join(chunks)
+
+
+def write_snapshot(path, projects, meta=None):
+    """原子写入快照文件，返回字节数"""
+    data = encode_snapshot(projects, meta)
+    with atomic_open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+class SnapshotReader:
+    """mmap 快照文件，按需解码"""
+
+    def __init__(self, path=SNAPSHOT_FILE):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mm)
+        magic, version, n_projects, n_targets, n_tools, n_items, n_strings = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"not a dashboard snapshot (version {FORMAT_VERSION}): {path}")
+        offsets = _OFFSETS.unpack_from(self._buf, _HEADER.size)
+        self._offsets = dict(zip(_SECTIONS, offsets))
+        self._ends = dict(zip(_SECTIONS, offsets[1:] + (len(self._buf),)))
+        self.counts = {"projects": n_projects, "targets": n_targets, "tools": n_tools,
+                       "items": n_items, "strings": n_strings}
+        self._lengths = {"string_offsets": n_strings + 1, "items": n_items}
+        for name in _SECTIONS[3:-1]:
+            prefix = name.split("_", 1)[0]
+            self._lengths[name] = {"p": n_projects, "t": n_targets, "tool": n_tools}[prefix]
+        self._cols = {}
+        self._strings = {}
+        self._names = None
+
+    def close(self):
+        # 先释放各列视图，mmap 才能关闭
+        for column in self._cols.values():
+            if isinstance(column, memoryview):
+                column.release()
+        self._cols = {}
+        self._buf.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def col(self, name):
+        """数值列（memoryview 或小端转换后的 array）"""
+        column = self._cols.get(name)
+        if column is None:
+            typecode = _TYPECODES.get(name, "I")
+            start = self._offsets[name]
+            size = self._lengths[name] * array(typecode).itemsize
+            raw = self._buf[start:start + size]
+            if sys.byteorder == "big" and typecode != "B":
+                column = array(typecode, raw.tobytes())
+                column.byteswap()
+            else:
+                column = raw.cast(typecode)
+            self._cols[name] = column
+        return column
+
+    def string(self, sid):
+        value = self._strings.get(sid)
+        if value is None:
+            offsets = self.col("string_offsets")
+            base = self._offsets["strings"]
+            value = str(self._buf[base + offsets[sid]:base + offsets[sid + 1]], "utf-8")
+            self._strings[sid] = value
+        return value
+
+    def meta(self):
+        start = self._offsets["meta"]
+        return json.loads(str(self._buf[start:self._ends["meta"]], "utf-8").rstrip("\0"))
+
+    def project_names(self):
+        """项目名列表（只解码名称字符串）"""
+        if self._names is None:
+            self._names = [self.string(sid) for sid in self.col("p_name")]
+        return self._names
+
+    def find(self, name):
+        """项目序号，不存在时返回 None"""
+        try:
+            return self.project_names().index(name)
+        except ValueError:
+            return None
+
+    def _tool(self, i, string):
+        tool = {
+            "name": string(self.col("tool_name")[i]),
+            "status": string(self.col("tool_status")[i]),
+            "progress": self.col("tool_progress")[i],
+            "scanned": self.col("tool_scanned")[i],
+            "found": self.col("tool_found")[i],
+        }
+        kind = self.col("tool_list_kind")[i]
+        if kind:
+            start = self.col("tool_list_start")[i]
+            values = self.col("items")[start:start + self.col("tool_list_len")[i]]
+            if kind == 3:
+                tool["ports"] = list(values)
+            elif kind == PORTS_AS_STRINGS:
+                tool["ports"] = [string(v) for v in values]
+            else:
+                tool[LIST_KINDS[kind]] = [string(v) for v in values]
+        eta = self.col("tool_eta")[i]
+        if eta >= 0:
+            tool["eta_seconds"] = eta
+        extra = self.col("tool_extra")[i]
+        if extra:
+            _apply_extra(tool, string(extra))
+        return tool
+
+    def project(self, index):
+        """解码单个项目为看板 JSON 结构"""
+        string = self.string
+        first_target = self.col("p_first_target")[index]
+        targets = []
+        for t in range(first_target, first_target + self.col("p_targets")[index]):
+            first_tool = self.col("t_first_tool")[t]
+            target = {
+                "name": string(self.col("t_name")[t]),
+                "tools": [self._tool(i, string) for i in range(first_tool, first_tool + self.col("t_tools")[t])]
+            }
+            if self.col("t_extra")[t]:
+                _apply_extra(target, string(self.col("t_extra")[t]))
+            targets.append(target)
+        project = {
+            "name": string(self.col("p_name")[index]),
+            "status": string(self.col("p_status")[index]),
+            "progress": self.col("p_progress")[index],
+            "targets": targets
+        }
+        updated = self.col("p_updated")[index]
+        if updated:
+            project["last_updated"] = string(updated)
+        if self.col("p_extra")[index]:
+            _apply_extra(project, string(self.col("p_extra")[index]))
+        return project
+
+    def get(self, name):
+        """按名称解码单个项目，不存在时返回 None"""
+        index = self.find(name)
+        return None if index is None else self.project(index)
+
+    def projects(self):
+        for index in range(self.counts["projects"]):
+            yield self.project(index)
+
+    def load(self):
+        """完整数据 {"projects": [...], **meta}
+
+        一次性解码全部字符串、把各列转换为列表后组装，比逐个项目解码快得多。
+        组装期间暂停循环垃圾回收: 生成的都是无环的 dict/list，
+        大量分配触发的回收扫描反而占了大部分耗时
+        """
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._load()
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _load(self):
+        base = self._offsets["strings"]
+        blob = self._buf[base:base + self.col("string_offsets")[-1]].tobytes()
+        bounds = self.col("string_offsets").tolist()
+        strings = [blob[a:b].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+        col = lambda name: self.col(name).tolist()
+
+        items = col("items")
+        tool_names, tool_status = col("tool_name"), col("tool_status")
+        progress, scanned, found, eta = col("tool_progress"), col("tool_scanned"), col("tool_found"), col("tool_eta")
+        kinds, starts, lengths, extras = col("tool_list_kind"), col("tool_list_start"), col("tool_list_len"), col("tool_extra")
+        tools = []
+        for i in range(self.counts["tools"]):
+            tool = {
+                "name": strings[tool_names[i]],
+                "status": strings[tool_status[i]],
+                "progress": progress[i],
+                "scanned": scanned[i],
+                "found": found[i],
+            }
+            kind = kinds[i]
+            if kind:
+                values = items[starts[i]:starts[i] + lengths[i]]
+                if kind == 3:
+                    tool["ports"] = values
+                elif kind == PORTS_AS_STRINGS:
+                    tool["ports"] = [strings[v] for v in values]
+                else:
+                    tool[LIST_KINDS[kind]] = [strings[v] for v in values]
+            if eta[i] >= 0:
+                tool["eta_seconds"] = eta[i]
+            if extras[i]:
+                _apply_extra(tool, strings[extras[i]])
+            tools.append(tool)
+
+        t_names, t_first, t_count, t_extras = col("t_name"), col("t_first_tool"), col("t_tools"), col("t_extra")
+        targets = []
+        for t in range(self.counts["targets"]):
+            target = {"name": strings[t_names[t]], "tools": tools[t_first[t]:t_first[t] + t_count[t]]}
+            if t_extras[t]:
+                _apply_extra(target, strings[t_extras[t]])
+            targets.append(target)
+
+        projects = []
+        p_names, p_status, p_progress, p_updated = col("p_name"), col("p_status"), col("p_progress"), col("p_updated")
+        p_first, p_count, p_extras = col("p_first_target"), col("p_targets"), col("p_extra")
+        for index in range(self.counts["projects"]):
+            project = {
+                "name": strings[p_names[index]],
+                "status": strings[p_status[index]],
+                "progress": p_progress[index],
+                "targets": targets[p_first[index]:p_first[index] + p_count[index]]
+            }
+            if p_updated[index]:
+                project["last_updated"] = strings[p_updated[index]]
+            if p_extras[index]:
+                _apply_extra(project, strings[p_extras[index]])
+            projects.append(project)
+
+        data = {"projects": projects}
+        data.update(self.meta())
+        return data
+
+    def cards(self):
+        """只用数值列计算卡片摘要（名称、状态、进度、目标数、发现数），不解码列表"""
+        found = self.col("tool_found")
+        t_first, t_count = self.col("t_first_tool"), self.col("t_tools")
+        p_first, p_count = self.col("p_first_target"), self.col("p_targets")
+        status, progress = self.col("p_status"), self.col("p_progress")
+        p_extras, extras = self.col("p_extra"), self.col("tool_extra")
+        names = self.project_names()
+        result = []
+        for index in range(self.counts["projects"]):
+            first = p_first[index]
+            count = p_count[index]
+            total = 0
+            if count:
+                tool_start = t_first[first]
+                last = first + count - 1
+                tool_end = t_first[last] + t_count[last]
+                total = sum(found[tool_start:tool_end])
+                # 不是整数的 found 存在附加字段里，按解码后的值计入
+                for extra in extras[tool_start:tool_end]:
+                    if extra:
+                        value = _apply_extra({}, self.string(extra)).get("found")
+                        if isinstance(value, (int, float)) and not isinstance(value, bool):
+                            total += value
+            card = {
+                "name": names[index],
+                "status": self.string(status[index]),
+                "progress": progress[index],
+                "targetCount": count,
+                "found": total
+            }
+            if p_extras[index]:
+                override = _apply_extra({}, self.string(p_extras[index]))
+                for key in ("name", "status", "progress"):
+                    if key in override:
+                        card[key] = override[key]
+            result.append(card)
+        return result
+
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    """读取整个快照，返回与 JSON 数据文件相同的结构"""
+    with SnapshotReader(path) as reader:
+        return reader.load()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or export a binary dashboard snapshot")
+    parser.add_argument("path", nargs="?", default=SNAPSHOT_FILE, help=f"Snapshot file (default: {SNAPSHOT_FILE})")
+    parser.add_argument("--project", help="Decode and print a single project")
+    parser.add_argument("--json", action="store_true", help="Export the whole snapshot as JSON")
+    args = parser.parse_args()
+
+    with SnapshotReader(args.path) as reader:
+        if args.project:
+            print(json.dumps(reader.get(args.project), indent=2, ensure_ascii=False))
+        elif args.json:
+            print(json.dumps(reader.load(), indent=2, ensure_ascii=False))
+        else:
+            print(json.dumps(dict(reader.counts, bytes=os.path.getsize(args.path)), indent=2))
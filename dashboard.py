@@ -4,26 +4,49 @@
 从实际数据文件读取，支持实时更新
 """
 
+import gzip
 import json
-import subprocess
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
 
-def get_scan_status():
+from atomic_writer import atomic_open, atomic_write_text, write_dashboard_json
+from binary_snapshot import SNAPSHOT_FILE, load_snapshot
+from dashboard_assets import ASSETS, ASSET_TYPES, CSS_FILE, HTML_SHELL, JS_FILE, emit_assets
+from findings_diff import read_changes
+from findings_index import CANONICALIZERS, FindingsIndex
+from process_inventory import take_snapshot
+from scan_model import STATUS_TEXT, Project, json_default
+from search_index import SearchIndex
+
+def get_scan_status(snapshot=None):
     """获取扫描进程状态"""
     try:
-        result = subprocess.run(["ps", "aux"], capture_output=True, text=True)
-        strix = result.stdout.count("strix")
-        nikto = result.stdout.count("nikto")
-        nmap = result.stdout.count("nmap")
-        return {"strix": strix, "nikto": nikto, "nmap": nmap, "total": strix+nikto+nmap}
+        if snapshot is None:
+            snapshot = take_snapshot()
+        return snapshot.summary()
     except:
         return {"strix": 0, "nikto": 0, "nmap": 0, "total": 0}
 
 def load_projects():
-    """从数据文件加载项目"""
+    """从数据文件加载项目
+    
+    存在不旧于 JSON 的二进制快照（data_collector.py --snapshot）时优先读取快照
+    """
     data_file = "/tmp/vuln_dashboard_data.json"
     
+    try:
+        if not os.path.exists(data_file) or os.path.getmtime(SNAPSHOT_FILE) >= os.path.getmtime(data_file):
+            data = load_snapshot(SNAPSHOT_FILE)
+            if data.get("projects"):
+                return data
+    except (OSError, ValueError):
+        pass
+    
     # 如果文件不存在或为空，创建默认数据
     if not os.path.exists(data_file):
         return get_default_data()
@@ -38,6 +61,23 @@ def load_projects():
     
     return get_default_data()
 
+def load_manifest():
+    """加载分片清单（data_collector.py --shard 生成），不存在时返回 None"""
+    manifest_file = "/tmp/vuln_dashboard_shards/manifest.json"
+    
+    if not os.path.exists(manifest_file):
+        return None
+    
+    try:
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+            if manifest.get("projects"):
+                return manifest
+    except:
+        pass
+    
+    return None
+
 def get_default_data():
     """生成默认数据 - 从目标文件或生成模拟数据"""
     targets_file = "/tmp/vuln_targets.json"
@@ -90,420 +130,578 @@ def get_default_data():
                 }]
             })
     
-    return {"projects": projects}
+    return {"projects": [Project.from_dict(p) for p in projects]}
 
-def generate_dashboard():
-    status = get_scan_status()
-    data = load_projects()
-    projects = data.get("projects", [])
-    total = len(projects)
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # 生成项目数据JSON
-    projects_json = json.dumps(projects, ensure_ascii=False)
-    
-    # 生成卡片HTML数据
+def build_cards(projects):
+    """生成卡片数据，项目可以是 Project、完整数据或分片清单条目"""
     cards_data = []
     for i, p in enumerate(projects):
-        status_text = {"scanning": "扫描中", "done": "已完成", "waiting": "等待中", "completed": "已完成"}.get(p.get("status", ""), "未知")
-        cards_data.append({
+        if isinstance(p, Project):
+            # 汇总值在构建 Project 时已算好
+            cards_data.append(p.card(i))
+            continue
+        status_text = STATUS_TEXT.get(p.get("status", ""), "未知")
+        card = {
             "index": i,
             "name": p.get("name", "Unknown"),
             "status": p.get("status", "waiting"),
             "progress": p.get("progress", 0),
             "statusText": status_text,
-            "targetCount": len(p.get("targets", []))
-        })
-    
-    cards_json = json.dumps(cards_data, ensure_ascii=False)
-    
-    html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta http-equiv="refresh" content="60">
-    <title>🛡️ 漏洞扫描看板</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'SF Mono', 'Segoe UI', Roboto, sans-serif; background: #0d1117; color: #c9d1d9; min-height: 100vh; }}
-        
-        .header {{ background: linear-gradient(180deg, #161b22 0%, #0d1117 100%); padding: 20px 30px; border-bottom: 1px solid #30363d; display: flex; justify-content: space-between; align-items: center; }}
-        .header h1 {{ color: #58a9ff; font-size: 22px; font-weight: 600; }}
-        .header .time {{ color: #8b949e; font-size: 13px; }}
-        
-        .toolbar {{ padding: 15px 30px; background: #161b22; border-bottom: 1px solid #30363d; display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 15px; }}
-        .search-box {{ display: flex; align-items: center; gap: 10px; }}
-        .search-box input {{ background: #0d1117; border: 1px solid #30363d; border-radius: 6px; padding: 8px 12px; color: #c9d1d9; font-size: 13px; width: 200px; }}
-        .search-box input:focus {{ outline: none; border-color: #58a9ff; }}
-        .filter-btns {{ display: flex; gap: 8px; }}
-        .filter-btn {{ padding: 6px 14px; background: #21262d; border: 1px solid #30363d; border-radius: 6px; color: #c9d1d9; font-size: 12px; cursor: pointer; transition: all 0.2s; }}
-        .filter-btn:hover, .filter-btn.active {{ background: #238636; border-color: #3fb950; color: #fff; }}
-        
-        .stats-bar {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 1px; background: #30363d; }}
-        .stat {{ background: #161b22; padding: 15px 20px; text-align: center; }}
-        .stat-value {{ font-size: 28px; font-weight: 700; color: #58a9ff; }}
-        .stat-label {{ font-size: 11px; margin-top: 4px; color: #8b949e; text-transform: uppercase; }}
-        
-        .pagination-bar {{ padding: 15px 30px; background: #161b22; border-bottom: 1px solid #30363d; display: flex; justify-content: space-between; align-items: center; }}
-        .page-info {{ color: #8b949e; font-size: 13px; }}
-        .page-size select {{ background: #21262d; border: 1px solid #30363d; border-radius: 6px; padding: 6px 10px; color: #c9d1d9; font-size: 12px; cursor: pointer; }}
-        
-        .targets-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 16px; padding: 24px; }}
-        
-        .target-card {{ background: #161b22; border: 1px solid #30363d; border-radius: 10px; overflow: hidden; transition: all 0.25s; cursor: pointer; }}
-        .target-card:hover {{ border-color: #58a9ff; transform: translateY(-3px); box-shadow: 0 8px 25px rgba(0,0,0,0.4); }}
-        .target-card.hidden {{ display: none; }}
-        .target-card.scanning, .target-card.running {{ border-left: 4px solid #3fb950; }}
-        .target-card.done, .target-card.completed {{ border-left: 4px solid #58a9ff; }}
-        .target-card.waiting {{ border-left: 4px solid #f0883e; }}
-        
-        .card-header {{ padding: 16px; background: #21262d; display: flex; justify-content: space-between; align-items: center; }}
-        .card-title {{ font-size: 15px; font-weight: 600; color: #58a9ff; }}
-        .status-badge {{ padding: 4px 10px; border-radius: 12px; font-size: 11px; font-weight: 500; }}
-        .status-badge.scanning, .status-badge.running {{ background: #238636; color: #fff; }}
-        .status-badge.done, .status-badge.completed {{ background: #58a9ff; color: #fff; }}
-        .status-badge.waiting {{ background: #f0883e; color: #000; }}
-        
-        .card-body {{ padding: 16px; }}
-        .progress-row {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px; }}
-        .progress-label {{ font-size: 12px; color: #8b949e; }}
-        .progress-value {{ font-size: 14px; font-weight: 700; color: #3fb950; }}
-        .progress-bar {{ height: 8px; background: #30363d; border-radius: 4px; overflow: hidden; }}
-        .progress-fill {{ height: 100%; background: linear-gradient(90deg, #3fb950, #58a9ff); border-radius: 4px; transition: width 0.5s ease; }}
-        
-        .target-count {{ margin-top: 12px; font-size: 12px; color: #8b949e; }}
-        
-        /* Modal */
-        .modal-overlay {{ display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0,0,0,0.85); z-index: 9999; align-items: center; justify-content: center; }}
-        .modal-overlay.show {{ display: flex; }}
-        .modal {{ background: #161b22; border: 1px solid #30363d; border-radius: 14px; width: 95%; max-width: 800px; max-height: 90vh; overflow: hidden; display: flex; flex-direction: column; }}
-        .modal-header {{ padding: 20px 24px; background: #21262d; border-bottom: 1px solid #30363d; display: flex; justify-content: space-between; align-items: center; }}
-        .modal-title {{ font-size: 18px; font-weight: 600; color: #58a9ff; }}
-        .modal-close {{ font-size: 28px; color: #8b949e; cursor: pointer; line-height: 1; }}
-        .modal-close:hover {{ color: #fff; }}
-        .modal-body {{ padding: 24px; overflow-y: auto; flex: 1; }}
-        
-        .modal-progress {{ margin-bottom: 24px; }}
-        .modal-progress .row {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px; }}
-        .modal-progress .label {{ color: #8b949e; }}
-        .modal-progress .value {{ font-weight: 600; }}
-        .modal-progress .bar {{ height: 10px; background: #30363d; border-radius: 5px; overflow: hidden; }}
-        .modal-progress .fill {{ height: 100%; background: linear-gradient(90deg, #3fb950, #58a9ff); }}
-        
-        .sub-targets {{ margin-top: 20px; }}
-        .sub-targets h3 {{ font-size: 14px; color: #8b949e; margin-bottom: 12px; text-transform: uppercase; letter-spacing: 0.5px; }}
-        
-        .sub-target {{ background: #0d1117; border-radius: 8px; margin-bottom: 12px; overflow: hidden; }}
-        .sub-header {{ padding: 12px 16px; background: #21262d; display: flex; justify-content: space-between; align-items: center; }}
-        .sub-url {{ font-size: 13px; color: #c9d1d9; font-weight: 500; }}
-        .sub-tools-count {{ font-size: 11px; color: #8b949e; }}
-        
-        .tools-list {{ padding: 12px 16px; }}
-        
-        .tool-item {{ background: #161b22; border-radius: 6px; margin-bottom: 8px; padding: 12px; }}
-        .tool-item:last-child {{ margin-bottom: 0; }}
-        .tool-header {{ display: flex; align-items: center; gap: 10px; margin-bottom: 8px; }}
-        .tool-name {{ padding: 3px 10px; border-radius: 4px; font-size: 11px; font-weight: 600; }}
-        .tool-strix {{ background: #238636; color: #fff; }}
-        .tool-nikto {{ background: #f0883e; color: #000; }}
-        .tool-nmap {{ background: #58a9ff; color: #fff; }}
-        .tool-status {{ margin-left: auto; font-size: 11px; padding: 3px 8px; border-radius: 10px; }}
-        .tool-status.scanning, .tool-status.running {{ background: #238636; color: #fff; }}
-        .tool-status.done, .tool-status.completed {{ background: #58a9ff; color: #fff; }}
-        .tool-status.waiting {{ background: #f0883e; color: #000; }}
-        
-        .tool-progress-row {{ display: flex; align-items: center; gap: 10px; margin-bottom: 8px; }}
-        .tool-progress-bar {{ flex: 1; height: 5px; background: #30363d; border-radius: 3px; }}
-        .tool-progress-fill {{ height: 100%; background: #3fb950; border-radius: 3px; }}
-        .tool-progress-num {{ font-size: 12px; color: #3fb950; font-weight: 600; min-width: 40px; text-align: right; }}
-        
-        .tool-detail {{ background: #0d1117; border-radius: 4px; padding: 10px; font-size: 12px; }}
-        .detail-row {{ display: flex; gap: 10px; margin-bottom: 5px; }}
-        .detail-row:last-child {{ margin-bottom: 0; }}
-        .detail-row .label {{ color: #8b949e; min-width: 70px; }}
-        .detail-row .value {{ color: #c9d1d9; }}
-        .detail-row .highlight {{ color: #f0883e; font-weight: 600; }}
-        
-        .pagination {{ display: flex; justify-content: center; gap: 8px; padding: 20px; }}
-        .page-btn {{ padding: 8px 14px; background: #21262d; border: 1px solid #30363d; border-radius: 6px; color: #c9d1d9; font-size: 13px; cursor: pointer; }}
-        .page-btn:hover, .page-btn.active {{ background: #238636; border-color: #3fb950; }}
-        .page-btn:disabled {{ opacity: 0.5; cursor: not-allowed; }}
-        
-        .empty-state {{ text-align: center; padding: 60px 20px; color: #8b949e; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🛡️ 漏洞扫描看板</h1>
-        <span class="time">{now} | 项目数: {total}</span>
-    </div>
-    
-    <div class="toolbar">
-        <div class="search-box">
-            <input type="text" id="searchInput" placeholder="搜索项目名称..." oninput="filterProjects()">
-        </div>
-        <div class="filter-btns">
-            <button class="filter-btn active" onclick="setFilter('all')">全部</button>
-            <button class="filter-btn" onclick="setFilter('scanning')">扫描中</button>
-            <button class="filter-btn" onclick="setFilter('done')">已完成</button>
-            <button class="filter-btn" onclick="setFilter('waiting')">等待中</button>
-        </div>
-    </div>
-    
-    <div class="stats-bar">
-        <div class="stat"><div class="stat-value">{status['total']}</div><div class="stat-label">总进程</div></div>
-        <div class="stat"><div class="stat-value">{status['strix']}</div><div class="stat-label">Strix</div></div>
-        <div class="stat"><div class="stat-value">{status['nikto']}</div><div class="stat-label">Nikto</div></div>
-        <div class="stat"><div class="stat-value">{status['nmap']}</div><div class="stat-label">Nmap</div></div>
-    </div>
-    
-    <div class="pagination-bar">
-        <span class="page-info" id="pageInfo">共 {total} 个项目</span>
-        <div class="page-size">
-            每页显示: <select id="pageSize" onchange="changePageSize()">
-                <option value="8" selected>8 条</option>
-                <option value="16">16 条</option>
-                <option value="32">32 条</option>
-            </select>
-        </div>
-    </div>
-    
-    <div class="targets-grid" id="targetsGrid"></div>
-    
-    <div class="pagination" id="pagination"></div>
-    
-    <!-- Modal -->
-    <div class="modal-overlay" id="modalOverlay">
-        <div class="modal" onclick="event.stopPropagation()">
-            <div class="modal-header">
-                <span class="modal-title" id="modalTitle">项目详情</span>
-                <span class="modal-close" onclick="closeModal()">&times;</span>
-            </div>
-            <div class="modal-body" id="modalBody"></div>
-        </div>
-    </div>
-
-    <script>
-        // 项目数据
-        const projectsData = {cards_json};
-        const fullProjectsData = {projects_json};
-        
-        let currentPage = 1;
-        let pageSize = 8;
-        let currentFilter = 'all';
-        let searchTerm = '';
-        
-        console.log('加载了 ' + projectsData.length + ' 个项目');
-        
-        function renderProjects() {{
-            const grid = document.getElementById('targetsGrid');
-            const filtered = projectsData.filter(p => {{
-                const matchFilter = currentFilter === 'all' || p.status === currentFilter;
-                const matchSearch = p.name.toLowerCase().includes(searchTerm.toLowerCase());
-                return matchFilter && matchSearch;
-            }});
-            
-            const total = filtered.length;
-            const start = (currentPage - 1) * pageSize;
-            const end = start + pageSize;
-            const pageData = filtered.slice(start, end);
-            
-            if (pageData.length === 0) {{
-                grid.innerHTML = '<div class="empty-state">没有找到匹配的项目</div>';
-                document.getElementById('pageInfo').textContent = '共 0 个项目';
-                document.getElementById('pagination').innerHTML = '';
-                return;
-            }}
-            
-            grid.innerHTML = pageData.map(p => `
-                <div class="target-card ${{p.status}}" data-index="${{p.index}}" onclick="openModal(${{p.index}})">
-                    <div class="card-header">
-                        <span class="card-title">${{p.name}}</span>
-                        <span class="status-badge ${{p.status}}">${{p.statusText}}</span>
-                    </div>
-                    <div class="card-body">
-                        <div class="progress-row">
-                            <span class="progress-label">进度</span>
-                            <span class="progress-value">${{p.progress}}%</span>
-                        </div>
-                        <div class="progress-bar">
-                            <div class="progress-fill" style="width: ${{p.progress}}%"></div>
-                        </div>
-                        <div class="target-count">扫描目标: ${{p.targetCount}} 个</div>
-                    </div>
-                </div>
-            `).join('');
-            
-            document.getElementById('pageInfo').textContent = `第 ${{currentPage}} / ${{Math.ceil(total/pageSize)}} 页，共 ${{total}} 个项目`;
-            renderPagination(Math.ceil(total / pageSize));
-        }}
-        
-        function renderPagination(totalPages) {{
-            const pag = document.getElementById('pagination');
-            if (totalPages <= 1) {{ pag.innerHTML = ''; return; }}
-            
-            let html = `<button class="page-btn" onclick="goPage(1)" ${{currentPage === 1 ? 'disabled' : ''}}>首页</button>`;
-            html += `<button class="page-btn" onclick="goPage(${{currentPage - 1}})" ${{currentPage === 1 ? 'disabled' : ''}}>上一页</button>`;
-            
-            for (let i = Math.max(1, currentPage - 2); i <= Math.min(totalPages, currentPage + 2); i++) {{
-                html += `<button class="page-btn ${{i === currentPage ? 'active' : ''}}" onclick="goPage(${{i}})">${{i}}</button>`;
-            }}
-            
-            html += `<button class="page-btn" onclick="goPage(${{currentPage + 1}})" ${{currentPage === totalPages ? 'disabled' : ''}}>下一页</button>`;
-            html += `<button class="page-btn" onclick="goPage(${{totalPages}})" ${{currentPage === totalPages ? 'disabled' : ''}}>末页</button>`;
-            
-            pag.innerHTML = html;
-        }}
-        
-        function goPage(page) {{
-            currentPage = page;
-            renderProjects();
-        }}
-        
-        function changePageSize() {{
-            pageSize = parseInt(document.getElementById('pageSize').value);
-            currentPage = 1;
-            renderProjects();
-        }}
-        
-        function setFilter(filter) {{
-            currentFilter = filter;
-            currentPage = 1;
-            document.querySelectorAll('.filter-btn').forEach(btn => btn.classList.remove('active'));
-            event.target.classList.add('active');
-            renderProjects();
-        }}
-        
-        function filterProjects() {{
-            searchTerm = document.getElementById('searchInput').value;
-            currentPage = 1;
-            renderProjects();
-        }}
-        
-        function openModal(index) {{
-            console.log('打开Modal, index:', index);
-            
-            const cardData = projectsData.find(p => p.index === index);
-            if (!cardData) {{
-                console.error('未找到项目数据:', index);
-                return;
-            }}
-            
-            const fullProject = fullProjectsData.find(p => p.name === cardData.name);
-            if (!fullProject) {{
-                console.error('未找到完整项目数据:', cardData.name);
-                return;
-            }}
-            
-            document.getElementById('modalTitle').textContent = cardData.name;
-            
-            const statusText = {{"scanning": "扫描中", "done": "已完成", "waiting": "等待中", "completed": "已完成"}}[cardData.status] || "未知";
-            
-            let modalHtml = `
-                <div class="modal-progress">
-                    <div class="row">
-                        <span class="label">状态</span>
-                        <span class="status-badge ${{cardData.status}}">${{statusText}}</span>
-                    </div>
-                    <div class="row">
-                        <span class="label">进度</span>
-                        <span class="value" style="color:#3fb950">${{cardData.progress}}%</span>
-                    </div>
-                    <div class="bar"><div class="fill" style="width:${{cardData.progress}}%"></div></div>
-                </div>
-            `;
-            
-            if (fullProject.targets && fullProject.targets.length > 0) {{
-                modalHtml += '<div class="sub-targets"><h3>扫描目标</h3>';
-                
-                fullProject.targets.forEach(t => {{
-                    modalHtml += `<div class="sub-target">
-                        <div class="sub-header">
-                            <span class="sub-url">📍 ${{t.name}}</span>
-                            <span class="sub-tools-count">${{t.tools ? t.tools.length : 0}} 个工具</span>
-                        </div>
-                        <div class="tools-list">`;
-                    
-                    if (t.tools) {{
-                        t.tools.forEach(tool => {{
-                            let detail = '';
-                            if (tool.name === 'Strix') {{
-                                const eps = tool.endpoints ? tool.endpoints.slice(0, 5).join(', ') : '无';
-                                detail = `<div class="detail-row"><span class="label">已扫描:</span><span class="value">${{tool.scanned || 0}} URL</span></div>
-                                    <div class="detail-row"><span class="label">发现端点:</span><span class="value highlight">${{tool.found || 0}}</span></div>
-                                    <div class="detail-row"><span class="label">端点列表:</span><span class="value">${{eps}}</span></div>`;
-                            }} else if (tool.name === 'Nikto') {{
-                                const vulns = tool.vulns ? tool.vulns.join(', ') : '无';
-                                detail = `<div class="detail-row"><span class="label">已扫描:</span><span class="value">${{tool.scanned || 0}} 项</span></div>
-                                    <div class="detail-row"><span class="label">发现问题:</span><span class="value highlight">${{tool.found || 0}}</span></div>
-                                    <div class="detail-row"><span class="label">问题:</span><span class="value">${{vulns}}</span></div>`;
-                            }} else if (tool.name === 'Nmap') {{
-                                const ports = tool.ports ? tool.ports.join(', ') : '等待';
-                                detail = `<div class="detail-row"><span class="label">已扫描:</span><span class="value">${{tool.scanned || 0}} IP</span></div>
-                                    <div class="detail-row"><span class="label">开放端口:</span><span class="value highlight">${{tool.found || 0}}</span></div>
-                                    <div class="detail-row"><span class="label">端口:</span><span class="value">${{ports}}</span></div>`;
-                            }}
-                            
-                            const toolStatusText = {{"scanning": "扫描中", "done": "已完成", "waiting": "等待中", "completed": "已完成"}}[tool.status] || "未知";
-                            const toolStatusClass = tool.status;
-                            
-                            modalHtml += `<div class="tool-item">
-                                <div class="tool-header">
-                                    <span class="tool-name tool-${{tool.name.toLowerCase()}}">${{tool.name}}</span>
-                                    <span class="tool-status ${{toolStatusClass}}">${{toolStatusText}}</span>
-                                </div>
-                                <div class="tool-progress-row">
-                                    <div class="tool-progress-bar"><div class="tool-progress-fill" style="width:${{tool.progress || 0}}%"></div></div>
-                                    <span class="tool-progress-num">${{tool.progress || 0}}%</span>
-                                </div>
-                                <div class="tool-detail">${{detail}}</div>
-                            </div>`;
-                        }});
-                    }}
-                    
-                    modalHtml += '</div></div>';
-                }});
-                
-                modalHtml += '</div>';
-            }}
-            
-            document.getElementById('modalBody').innerHTML = modalHtml;
-            document.getElementById('modalOverlay').classList.add('show');
-        }}
-        
-        function closeModal() {{
-            document.getElementById('modalOverlay').classList.remove('show');
-        }}
-        
-        // 点击遮罩关闭
-        document.getElementById('modalOverlay').addEventListener('click', function(e) {{
-            if (e.target === this) {{
-                closeModal();
-            }}
-        }});
-        
-        // ESC键关闭
-        document.addEventListener('keydown', function(e) {{
-            if (e.key === 'Escape') {{
-                closeModal();
-            }}
-        }});
-        
-        // 初始化
-        renderProjects();
-    </script>
-</body>
-</html>'''
+            "targetCount": p["targetCount"] if "targetCount" in p else len(p.get("targets", [])),
+            "found": p["found"] if "found" in p else sum(
+                tool.get("found", 0) for t in p.get("targets", []) for tool in t.get("tools", [])
+            )
+        }
+        if "file" in p:
+            card["file"] = p["file"]
+        cards_data.append(card)
+    return cards_data
+
+def generate_dashboard(data=None, snapshot=None, sharded=False):
+    """生成看板 HTML
+    
+    data / snapshot 由常驻收集进程直接传入，省去重新读取数据文件和进程表。
+    sharded=True 时只内嵌分片清单，详情在打开 Modal 时按需加载
+    """
+    status = get_scan_status(snapshot)
+    manifest = load_manifest() if sharded else None
     
-    with open("/tmp/vuln_scan_dashboard.html", 'w') as f:
-        f.write(html)
+    if manifest:
+        data = manifest
+        projects = manifest["projects"]
+        # 分片相对看板 HTML 的路径
+        shard_base = os.path.relpath("/tmp/vuln_dashboard_shards", "/tmp") + "/"
+        full_projects = []
+    else:
+        if data is None:
+            data = load_projects()
+        projects = data.get("projects", [])
+        shard_base = None
+        full_projects = projects
     
-    # 保存数据文件
-    with open("/tmp/vuln_dashboard_data.json", 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # 静态资源按内容哈希命名，只在首次或模板变化时写出
+    emit_assets("/tmp/vuln_dashboard_assets")
+    asset_base = os.path.relpath("/tmp/vuln_dashboard_assets", "/tmp") + "/"
+    
+    html = render_html({
+        "cards": build_cards(projects),
+        "projects": full_projects,
+        "shardBase": shard_base,
+        "status": status,
+        "total": len(projects),
+        "generatedAt": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }, asset_base)
+    
+    atomic_write_text("/tmp/vuln_scan_dashboard.html", html)
+    
+    # 保存数据文件（分片模式下数据已由收集脚本写出）
+    if not manifest:
+        meta = {key: value for key, value in data.items() if key != "projects"}
+        write_dashboard_json("/tmp/vuln_dashboard_data.json", projects, meta)
     
     print(f"✅ 看板已更新: {len(projects)} 个项目, {status['total']} 进程")
 
+def render_html(boot, asset_base, refresh=True):
+    """渲染看板页面: 固定外壳 + window.DASHBOARD 数据
+    
+    样式和脚本引用 asset_base 下按内容哈希命名的静态资源，不再内嵌
+    """
+    boot_json = json.dumps(boot, ensure_ascii=False, separators=(",", ":"), default=json_default)
+    # 防止数据中的 "</script>" 提前结束脚本块
+    boot_json = boot_json.replace("</", "<\\/")
+    return HTML_SHELL.substitute(
+        refresh_meta='<meta http-equiv="refresh" content="60">' if refresh else "",
+        css_href=asset_base + CSS_FILE,
+        js_href=asset_base + JS_FILE,
+        boot_json=boot_json
+    )
+
+# 筛选按钮的状态与收集脚本实际输出的状态对应关系
+STATUS_ALIASES = {
+    "scanning": {"scanning", "running"},
+    "done": {"done", "completed"},
+    "completed": {"done", "completed"},
+    "waiting": {"waiting", "pending"},
+    "pending": {"waiting", "pending"},
+}
+
+# API 每页条数上限
+MAX_PAGE_SIZE = 100
+
+# /api/changes 单次最多返回的事件数
+MAX_CHANGES_PAGE = 5000
+
+def _paginate(items, page, page_size):
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    pages = max(1, -(-len(items) // page_size))
+    page = max(1, min(page, pages))
+    start = (page - 1) * page_size
+    return {
+        "total": len(items),
+        "page": page,
+        "page_size": page_size,
+        "pages": pages,
+        "items": items[start:start + page_size]
+    }
+
+# 静态站点导出: 每页条数（与看板的每页条数选项一致）和筛选条件
+EXPORT_PAGE_SIZES = (8, 16, 32)
+EXPORT_FILTERS = ("all", "scanning", "done", "waiting")
+# 导出程序管理的子目录，其中不再生成的文件会被删除
+EXPORT_DIRS = ("list", "projects", "assets")
+# 同时写出 .gz 预压缩文件（供 nginx gzip_static 等直接发送），小文件不压缩
+EXPORT_GZIP = True
+EXPORT_GZIP_MIN_BYTES = 1024
+
+def _export_file(path, content, written, gzip_files=EXPORT_GZIP):
+    """写出导出文件；内容未变化时不重写（保留 mtime，git 也不会看到改动）"""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    outputs = [(path, content)]
+    if gzip_files and len(content) >= EXPORT_GZIP_MIN_BYTES:
+        # mtime=0 使相同内容得到相同的 .gz
+        outputs.append((path + ".gz", gzip.compress(content, compresslevel=9, mtime=0)))
+    changed = 0
+    for out_path, out_bytes in outputs:
+        written.add(out_path)
+        try:
+            with open(out_path, "rb") as f:
+                if f.read() == out_bytes:
+                    continue
+        except OSError:
+            pass
+        with atomic_open(out_path, "wb") as f:
+            f.write(out_bytes)
+        changed += 1
+    return changed
+
+def _static_page(result, base):
+    """静态站点的一个列表页，base 为页面到站点根目录的相对路径
+
+    进程统计和生成时间放在 status.json，由页面加载后读取，
+    卡片没有变化的页面重新导出后内容不变
+    """
+    return render_html({
+        "cards": result["items"],
+        "total": result["total"],
+        "page": result["page"],
+        "pageSize": result["page_size"],
+        "staticBase": base,
+        "shardBase": base + "projects/"
+    }, base + "assets/", refresh=False)
+
+def export_static_site(out_dir, data=None, snapshot=None, gzip_files=EXPORT_GZIP):
+    """导出多页静态站点（GitHub Pages 等静态托管）
+
+    out_dir/index.html                       第 1 页（每页 8 条）
+    out_dir/list/all/{8,16,32}/{n}.html      各页 HTML，只内嵌该页卡片
+    out_dir/list/{筛选}/{8,16,32}/{n}.json   各筛选条件的列表页，翻页和筛选时读取
+    out_dir/projects/<项目>.json              项目详情，打开 Modal 时读取
+    out_dir/search.json                      搜索索引（卡片字段按列存储），首次搜索时读取
+    out_dir/status.json                      进程统计和生成时间，每次导出都会更新
+    out_dir/assets/                          按内容哈希命名的样式和脚本
+
+    首屏只依赖每页条数，与项目总数无关。返回 (文件数, 改动的文件数)
+    """
+    from data_collector import shard_filename
+
+    if data is None:
+        data = load_projects()
+    projects = data.get("projects", [])
+    written = set()
+    changed = 0
+
+    for directory in EXPORT_DIRS:
+        os.makedirs(os.path.join(out_dir, directory), exist_ok=True)
+    for name, content in ASSETS.items():
+        changed += _export_file(os.path.join(out_dir, "assets", name), content, written, gzip_files)
+
+    cards = build_cards(projects)
+    for card, project in zip(cards, projects):
+        card["file"] = shard_filename(card["name"])
+        detail = json.dumps(project, separators=(",", ":"), ensure_ascii=False, default=json_default)
+        changed += _export_file(os.path.join(out_dir, "projects", card["file"]), detail, written, gzip_files)
+
+    fields = ["index", "name", "status", "progress", "statusText", "targetCount", "found", "file"]
+    search = {"fields": fields, "rows": [[card[f] for f in fields] for card in cards]}
+    changed += _export_file(os.path.join(out_dir, "search.json"),
+                            json.dumps(search, separators=(",", ":"), ensure_ascii=False), written, gzip_files)
+
+    for status_filter in EXPORT_FILTERS:
+        if status_filter == "all":
+            matched = cards
+        else:
+            matched = [card for card in cards if card["status"] in STATUS_ALIASES[status_filter]]
+        for page_size in EXPORT_PAGE_SIZES:
+            page_dir = os.path.join(out_dir, "list", status_filter, str(page_size))
+            os.makedirs(page_dir, exist_ok=True)
+            pages = max(1, -(-len(matched) // page_size))
+            for page in range(1, pages + 1):
+                result = _paginate(matched, page, page_size)
+                changed += _export_file(os.path.join(page_dir, f"{page}.json"),
+                                        json.dumps(result, separators=(",", ":"), ensure_ascii=False),
+                                        written, gzip_files)
+                if status_filter != "all":
+                    continue
+                # list/all/<每页条数>/ 下的页面相对站点根目录为 ../../../
+                html = _static_page(result, "../../../")
+                changed += _export_file(os.path.join(page_dir, f"{page}.html"), html, written, gzip_files)
+                if page == 1 and page_size == EXPORT_PAGE_SIZES[0]:
+                    html = _static_page(result, "./")
+                    changed += _export_file(os.path.join(out_dir, "index.html"), html, written, gzip_files)
+
+    status = {"status": get_scan_status(snapshot),
+              "generatedAt": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+    changed += _export_file(os.path.join(out_dir, "status.json"),
+                            json.dumps(status, separators=(",", ":"), ensure_ascii=False), written, gzip_files)
+
+    # 删除不再生成的页面、已移除项目的详情和旧版本资源
+    removed = 0
+    for directory in EXPORT_DIRS:
+        for root, _, files in os.walk(os.path.join(out_dir, directory)):
+            for name in files:
+                path = os.path.join(root, name)
+                if path not in written:
+                    os.remove(path)
+                    removed += 1
+    for name in ("index.html.gz", "search.json.gz", "status.json.gz"):
+        path = os.path.join(out_dir, name)
+        if path not in written and os.path.exists(path):
+            os.remove(path)
+            removed += 1
+
+    print(f"✅ 静态站点已导出: {out_dir} ({len(projects)} 个项目, {len(written)} 个文件, "
+          f"{changed} 个更新, {removed} 个删除)")
+    return len(written), changed + removed
+
+class ProjectIndex:
+    """服务器内存中的项目索引，数据文件变化时自动重新加载"""
+    
+    def __init__(self, data_file="/tmp/vuln_dashboard_data.json", on_change=None):
+        self.data_file = data_file
+        # 重建索引后以项目增量调用 on_change(delta)
+        self.on_change = on_change
+        self._signature = False
+        self._lock = threading.Lock()
+        self.cards = []
+        self.by_name = {}
+        self._lower_names = []
+        self.findings = FindingsIndex()
+        self.search_index = SearchIndex()
+    
+    def refresh(self):
+        """数据文件签名变化时重建索引，返回是否重建"""
+        try:
+            st = os.stat(self.data_file)
+            signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            signature = None
+        
+        with self._lock:
+            if signature == self._signature:
+                return False
+            projects = load_projects().get("projects", [])
+            previous = self.cards
+            self.cards = build_cards(projects)
+            self.by_name = {p.get("name", "Unknown"): p for p in projects}
+            self._lower_names = [c["name"].lower() for c in self.cards]
+            self.findings = FindingsIndex()
+            self.findings.update(projects)
+            # 按索引字段的哈希只重新索引有变化的项目
+            self.search_index.update(projects)
+            first_load = self._signature is False
+            self._signature = signature
+        
+        if self.on_change and not first_load:
+            delta = diff_cards(previous, self.cards)
+            if delta:
+                self.on_change(delta)
+        return True
+    
+    def query(self, status="", q="", page=1, page_size=8):
+        """按状态和名称筛选并分页，返回当前页卡片和总数"""
+        self.refresh()
+        statuses = STATUS_ALIASES.get(status, {status}) if status else None
+        needle = q.lower()
+        
+        cards, names = self.cards, self._lower_names
+        # 名称子串匹配，或在目标、端点、漏洞、端口中命中搜索索引
+        hits = set(self.search_index.group_by_project(self.search_index.search(q))) if q else ()
+        matched = [
+            card for card, name in zip(cards, names)
+            if (statuses is None or card["status"] in statuses) and (needle in name or card["name"] in hits)
+        ]
+        return _paginate(matched, page, page_size)
+    
+    def search(self, q, page=1, page_size=8):
+        """全文/分面搜索，返回匹配项目的卡片（附匹配的目标）和分面计数"""
+        self.refresh()
+        doc_ids = self.search_index.search(q)
+        hits = self.search_index.group_by_project(doc_ids)
+        matched = [dict(card, matchedTargets=hits[card["name"]]) for card in self.cards if card["name"] in hits]
+        result = _paginate(matched, page, page_size)
+        result["targets"] = len(doc_ids)
+        result["facets"] = self.search_index.facets(doc_ids)
+        return result
+    
+    def get(self, name):
+        """完整项目数据，不存在时返回 None"""
+        self.refresh()
+        return self.by_name.get(name)
+
+# 推送给页面的卡片字段，其中任一变化即视为项目有更新
+DELTA_FIELDS = ("status", "progress", "found", "targetCount", "index")
+
+def diff_cards(previous, current):
+    """比较两次卡片列表，返回项目增量；没有变化时返回 None"""
+    before = {card["name"]: card for card in previous}
+    changed = []
+    for card in current:
+        old = before.pop(card["name"], None)
+        if old is None or any(old.get(f) != card.get(f) for f in DELTA_FIELDS):
+            changed.append(dict(card, added=old is None))
+    removed = list(before)
+    if not changed and not removed:
+        return None
+    return {"changed": changed, "removed": removed, "total": len(current)}
+
+class EventHub:
+    """把项目增量推送给所有 SSE 订阅者"""
+    
+    def __init__(self, backlog=64):
+        self.backlog = backlog
+        self._subscribers = set()
+        self._lock = threading.Lock()
+    
+    def subscribe(self):
+        q = queue.Queue(maxsize=self.backlog)
+        with self._lock:
+            self._subscribers.add(q)
+        return q
+    
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+    
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # 订阅者处理不过来，通知它整页重新拉取
+                self.unsubscribe(q)
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+                q.put_nowait({"reset": True})
+
+# 服务器检查数据文件变化的间隔，保证推送延迟在一秒以内
+WATCH_INTERVAL = 0.5
+
+# SSE 心跳间隔，防止代理断开空闲连接
+HEARTBEAT_SECONDS = 15
+
+def watch_index(index, interval=WATCH_INTERVAL):
+    """后台线程: 定期检查数据文件，变化时由 index.on_change 推送增量"""
+    while True:
+        try:
+            index.refresh()
+        except Exception as e:
+            print(f"Index refresh failed: {e}")
+        time.sleep(interval)
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """看板页面与 JSON API"""
+    
+    index = None
+    hub = None
+    
+    def _stream_events(self):
+        """SSE: 推送项目增量，直到客户端断开"""
+        q = self.hub.subscribe()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "keep-alive")
+            self.end_headers()
+            self.wfile.write(b"retry: 3000\n\n")
+            self.wfile.flush()
+            while True:
+                try:
+                    event = q.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    self.wfile.write(b": ping\n\n")
+                else:
+                    payload = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+                    self.wfile.write(f"event: delta\ndata: {payload}\n\n".encode("utf-8"))
+                    if event.get("reset"):
+                        break
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.hub.unsubscribe(q)
+    
+    def _send(self, code, body, content_type="application/json; charset=utf-8", cache_control="no-cache"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", cache_control)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_json(self, value, code=200):
+        self._send(code, json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=json_default))
+    
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        
+        if path in ("/", "/index.html"):
+            html = render_html({
+                "apiBase": "/api",
+                "status": get_scan_status(),
+                "total": len(self.index.cards),
+                "generatedAt": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }, "/assets/", refresh=False)
+            self._send(200, html, "text/html; charset=utf-8")
+        elif path.startswith("/assets/"):
+            name = path[len("/assets/"):]
+            if name not in ASSETS:
+                self._send_json({"error": "not found"}, 404)
+                return
+            # 文件名带内容哈希，可以永久缓存
+            self._send(200, ASSETS[name], ASSET_TYPES[name.rsplit(".", 1)[1]],
+                       cache_control="public, max-age=31536000, immutable")
+        elif path == "/api/projects":
+            params = parse_qs(url.query)
+            arg = lambda key, default: params.get(key, [default])[0]
+            try:
+                page = int(arg("page", "1"))
+                page_size = int(arg("page_size", "8"))
+            except ValueError:
+                self._send_json({"error": "page and page_size must be integers"}, 400)
+                return
+            self._send_json(self.index.query(arg("status", ""), arg("q", ""), page, page_size))
+        elif path == "/api/search":
+            params = parse_qs(url.query)
+            arg = lambda key, default: params.get(key, [default])[0]
+            try:
+                page = int(arg("page", "1"))
+                page_size = int(arg("page_size", "8"))
+            except ValueError:
+                self._send_json({"error": "page and page_size must be integers"}, 400)
+                return
+            self._send_json(self.index.search(arg("q", ""), page, page_size))
+        elif path.startswith("/api/projects/"):
+            project = self.index.get(unquote(path[len("/api/projects/"):]))
+            if project is None:
+                self._send_json({"error": "project not found"}, 404)
+            else:
+                self._send_json(project)
+        elif path == "/api/findings":
+            params = parse_qs(url.query)
+            kind = params.get("kind", [""])[0] or None
+            if kind is not None and kind not in CANONICALIZERS:
+                self._send_json({"error": f"kind must be one of {', '.join(sorted(CANONICALIZERS))}"}, 400)
+                return
+            self.index.refresh()
+            matched = self.index.findings.search(kind, params.get("q", [""])[0])
+            self._send_json({"total": len(matched), "items": matched[:MAX_PAGE_SIZE]})
+        elif path.startswith("/api/findings/"):
+            self.index.refresh()
+            findings = self.index.findings
+            try:
+                text = path[len("/api/findings/"):]
+                # 只接受非负整数: 负数会按列表下标从末尾取值
+                if not text.isdigit():
+                    raise ValueError(text)
+                fid = int(text)
+                kind, value = findings.findings[fid]
+            except (ValueError, IndexError):
+                self._send_json({"error": "finding not found"}, 404)
+                return
+            self._send_json({
+                "id": fid, "kind": kind, "value": value,
+                "targets": [{"project": p, "target": t, "tool": tool}
+                            for p, t, tool in findings.targets_with(fid)]
+            })
+        elif path == "/api/changes":
+            params = parse_qs(url.query)
+            try:
+                offset = int(params.get("offset", ["0"])[0])
+                limit = min(int(params.get("limit", ["1000"])[0]), MAX_CHANGES_PAGE)
+            except ValueError:
+                self._send_json({"error": "offset and limit must be integers"}, 400)
+                return
+            generation = params.get("generation", [""])[0] or None
+            events, offset, generation = read_changes(max(offset, 0), max(limit, 1), generation=generation)
+            self._send_json({"changes": events, "offset": offset, "generation": generation})
+        elif path == "/api/events":
+            self._stream_events()
+        elif path == "/api/status":
+            self._send_json(get_scan_status())
+        else:
+            self._send_json({"error": "not found"}, 404)
+    
+    def log_message(self, format, *args):
+        # 静默访问日志，避免刷屏
+        pass
+
+def serve(host="127.0.0.1", port=8888):
+    """启动内置 HTTP 服务器"""
+    hub = EventHub()
+    index = ProjectIndex(on_change=hub.publish)
+    index.refresh()
+    threading.Thread(target=watch_index, args=(index,), daemon=True).start()
+    
+    handler = type("Handler", (DashboardHandler,), {"index": index, "hub": hub})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"🛡️ 看板服务已启动: http://{host}:{port}/ ({len(index.cards)} 个项目)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
 if __name__ == "__main__":
-    generate_dashboard()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate the vulnerability scan dashboard")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep running: collect and regenerate on a schedule")
+    parser.add_argument("--interval", type=float, default=60,
+                        help="Daemon refresh interval in seconds (default: 60)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Daemon mode woken early by scan file changes (inotify)")
+    parser.add_argument("--sharded", action="store_true",
+                        help="Embed only the shard manifest; load project details on demand")
+    parser.add_argument("--serve", action="store_true",
+                        help="Serve the dashboard and JSON API from a built-in HTTP server")
+    parser.add_argument("--host", default="127.0.0.1", help="Server bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8888, help="Server port (default: 8888)")
+    parser.add_argument("--export", metavar="DIR",
+                        help="Export a paginated static site (list pages, per-project JSON, search index)")
+    parser.add_argument("--no-gzip", action="store_true", help="With --export, skip pre-compressed .gz files")
+    args = parser.parse_args()
+    
+    if args.export:
+        export_static_site(args.export, gzip_files=not args.no_gzip)
+    elif args.serve:
+        serve(args.host, args.port)
+    elif args.daemon or args.watch:
+        import data_collector
+        if args.sharded:
+            data_collector.SHARD_OUTPUT = True
+        data_collector.run_daemon(interval=args.interval, watch=args.watch, render=True)
+    else:
+        generate_dashboard(sharded=args.sharded)
+
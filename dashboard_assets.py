@@ -0,0 +1,745 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 静态资源
+样式和脚本与数据分离，按内容哈希命名后只写出一次，浏览器可长期缓存；
+每次刷新生成的 HTML 只是固定外壳加一段数据
+"""
+
+import hashlib
+import os
+from string import Template
+
+DASHBOARD_CSS = """\
+* { margin: 0; padding: 0; box-sizing: border-box; }
+body { font-family: -apple-system, BlinkMacSystemFont, 'SF Mono', 'Segoe UI', Roboto, sans-serif; background: #0d1117; color: #c9d1d9; min-height: 100vh; }
+
+.header { background: linear-gradient(180deg, #161b22 0%, #0d1117 100%); padding: 20px 30px; border-bottom: 1px solid #30363d; display: flex; justify-content: space-between; align-items: center; }
+.header h1 { color: #58a9ff; font-size: 22px; font-weight: 600; }
+.header .time { color: #8b949e; font-size: 13px; }
+
+.toolbar { padding: 15px 30px; background: #161b22; border-bottom: 1px solid #30363d; display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 15px; }
+.search-box { display: flex; align-items: center; gap: 10px; }
+.search-box input { background: #0d1117; border: 1px solid #30363d; border-radius: 6px; padding: 8px 12px; color: #c9d1d9; font-size: 13px; width: 200px; }
+.search-box input:focus { outline: none; border-color: #58a9ff; }
+.filter-btns { display: flex; gap: 8px; }
+.filter-btn { padding: 6px 14px; background: #21262d; border: 1px solid #30363d; border-radius: 6px; color: #c9d1d9; font-size: 12px; cursor: pointer; transition: all 0.2s; }
+.filter-btn:hover, .filter-btn.active { background: #238636; border-color: #3fb950; color: #fff; }
+
+.stats-bar { display: grid; grid-template-columns: repeat(4, 1fr); gap: 1px; background: #30363d; }
+.stat { background: #161b22; padding: 15px 20px; text-align: center; }
+.stat-value { font-size: 28px; font-weight: 700; color: #58a9ff; }
+.stat-label { font-size: 11px; margin-top: 4px; color: #8b949e; text-transform: uppercase; }
+
+.pagination-bar { padding: 15px 30px; background: #161b22; border-bottom: 1px solid #30363d; display: flex; justify-content: space-between; align-items: center; }
+.page-info { color: #8b949e; font-size: 13px; }
+.page-size select { background: #21262d; border: 1px solid #30363d; border-radius: 6px; padding: 6px 10px; color: #c9d1d9; font-size: 12px; cursor: pointer; }
+
+.targets-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 16px; padding: 24px; }
+
+.target-card { background: #161b22; border: 1px solid #30363d; border-radius: 10px; overflow: hidden; transition: all 0.25s; cursor: pointer; }
+.target-card:hover { border-color: #58a9ff; transform: translateY(-3px); box-shadow: 0 8px 25px rgba(0,0,0,0.4); }
+.target-card.hidden { display: none; }
+.target-card.scanning, .target-card.running { border-left: 4px solid #3fb950; }
+.target-card.done, .target-card.completed { border-left: 4px solid #58a9ff; }
+.target-card.waiting { border-left: 4px solid #f0883e; }
+
+.card-header { padding: 16px; background: #21262d; display: flex; justify-content: space-between; align-items: center; }
+.card-title { font-size: 15px; font-weight: 600; color: #58a9ff; }
+.status-badge { padding: 4px 10px; border-radius: 12px; font-size: 11px; font-weight: 500; }
+.status-badge.scanning, .status-badge.running { background: #238636; color: #fff; }
+.status-badge.done, .status-badge.completed { background: #58a9ff; color: #fff; }
+.status-badge.waiting { background: #f0883e; color: #000; }
+
+.card-body { padding: 16px; }
+.progress-row { display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px; }
+.progress-label { font-size: 12px; color: #8b949e; }
+.progress-value { font-size: 14px; font-weight: 700; color: #3fb950; }
+.progress-bar { height: 8px; background: #30363d; border-radius: 4px; overflow: hidden; }
+.progress-fill { height: 100%; background: linear-gradient(90deg, #3fb950, #58a9ff); border-radius: 4px; transition: width 0.5s ease; }
+
+.target-count { margin-top: 12px; font-size: 12px; color: #8b949e; }
+
+/* Modal */
+.modal-overlay { display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0,0,0,0.85); z-index: 9999; align-items: center; justify-content: center; }
+.modal-overlay.show { display: flex; }
+.modal { background: #161b22; border: 1px solid #30363d; border-radius: 14px; width: 95%; max-width: 800px; max-height: 90vh; overflow: hidden; display: flex; flex-direction: column; }
+.modal-header { padding: 20px 24px; background: #21262d; border-bottom: 1px solid #30363d; display: flex; justify-content: space-between; align-items: center; }
+.modal-title { font-size: 18px; font-weight: 600; color: #58a9ff; }
+.modal-close { font-size: 28px; color: #8b949e; cursor: pointer; line-height: 1; }
+.modal-close:hover { color: #fff; }
+.modal-body { padding: 24px; overflow-y: auto; flex: 1; }
+
+.modal-progress { margin-bottom: 24px; }
+.modal-progress .row { display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px; }
+.modal-progress .label { color: #8b949e; }
+.modal-progress .value { font-weight: 600; }
+.modal-progress .bar { height: 10px; background: #30363d; border-radius: 5px; overflow: hidden; }
+.modal-progress .fill { height: 100%; background: linear-gradient(90deg, #3fb950, #58a9ff); }
+
+.sub-targets { margin-top: 20px; }
+.sub-targets h3 { font-size: 14px; color: #8b949e; margin-bottom: 12px; text-transform: uppercase; letter-spacing: 0.5px; }
+
+.sub-target { background: #0d1117; border-radius: 8px; margin-bottom: 12px; overflow: hidden; }
+.sub-header { padding: 12px 16px; background: #21262d; display: flex; justify-content: space-between; align-items: center; }
+.sub-url { font-size: 13px; color: #c9d1d9; font-weight: 500; }
+.sub-tools-count { font-size: 11px; color: #8b949e; }
+
+.tools-list { padding: 12px 16px; }
+
+.tool-item { background: #161b22; border-radius: 6px; margin-bottom: 8px; padding: 12px; }
+.tool-item:last-child { margin-bottom: 0; }
+.tool-header { display: flex; align-items: center; gap: 10px; margin-bottom: 8px; }
+.tool-name { padding: 3px 10px; border-radius: 4px; font-size: 11px; font-weight: 600; }
+.tool-strix { background: #238636; color: #fff; }
+.tool-nikto { background: #f0883e; color: #000; }
+.tool-nmap { background: #58a9ff; color: #fff; }
+.tool-status { margin-left: auto; font-size: 11px; padding: 3px 8px; border-radius: 10px; }
+.tool-status.scanning, .tool-status.running { background: #238636; color: #fff; }
+.tool-status.done, .tool-status.completed { background: #58a9ff; color: #fff; }
+.tool-status.waiting { background: #f0883e; color: #000; }
+
+.tool-progress-row { display: flex; align-items: center; gap: 10px; margin-bottom: 8px; }
+.tool-progress-bar { flex: 1; height: 5px; background: #30363d; border-radius: 3px; }
+.tool-progress-fill { height: 100%; background: #3fb950; border-radius: 3px; }
+.tool-progress-num { font-size: 12px; color: #3fb950; font-weight: 600; min-width: 40px; text-align: right; }
+
+.tool-detail { background: #0d1117; border-radius: 4px; padding: 10px; font-size: 12px; }
+.detail-row { display: flex; gap: 10px; margin-bottom: 5px; }
+.detail-row:last-child { margin-bottom: 0; }
+.detail-row .label { color: #8b949e; min-width: 70px; }
+.detail-row .value { color: #c9d1d9; }
+.detail-row .highlight { color: #f0883e; font-weight: 600; }
+
+.pagination { display: flex; justify-content: center; gap: 8px; padding: 20px; }
+.page-btn { padding: 8px 14px; background: #21262d; border: 1px solid #30363d; border-radius: 6px; color: #c9d1d9; font-size: 13px; cursor: pointer; }
+.page-btn:hover, .page-btn.active { background: #238636; border-color: #3fb950; }
+.page-btn:disabled { opacity: 0.5; cursor: not-allowed; }
+
+.empty-state { text-align: center; padding: 60px 20px; color: #8b949e; }
+"""
+
+DASHBOARD_JS = """\
+// 项目数据: 每次生成的 HTML 只注入 window.DASHBOARD，本脚本内容固定可长期缓存
+const boot = window.DASHBOARD || {};
+let projectsData = boot.cards || [];
+const fullProjectsData = boot.projects || [];
+// 分片模式下的项目详情目录，null 表示详情已内嵌
+const shardBase = boot.shardBase || null;
+// 内置服务器的 API 地址，null 表示静态页面
+const apiBase = boot.apiBase || null;
+// 多页静态站点的根目录（相对当前页面），列表页按需读取，null 表示单页
+const staticBase = boot.staticBase || null;
+// 静态站点的搜索索引，首次搜索时加载
+let searchIndex = null;
+const projectCache = {};
+let pageRequest = 0;
+// 当前页卡片: 项目名 -> DOM 元素，用于增量更新
+let cardElements = new Map();
+let openIndex = null;
+
+let currentPage = boot.page || 1;
+let pageSize = boot.pageSize || 8;
+let currentFilter = 'all';
+let searchTerm = '';
+
+// 搜索框输入防抖（毫秒）
+const SEARCH_DEBOUNCE_MS = 120;
+let searchTimer = null;
+// 预先计算的小写项目名，与 projectsData 一一对应（静态模式）
+const lowerNames = projectsData.map(p => p.name.toLowerCase());
+// 上一次筛选的结果（projectsData 下标），搜索词在同一筛选下变长时只在其中继续筛选
+let lastFilter = null;
+// 项目名 -> 完整项目数据，首次打开 Modal 时建立
+let fullProjectsByName = null;
+// Modal 中每批渲染的目标数，其余滚动到底部时再渲染
+const MODAL_BATCH = 40;
+let modalObserver = null;
+
+console.log('加载了 ' + projectsData.length + ' 个项目');
+
+function renderProjects() {
+    if (apiBase) {
+        fetchProjects();
+        return;
+    }
+    if (staticBase) {
+        fetchStaticPage();
+        return;
+    }
+    
+    const needle = searchTerm.toLowerCase();
+    let candidates = null;
+    if (lastFilter && lastFilter.filter === currentFilter && needle.startsWith(lastFilter.needle)) {
+        candidates = lastFilter.matched;
+    }
+    const matched = [];
+    if (candidates) {
+        for (const i of candidates) {
+            if (lowerNames[i].includes(needle)) matched.push(i);
+        }
+    } else {
+        for (let i = 0; i < projectsData.length; i++) {
+            if ((currentFilter === 'all' || statusMatches(projectsData[i].status)) && lowerNames[i].includes(needle)) {
+                matched.push(i);
+            }
+        }
+    }
+    lastFilter = {filter: currentFilter, needle: needle, matched: matched};
+    
+    const total = matched.length;
+    const start = (currentPage - 1) * pageSize;
+    renderCards(matched.slice(start, start + pageSize).map(i => projectsData[i]), total);
+}
+
+function fetchProjects() {
+    // 服务端筛选分页，只传输当前页的卡片
+    const params = new URLSearchParams({
+        status: currentFilter === 'all' ? '' : currentFilter,
+        q: searchTerm,
+        page: currentPage,
+        page_size: pageSize
+    });
+    const requestId = ++pageRequest;
+    fetch(`${apiBase}/projects?${params}`)
+        .then(r => r.json())
+        .then(result => {
+            // 丢弃过期的响应（快速输入时）
+            if (requestId !== pageRequest) return;
+            projectsData = result.items;
+            renderCards(result.items, result.total);
+        })
+        .catch(e => console.error('加载项目列表失败:', e));
+}
+
+function fetchStaticPage() {
+    // 无搜索词时读取预生成的列表页（只有一页卡片），有搜索词时在搜索索引中筛选
+    const requestId = ++pageRequest;
+    if (searchTerm) {
+        loadSearchIndex().then(cards => {
+            if (requestId !== pageRequest) return;
+            const needle = searchTerm.toLowerCase();
+            const matched = cards.filter(c =>
+                (currentFilter === 'all' || statusMatches(c.status)) && c.name.toLowerCase().includes(needle));
+            const start = (currentPage - 1) * pageSize;
+            projectsData = matched.slice(start, start + pageSize);
+            renderCards(projectsData, matched.length);
+        });
+        return;
+    }
+    fetch(`${staticBase}list/${currentFilter}/${pageSize}/${currentPage}.json`)
+        .then(r => r.json())
+        .then(result => {
+            if (requestId !== pageRequest) return;
+            projectsData = result.items;
+            renderCards(result.items, result.total);
+        })
+        .catch(e => console.error('加载项目列表失败:', e));
+}
+
+function loadSearchIndex() {
+    // 索引按列存储: {fields: [...], rows: [[...], ...]}
+    if (!searchIndex) {
+        searchIndex = fetch(`${staticBase}search.json`)
+            .then(r => r.json())
+            .then(index => index.rows.map(row => Object.fromEntries(index.fields.map((f, i) => [f, row[i]]))))
+            .catch(e => {
+                console.error('加载搜索索引失败:', e);
+                searchIndex = null;
+                return [];
+            });
+    }
+    return searchIndex;
+}
+
+function createCard(p) {
+    const el = document.createElement('div');
+    el.innerHTML = `
+        <div class="target-card ${p.status}" data-index="${p.index}">
+            <div class="card-header">
+                <span class="card-title">${escapeHtml(p.name)}</span>
+                <span class="status-badge ${p.status}">${p.statusText}</span>
+            </div>
+            <div class="card-body">
+                <div class="progress-row">
+                    <span class="progress-label">进度</span>
+                    <span class="progress-value">${p.progress}%</span>
+                </div>
+                <div class="progress-bar">
+                    <div class="progress-fill" style="width: ${p.progress}%"></div>
+                </div>
+                <div class="target-count">扫描目标: ${p.targetCount} 个</div>
+            </div>
+        </div>`;
+    return el.firstElementChild;
+}
+
+function renderCards(pageData, total) {
+    const grid = document.getElementById('targetsGrid');
+    
+    if (pageData.length === 0) {
+        grid.innerHTML = '<div class="empty-state">没有找到匹配的项目</div>';
+        cardElements = new Map();
+        document.getElementById('pageInfo').textContent = '共 0 个项目';
+        document.getElementById('pagination').innerHTML = '';
+        return;
+    }
+    
+    // 按项目名复用已有卡片，只创建新出现的卡片、只修改变化的字段
+    const previous = cardElements;
+    const next = new Map();
+    let cursor = grid.firstElementChild;
+    if (cursor && !cursor.classList.contains('target-card')) {
+        grid.innerHTML = '';
+        cursor = null;
+    }
+    pageData.forEach(p => {
+        let el = previous.get(p.name);
+        if (el) {
+            previous.delete(p.name);
+            updateCard(el, p);
+        } else {
+            el = createCard(p);
+        }
+        next.set(p.name, el);
+        if (el !== cursor) {
+            grid.insertBefore(el, cursor);
+        } else {
+            cursor = cursor.nextElementSibling;
+        }
+    });
+    previous.forEach(el => el.remove());
+    cardElements = next;
+    
+    document.getElementById('pageInfo').textContent = `第 ${currentPage} / ${Math.ceil(total/pageSize)} 页，共 ${total} 个项目`;
+    renderPagination(Math.ceil(total / pageSize));
+}
+
+function updateCard(el, card) {
+    const className = `target-card ${card.status}`;
+    if (el.className !== className) el.className = className;
+    if (el.dataset.index !== String(card.index)) el.dataset.index = card.index;
+    const badge = el.querySelector('.status-badge');
+    if (badge.textContent !== card.statusText) {
+        badge.className = `status-badge ${card.status}`;
+        badge.textContent = card.statusText;
+    }
+    const progress = `${card.progress}%`;
+    const value = el.querySelector('.progress-value');
+    if (value.textContent !== progress) {
+        value.textContent = progress;
+        el.querySelector('.progress-fill').style.width = progress;
+    }
+    const count = `扫描目标: ${card.targetCount} 个`;
+    const countEl = el.querySelector('.target-count');
+    if (countEl.textContent !== count) countEl.textContent = count;
+}
+
+function patchCard(card) {
+    // 只改动变化卡片的状态和进度，不重建网格
+    const el = cardElements.get(card.name);
+    if (!el) return;
+    updateCard(el, card);
+    const i = projectsData.findIndex(p => p.name === card.name);
+    if (i >= 0) projectsData[i] = card;
+}
+
+function applyDelta(delta) {
+    if (delta.reset) {
+        renderProjects();
+        return;
+    }
+    // 增删项目或状态不再符合筛选条件时，重新拉取当前页（仍然只有一页数据）
+    const needsReload = delta.removed.length > 0 || delta.changed.some(c =>
+        c.added || (cardElements.has(c.name) && projectsData.some(p => p.name === c.name && p.index !== c.index))
+        || (currentFilter !== 'all' && cardElements.has(c.name) && !statusMatches(c.status)));
+    if (needsReload) {
+        renderProjects();
+    } else {
+        delta.changed.forEach(patchCard);
+    }
+    if (openIndex !== null) {
+        const open = projectsData.find(p => p.index === openIndex);
+        if (open && delta.changed.some(c => c.name === open.name)) {
+            openModal(openIndex);
+        }
+    }
+}
+
+function statusMatches(status) {
+    const aliases = {"done": ["done", "completed"], "waiting": ["waiting", "pending"], "scanning": ["scanning", "running"]};
+    return (aliases[currentFilter] || [currentFilter]).includes(status);
+}
+
+function renderPagination(totalPages) {
+    const pag = document.getElementById('pagination');
+    if (totalPages <= 1) { pag.innerHTML = ''; return; }
+    
+    let html = `<button class="page-btn" onclick="goPage(1)" ${currentPage === 1 ? 'disabled' : ''}>首页</button>`;
+    html += `<button class="page-btn" onclick="goPage(${currentPage - 1})" ${currentPage === 1 ? 'disabled' : ''}>上一页</button>`;
+    
+    for (let i = Math.max(1, currentPage - 2); i <= Math.min(totalPages, currentPage + 2); i++) {
+        html += `<button class="page-btn ${i === currentPage ? 'active' : ''}" onclick="goPage(${i})">${i}</button>`;
+    }
+    
+    html += `<button class="page-btn" onclick="goPage(${currentPage + 1})" ${currentPage === totalPages ? 'disabled' : ''}>下一页</button>`;
+    html += `<button class="page-btn" onclick="goPage(${totalPages})" ${currentPage === totalPages ? 'disabled' : ''}>末页</button>`;
+    
+    pag.innerHTML = html;
+}
+
+function goPage(page) {
+    currentPage = page;
+    renderProjects();
+}
+
+function changePageSize() {
+    pageSize = parseInt(document.getElementById('pageSize').value);
+    currentPage = 1;
+    renderProjects();
+}
+
+function setFilter(filter) {
+    currentFilter = filter;
+    currentPage = 1;
+    document.querySelectorAll('.filter-btn').forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+    renderProjects();
+}
+
+function filterProjects() {
+    // 防抖: 连续输入时只在停顿后渲染一次
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => {
+        const value = document.getElementById('searchInput').value;
+        if (value === searchTerm) return;
+        searchTerm = value;
+        currentPage = 1;
+        renderProjects();
+    }, SEARCH_DEBOUNCE_MS);
+}
+
+function openModal(index) {
+    console.log('打开Modal, index:', index);
+    openIndex = index;
+    
+    const cardData = projectsData.find(p => p.index === index);
+    if (!cardData) {
+        console.error('未找到项目数据:', index);
+        return;
+    }
+    
+    loadProject(cardData).then(fullProject => {
+        if (!fullProject) {
+            console.error('未找到完整项目数据:', cardData.name);
+            return;
+        }
+        renderModal(cardData, fullProject);
+    });
+}
+
+function loadProject(cardData) {
+    if (apiBase) {
+        return fetch(`${apiBase}/projects/${encodeURIComponent(cardData.name)}`)
+            .then(r => r.ok ? r.json() : null)
+            .catch(e => {
+                console.error('加载项目详情失败:', e);
+                return null;
+            });
+    }
+    if (!shardBase) {
+        if (!fullProjectsByName) {
+            fullProjectsByName = new Map(fullProjectsData.map(p => [p.name, p]));
+        }
+        return Promise.resolve(fullProjectsByName.get(cardData.name));
+    }
+    if (projectCache[cardData.file]) {
+        return Promise.resolve(projectCache[cardData.file]);
+    }
+    return fetch(shardBase + cardData.file)
+        .then(r => r.ok ? r.json() : null)
+        .then(p => {
+            if (p) projectCache[cardData.file] = p;
+            return p;
+        })
+        .catch(e => {
+            console.error('加载项目详情失败:', e);
+            return null;
+        });
+}
+
+const STATUS_TEXT = {"scanning": "扫描中", "done": "已完成", "waiting": "等待中", "completed": "已完成"};
+
+function escapeHtml(value) {
+    return String(value).replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})[c]);
+}
+
+function renderTool(tool) {
+    let detail = '';
+    if (tool.name === 'Strix') {
+        const eps = tool.endpoints ? tool.endpoints.slice(0, 5).map(escapeHtml).join(', ') : '无';
+        detail = `<div class="detail-row"><span class="label">已扫描:</span><span class="value">${tool.scanned || 0} URL</span></div>
+            <div class="detail-row"><span class="label">发现端点:</span><span class="value highlight">${tool.found || 0}</span></div>
+            <div class="detail-row"><span class="label">端点列表:</span><span class="value">${eps}</span></div>`;
+    } else if (tool.name === 'Nikto') {
+        const vulns = tool.vulns ? tool.vulns.map(escapeHtml).join(', ') : '无';
+        detail = `<div class="detail-row"><span class="label">已扫描:</span><span class="value">${tool.scanned || 0} 项</span></div>
+            <div class="detail-row"><span class="label">发现问题:</span><span class="value highlight">${tool.found || 0}</span></div>
+            <div class="detail-row"><span class="label">问题:</span><span class="value">${vulns}</span></div>`;
+    } else if (tool.name === 'Nmap') {
+        const ports = tool.ports ? tool.ports.join(', ') : '等待';
+        detail = `<div class="detail-row"><span class="label">已扫描:</span><span class="value">${tool.scanned || 0} IP</span></div>
+            <div class="detail-row"><span class="label">开放端口:</span><span class="value highlight">${tool.found || 0}</span></div>
+            <div class="detail-row"><span class="label">端口:</span><span class="value">${ports}</span></div>`;
+    }
+    
+    return `<div class="tool-item">
+        <div class="tool-header">
+            <span class="tool-name tool-${tool.name.toLowerCase()}">${escapeHtml(tool.name)}</span>
+            <span class="tool-status ${tool.status}">${STATUS_TEXT[tool.status] || "未知"}</span>
+        </div>
+        <div class="tool-progress-row">
+            <div class="tool-progress-bar"><div class="tool-progress-fill" style="width:${tool.progress || 0}%"></div></div>
+            <span class="tool-progress-num">${tool.progress || 0}%</span>
+        </div>
+        <div class="tool-detail">${detail}</div>
+    </div>`;
+}
+
+function renderTarget(t) {
+    return `<div class="sub-target">
+        <div class="sub-header">
+            <span class="sub-url">📍 ${escapeHtml(t.name)}</span>
+            <span class="sub-tools-count">${t.tools ? t.tools.length : 0} 个工具</span>
+        </div>
+        <div class="tools-list">${(t.tools || []).map(renderTool).join('')}</div>
+    </div>`;
+}
+
+function renderModal(cardData, fullProject) {
+    document.getElementById('modalTitle').textContent = cardData.name;
+    
+    const body = document.getElementById('modalBody');
+    body.innerHTML = `
+        <div class="modal-progress">
+            <div class="row">
+                <span class="label">状态</span>
+                <span class="status-badge ${cardData.status}">${STATUS_TEXT[cardData.status] || "未知"}</span>
+            </div>
+            <div class="row">
+                <span class="label">进度</span>
+                <span class="value" style="color:#3fb950">${cardData.progress}%</span>
+            </div>
+            <div class="bar"><div class="fill" style="width:${cardData.progress}%"></div></div>
+        </div>
+    `;
+    
+    if (modalObserver) {
+        modalObserver.disconnect();
+        modalObserver = null;
+    }
+    const targets = fullProject.targets || [];
+    if (targets.length > 0) {
+        const section = document.createElement('div');
+        section.className = 'sub-targets';
+        section.innerHTML = `<h3>扫描目标 (${targets.length})</h3>`;
+        body.appendChild(section);
+        
+        // 分批渲染目标: 先渲染第一批，哨兵元素进入视口时再追加下一批
+        let rendered = 0;
+        const sentinel = document.createElement('div');
+        const renderBatch = () => {
+            const html = targets.slice(rendered, rendered + MODAL_BATCH).map(renderTarget).join('');
+            rendered = Math.min(rendered + MODAL_BATCH, targets.length);
+            sentinel.insertAdjacentHTML('beforebegin', html);
+            if (rendered >= targets.length) {
+                if (modalObserver) modalObserver.disconnect();
+                modalObserver = null;
+                sentinel.remove();
+            }
+        };
+        section.appendChild(sentinel);
+        renderBatch();
+        if (rendered < targets.length) {
+            if (window.IntersectionObserver) {
+                modalObserver = new IntersectionObserver(entries => {
+                    if (entries.some(e => e.isIntersecting)) renderBatch();
+                }, {root: body, rootMargin: '400px'});
+                modalObserver.observe(sentinel);
+            } else {
+                const step = () => {
+                    renderBatch();
+                    if (rendered < targets.length) requestAnimationFrame(step);
+                };
+                requestAnimationFrame(step);
+            }
+        }
+    }
+    
+    document.getElementById('modalOverlay').classList.add('show');
+}
+
+function closeModal() {
+    openIndex = null;
+    if (modalObserver) {
+        modalObserver.disconnect();
+        modalObserver = null;
+    }
+    document.getElementById('modalOverlay').classList.remove('show');
+}
+
+// 卡片点击统一由网格处理，卡片可以被复用和移动
+document.getElementById('targetsGrid').addEventListener('click', function(e) {
+    const card = e.target.closest('.target-card');
+    if (card) {
+        openModal(parseInt(card.dataset.index));
+    }
+});
+
+// 点击遮罩关闭
+document.getElementById('modalOverlay').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeModal();
+    }
+});
+
+// ESC键关闭
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        closeModal();
+    }
+});
+
+function renderHeader(info) {
+    const status = info.status || {};
+    document.getElementById('headerTime').textContent = `${info.generatedAt || ''} | 项目数: ${boot.total || 0}`;
+    document.getElementById('pageInfo').textContent = `共 ${boot.total || 0} 个项目`;
+    ['total', 'strix', 'nikto', 'nmap'].forEach(key => {
+        document.getElementById('stat-' + key).textContent = status[key] || 0;
+    });
+}
+
+// 初始化
+renderHeader(boot);
+if (staticBase) {
+    // 静态站点: 当前页卡片已内嵌，进程统计和生成时间单独读取 status.json
+    document.getElementById('pageSize').value = pageSize;
+    renderCards(projectsData, boot.total || 0);
+    fetch(`${staticBase}status.json`)
+        .then(r => r.json())
+        .then(renderHeader)
+        .catch(() => {});
+} else {
+    renderProjects();
+}
+
+// 服务器模式下订阅项目增量，只更新变化的卡片，保留筛选、分页和已打开的 Modal；
+// 浏览器不支持 SSE 时退回定时拉取当前页
+if (apiBase) {
+    if (window.EventSource) {
+        const events = new EventSource(`${apiBase}/events`);
+        events.addEventListener('delta', e => applyDelta(JSON.parse(e.data)));
+    } else {
+        setInterval(renderProjects, 60000);
+    }
+}
+"""
+
+# 页面外壳，$refresh_meta / $css_href / $js_href / $boot_json 在渲染时替换
+HTML_SHELL = Template("""\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    $refresh_meta
+    <title>🛡️ 漏洞扫描看板</title>
+    <link rel="stylesheet" href="$css_href">
+</head>
+<body>
+    <div class="header">
+        <h1>🛡️ 漏洞扫描看板</h1>
+        <span class="time" id="headerTime"></span>
+    </div>
+    
+    <div class="toolbar">
+        <div class="search-box">
+            <input type="text" id="searchInput" placeholder="搜索项目名称..." oninput="filterProjects()">
+        </div>
+        <div class="filter-btns">
+            <button class="filter-btn active" onclick="setFilter('all')">全部</button>
+            <button class="filter-btn" onclick="setFilter('scanning')">扫描中</button>
+            <button class="filter-btn" onclick="setFilter('done')">已完成</button>
+            <button class="filter-btn" onclick="setFilter('waiting')">等待中</button>
+        </div>
+    </div>
+    
+    <div class="stats-bar">
+        <div class="stat"><div class="stat-value" id="stat-total">0</div><div class="stat-label">总进程</div></div>
+        <div class="stat"><div class="stat-value" id="stat-strix">0</div><div class="stat-label">Strix</div></div>
+        <div class="stat"><div class="stat-value" id="stat-nikto">0</div><div class="stat-label">Nikto</div></div>
+        <div class="stat"><div class="stat-value" id="stat-nmap">0</div><div class="stat-label">Nmap</div></div>
+    </div>
+    
+    <div class="pagination-bar">
+        <span class="page-info" id="pageInfo"></span>
+        <div class="page-size">
+            每页显示: <select id="pageSize" onchange="changePageSize()">
+                <option value="8" selected>8 条</option>
+                <option value="16">16 条</option>
+                <option value="32">32 条</option>
+            </select>
+        </div>
+    </div>
+    
+    <div class="targets-grid" id="targetsGrid"></div>
+    
+    <div class="pagination" id="pagination"></div>
+    
+    <!-- Modal -->
+    <div class="modal-overlay" id="modalOverlay">
+        <div class="modal" onclick="event.stopPropagation()">
+            <div class="modal-header">
+                <span class="modal-title" id="modalTitle">项目详情</span>
+                <span class="modal-close" onclick="closeModal()">&times;</span>
+            </div>
+            <div class="modal-body" id="modalBody"></div>
+        </div>
+    </div>
+
+    <script>window.DASHBOARD = $boot_json;</script>
+    <script src="$js_href"></script>
+</body>
+</html>
+""")
+
+
+def _hashed_name(stem, ext, content):
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+    return f"{stem}.{digest}.{ext}"
+
+
+# 资源文件名 -> 内容（模块加载时计算一次）
+ASSETS = {
+    _hashed_name("dashboard", "css", DASHBOARD_CSS): DASHBOARD_CSS,
+    _hashed_name("dashboard", "js", DASHBOARD_JS): DASHBOARD_JS,
+}
+CSS_FILE = next(name for name in ASSETS if name.endswith(".css"))
+JS_FILE = next(name for name in ASSETS if name.endswith(".js"))
+
+ASSET_TYPES = {
+    "css": "text/css; charset=utf-8",
+    "js": "application/javascript; charset=utf-8",
+}
+
+
+def emit_assets(asset_dir):
+    """把资源写入目录，同名（同内容）文件已存在时跳过"""
+    os.makedirs(asset_dir, exist_ok=True)
+    for name, content in ASSETS.items():
+        path = os.path.join(asset_dir, name)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+    return CSS_FILE, JS_FILE
@@ -4,21 +4,86 @@
 从 Strix/Nikto/Nmap 进程收集扫描状态
 """
 
+import hashlib
 import json
 import os
-import subprocess
+import random
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+from atomic_writer import atomic_open, write_dashboard_json
+from binary_snapshot import SNAPSHOT_FILE, write_snapshot
+from findings_diff import CHANGES_FILE, FindingsDiff, append_changes
+from findings_index import FINDINGS_INDEX_FILE, FindingsIndex
+from history_store import HISTORY_DB, HistoryStore
+from process_inventory import take_snapshot
+from progress_tracker import TRACKER
+from scan_model import Project, Target, ToolResult, json_default
+from tool_parsers import get_parser, match_file, match_log
+
 # 配置路径
 TARGETS_FILE = "/tmp/vuln_targets.json"
 OUTPUT_FILE = "/tmp/vuln_dashboard_data.json"
 SCAN_PROC_DIR = "/tmp/vuln_scans"
 
+# 扫描日志: SCAN_LOG_DIR/vuln_scan_{target}{log_suffix}
+SCAN_LOG_DIR = "/tmp"
+SCAN_LOG_PREFIX = "vuln_scan_"
+
+# 分片输出: 每个项目一个文件 + 轻量清单
+SHARD_DIR = "/tmp/vuln_dashboard_shards"
+SHARD_MANIFEST = "manifest.json"
+SHARD_PROJECTS_DIR = "projects"
+
 # 工具列表
 SCAN_TOOLS = ["Strix", "Nikto", "Nmap"]
 
+# 并发收集的工作线程数（<= 1 时退化为串行）
+COLLECT_WORKERS = 16
+
+# 输出缩进格式的 JSON（仅用于调试，默认紧凑格式）
+OUTPUT_PRETTY = False
+
+# 同时写出分片数据（SHARD_DIR）
+SHARD_OUTPUT = False
+
+# 同时写出紧凑二进制快照（SNAPSHOT_FILE），看板优先读取
+SNAPSHOT_OUTPUT = False
+
+# 每轮把工具进度和发现数追加到历史时序库（HISTORY_DB）
+HISTORY_OUTPUT = False
+
+# 每轮把新增/消失的发现项追加到变更流（CHANGES_FILE）
+DIFF_OUTPUT = False
+
+# 每轮写出发现项 ID 表与目标引用（FINDINGS_INDEX_FILE）
+INDEX_OUTPUT = False
+
+# 常驻模式的刷新间隔与随机抖动（秒）
+DAEMON_INTERVAL = 60
+DAEMON_JITTER = 5
+# 监听模式下的全量扫描间隔（秒），防止遗漏的文件事件导致数据长期不更新
+DAEMON_FULL_SCAN = 600
+
+# 增量收集缓存，跨多轮 collect_data() 复用
+# {"signature": TARGETS_FILE 签名, "projects": load_targets() 结果}
+_TARGETS_CACHE = {}
+# SCAN_PROC_DIR 目录索引: {"dir": 目录, "entries": {文件名: (key, 路径, 后缀, 优先级, 签名)}}
+_SCAN_INDEX = {}
+# (工具, 目标) -> (文件签名, ToolResult, 进程信息文件解析结果 ToolResult, 日志路径)
+_TOOL_CACHE = {}
+# 项目名 -> Project
+_PROJECT_CACHE = {}
+# 历史时序库连接，首次写入时打开
+_HISTORY = {}
+# 发现项差异状态，首次使用时从状态文件加载
+_FINDINGS_DIFF = {}
+# 发现项索引，跨多轮增量更新
+_FINDINGS_INDEX = FindingsIndex()
+
 
 def load_targets():
     """从文件加载目标列表"""
@@ -35,8 +100,20 @@ def load_targets():
         return []
 
 
-def get_process_status(tool_name, target_name):
-    """获取指定工具对指定目标的扫描状态"""
+def load_targets_cached():
+    """TARGETS_FILE 未变化时复用上次 load_targets() 的结果"""
+    signature = _file_signature(TARGETS_FILE)
+    if _TARGETS_CACHE.get("signature", False) != signature:
+        _TARGETS_CACHE["projects"] = load_targets()
+        _TARGETS_CACHE["signature"] = signature
+    return _TARGETS_CACHE["projects"]
+
+
+def get_process_status(tool_name, target_name, snapshot=None):
+    """获取指定工具对指定目标的扫描状态
+    
+    snapshot 为本轮共享的进程快照；未提供时现场采集一次
+    """
     # 尝试从进程信息文件中读取
     proc_file = os.path.join(SCAN_PROC_DIR, f"{target_name}_{tool_name}.json")
     
@@ -47,22 +124,22 @@ def get_process_status(tool_name, target_name):
         except (json.JSONDecodeError, IOError):
             pass
     
-    # 尝试通过 ps 命令查找进程
-    try:
-        result = subprocess.run(
-            ["pgrep", "-f", f"{tool_name}.*{target_name}"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            return {
-                "status": "scanning",
-                "progress": 50,
-                "scanned": 0,
-                "found": 0
-            }
-    except Exception:
-        pass
+    # 从进程快照中查找 (工具, 目标)
+    if snapshot is None:
+        snapshot = take_snapshot()
+    if snapshot.is_running(tool_name, target_name):
+        # 进度取自扫描日志，没有日志时未知（0）
+        status = {
+            "status": "scanning",
+            "progress": 0,
+            "scanned": 0,
+            "found": 0
+        }
+        parser = get_parser(tool_name)
+        if parser and parser.log_suffix:
+            log_file = os.path.join(SCAN_LOG_DIR, f"{SCAN_LOG_PREFIX}{target_name}{parser.log_suffix}")
+            apply_log_progress(status, tool_name, log_file)
+        return status
     
     # 返回默认状态
     return {
@@ -73,76 +150,67 @@ def get_process_status(tool_name, target_name):
     }
 
 
-def get_tool_data(tool_name, target_name):
-    """获取特定工具的扫描数据"""
-    base_data = {
-        "name": tool_name,
-        "status": "pending",
-        "progress": 0,
-        "scanned": 0,
-        "found": 0
-    }
+def get_tool_data(tool_name, target_name, files=None):
+    """获取特定工具的扫描数据
     
-    if tool_name == "Strix":
-        # Strix API 扫描器 - 收集端点信息
-        proc_file = os.path.join(SCAN_PROC_DIR, f"{target_name}_strix.json")
-        if os.path.exists(proc_file):
-            try:
-                with open(proc_file, 'r') as f:
-                    data = json.load(f)
-                    base_data.update({
-                        "status": data.get("status", "pending"),
-                        "progress": data.get("progress", 0),
-                        "scanned": data.get("endpoints_scanned", 0),
-                        "found": data.get("endpoints_found", 0),
-                        "endpoints": data.get("discovered_endpoints", [])
-                    })
-            except Exception:
-                pass
-        
-        # 额外尝试从日志获取
-        log_file = f"/tmp/vuln_scan_{target_name}_strix.log"
-        if os.path.exists(log_file):
-            base_data["status"] = "scanning"
-            base_data["progress"] = 60
-    
-    elif tool_name == "Nikto":
-        # Nikto Web 漏洞扫描
-        proc_file = os.path.join(SCAN_PROC_DIR, f"{target_name}_nikto.json")
-        if os.path.exists(proc_file):
-            try:
-                with open(proc_file, 'r') as f:
-                    data = json.load(f)
-                    base_data.update({
-                        "status": data.get("status", "pending"),
-                        "progress": data.get("progress", 0),
-                        "scanned": data.get("items_scanned", 0),
-                        "found": data.get("vulns_found", 0),
-                        "vulns": data.get("vulnerabilities", [])
-                    })
-            except Exception:
-                pass
-    
-    elif tool_name == "Nmap":
-        # Nmap 端口扫描
-        proc_file = os.path.join(SCAN_PROC_DIR, f"{target_name}_nmap.json")
-        if os.path.exists(proc_file):
-            try:
-                with open(proc_file, 'r') as f:
-                    data = json.load(f)
-                    base_data.update({
-                        "status": data.get("status", "pending"),
-                        "progress": data.get("progress", 0),
-                        "scanned": data.get("ports_scanned", 0),
-                        "found": data.get("open_ports", 0),
-                        "ports": data.get("open_ports_list", [])
-                    })
-            except Exception:
-                pass
+    files 为目录索引给出的 (进程信息文件, 后缀, 日志文件)，不存在的项为 None；
+    单独调用时按解析器声明的默认文件名查找
+    """
+    parser = get_parser(tool_name)
+    if parser is None:
+        return {"name": tool_name, "status": "pending", "progress": 0, "scanned": 0, "found": 0}
+    
+    if files is None:
+        suffix = parser.default_suffix
+        proc_file = os.path.join(SCAN_PROC_DIR, f"{target_name}{suffix}")
+        log_file = None
+        if parser.log_suffix:
+            log_file = os.path.join(SCAN_LOG_DIR, f"{SCAN_LOG_PREFIX}{target_name}{parser.log_suffix}")
+            if not os.path.exists(log_file):
+                log_file = None
+    else:
+        proc_file, suffix, log_file = files
+    
+    base_data = parser.parse_file(proc_file, suffix) if proc_file else None
+    if base_data is None:
+        base_data = parser.empty()
+    
+    # 额外尝试从日志获取
+    if log_file:
+        apply_log_progress(base_data, tool_name, log_file)
     
     return base_data
 
 
+def apply_log_progress(tool_data, tool_name, log_file):
+    """用扫描日志中的实际进度更新工具数据
+    
+    进程信息文件未报告完成时，日志存在即视为扫描中；解析到完成标志时为已完成，
+    解析到进度行时使用日志进度，并按速率给出预计剩余秒数
+    """
+    if tool_data.get("status") == "completed":
+        # 进程信息文件已报告完成，日志不再覆盖
+        return tool_data
+    
+    state = TRACKER.update(tool_name, log_file)
+    if state is None:
+        return tool_data
+    
+    if state.done:
+        tool_data["status"] = "completed"
+        tool_data["progress"] = 100
+        tool_data.pop("eta_seconds", None)
+        return tool_data
+    
+    tool_data["status"] = "scanning"
+    if state.progress is not None:
+        tool_data["progress"] = int(state.progress)
+    eta = state.eta_seconds()
+    if eta is not None:
+        tool_data["eta_seconds"] = eta
+    return tool_data
+
+
 def calculate_project_progress(targets):
     """计算项目整体进度"""
     if not targets:
@@ -184,13 +252,159 @@ def get_project_status(targets):
         return "pending"
 
 
-def collect_data():
-    """主数据收集函数"""
+def _file_signature(path):
+    """文件签名 (inode, mtime_ns, size)，文件不存在时为 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _entry_signature(entry):
+    st = entry.stat()
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def index_scan_files(changed=None):
+    """一次 os.scandir 建立 SCAN_PROC_DIR 的工具文件索引
+    
+    返回 {(工具, 目标): (路径, 后缀, 签名)}。changed 为监听器给出的变化文件名集合，
+    给出时只 stat 这些文件，其余沿用上一轮索引
+    """
+    entries = _SCAN_INDEX.get("entries")
+    if changed is None or entries is None or _SCAN_INDEX.get("dir") != SCAN_PROC_DIR:
+        entries = {}
+        with os.scandir(SCAN_PROC_DIR) as it:
+            for entry in it:
+                matched = match_file(entry.name)
+                if matched is None:
+                    continue
+                parser, target, suffix, rank = matched
+                try:
+                    signature = _entry_signature(entry)
+                except OSError:
+                    continue
+                entries[entry.name] = ((parser.name, target), entry.path, suffix, rank, signature)
+        _SCAN_INDEX.update(dir=SCAN_PROC_DIR, entries=entries)
+    else:
+        for name in changed:
+            matched = match_file(name)
+            if matched is None:
+                continue
+            parser, target, suffix, rank = matched
+            path = os.path.join(SCAN_PROC_DIR, name)
+            signature = _file_signature(path)
+            if signature is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = ((parser.name, target), path, suffix, rank, signature)
+    
+    # 同一 (工具, 目标) 有多个文件时取优先级最高（rank 最小）的
+    files = {}
+    best = {}
+    for key, path, suffix, rank, signature in entries.values():
+        if key not in best or rank < best[key]:
+            best[key] = rank
+            files[key] = (path, suffix, signature)
+    return files
+
+
+def index_log_files():
+    """一次 os.scandir 建立 SCAN_LOG_DIR 的扫描日志索引: {(工具, 目标): (路径, 签名)}"""
+    logs = {}
+    try:
+        with os.scandir(SCAN_LOG_DIR) as it:
+            for entry in it:
+                matched = match_log(entry.name, SCAN_LOG_PREFIX)
+                if matched is None:
+                    continue
+                parser, target = matched
+                try:
+                    logs[(parser.name, target)] = (entry.path, _entry_signature(entry))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return logs
+
+
+def _fetch_tool_data(job, proc_entry=None, log_entry=None):
+    """线程池任务: 读取单个 (工具, 目标) 的数据
+    
+    proc_entry / log_entry 来自本轮目录索引。文件签名未变化时直接复用上次解析结果；
+    只有日志增长时不重新解析进程信息文件，只读取日志新增部分。
+    返回 (ToolResult, 是否重新解析)
+    """
+    tool_name, url = job
+    proc_sig = proc_entry[2] if proc_entry else None
+    log_path = log_entry[0] if log_entry else None
+    signature = (proc_sig, log_entry[1] if log_entry else None)
+    cached = _TOOL_CACHE.get(job)
+    if cached and cached[0] == signature:
+        return cached[1], False
+    
+    if cached and cached[0][0] == proc_sig:
+        proc_data = cached[2]
+    else:
+        parser = get_parser(tool_name)
+        proc_data = parser.parse_file(proc_entry[0], proc_entry[1]) if parser and proc_entry else None
+        if proc_data is None:
+            proc_data = get_tool_data(tool_name, url, (None, None, None))
+        proc_data = ToolResult.from_dict(proc_data)
+    
+    if cached and cached[3] and cached[3] != log_path:
+        TRACKER.forget(cached[3])
+    
+    tool_data = proc_data
+    if log_path:
+        tool_data = ToolResult.from_dict(apply_log_progress(proc_data.to_dict(), tool_name, log_path))
+    _TOOL_CACHE[job] = (signature, tool_data, proc_data, log_path)
+    return tool_data, True
+
+
+def get_history_store(path=HISTORY_DB):
+    """返回（并缓存）历史时序库连接"""
+    store = _HISTORY.get(path)
+    if store is None:
+        store = _HISTORY[path] = HistoryStore(path)
+    return store
+
+
+def get_findings_diff():
+    """返回（并缓存）发现项差异状态"""
+    differ = _FINDINGS_DIFF.get("differ")
+    if differ is None:
+        differ = _FINDINGS_DIFF["differ"] = FindingsDiff()
+    return differ
+
+
+def collect_data(workers=COLLECT_WORKERS, changed=None, pretty=None, shard=None, history=None,
+                 diff=None, index=None, snapshot=None):
+    """主数据收集函数
+    
+    增量执行: 只重新解析发生变化的工具文件，
+    只为目标有变化的项目重新计算进度和状态
+    """
+    started = time.perf_counter()
+    if pretty is None:
+        pretty = OUTPUT_PRETTY
+    if shard is None:
+        shard = SHARD_OUTPUT
+    if history is None:
+        history = HISTORY_OUTPUT
+    if diff is None:
+        diff = DIFF_OUTPUT
+    if index is None:
+        index = INDEX_OUTPUT
+    if snapshot is None:
+        snapshot = SNAPSHOT_OUTPUT
+    
     # 确保输出目录存在
     os.makedirs(SCAN_PROC_DIR, exist_ok=True)
     
     # 加载项目列表
-    project_configs = load_targets()
+    project_configs = load_targets_cached()
     
     if not project_configs:
         # 如果没有配置，生成示例数据
@@ -199,38 +413,63 @@ def collect_data():
             {"name": "Example Site", "targets": ["www.example.com"]}
         ]
     
+    # 展开所有 (工具, 目标) 读取任务，并发执行后按原顺序取回
+    jobs = [
+        (tool_name, url)
+        for proj in project_configs
+        for url in proj.get("targets", [])
+        for tool_name in SCAN_TOOLS
+    ]
+    # 每轮只扫描一次目录，按文件名分派给各工具解析器
+    scan_index = index_scan_files(changed)
+    log_index = index_log_files()
+    fetch = lambda job: _fetch_tool_data(job, scan_index.get(job), log_index.get(job))
+    if workers and workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch, jobs))
+    else:
+        results = [fetch(job) for job in jobs]
+    reparsed = sum(1 for _, fresh in results if fresh)
+    results = iter(results)
+    
+    # 清理已不在目标列表中的缓存
+    if len(_TOOL_CACHE) > len(jobs):
+        for key in set(_TOOL_CACHE) - set(jobs):
+            del _TOOL_CACHE[key]
+    
     projects = []
+    project_cache = {}
+    recomputed = set()
     
     for proj in project_configs:
         project_name = proj.get("name", "Unknown")
         target_urls = proj.get("targets", [])
         
         targets = []
+        touched = False
         for url in target_urls:
-            # 为每个目标收集各工具的数据
+            # executor.map 保持提交顺序，按工具数依次取出
             tools = []
-            for tool_name in SCAN_TOOLS:
-                tool_data = get_tool_data(tool_name, url)
+            for _ in SCAN_TOOLS:
+                tool_data, fresh = next(results)
                 tools.append(tool_data)
+                touched = touched or fresh
             
-            target_entry = {
-                "name": url,
-                "tools": tools
-            }
-            targets.append(target_entry)
-        
-        # 计算项目进度和状态
-        progress = calculate_project_progress(targets)
-        status = get_project_status(targets)
+            targets.append(Target(url, tools))
         
-        project_entry = {
-            "name": project_name,
-            "status": status,
-            "progress": progress,
-            "targets": targets,
-            "last_updated": datetime.now().isoformat()
-        }
+        cached = _PROJECT_CACHE.get(project_name)
+        if cached and not touched and cached.target_count == len(targets):
+            # 目标均未变化，沿用上次的项目条目
+            project_entry = cached
+        else:
+            # 构建时计算项目进度、状态和汇总计数
+            project_entry = Project(project_name, targets, last_updated=datetime.now().isoformat())
+            recomputed.add(project_name)
         projects.append(project_entry)
+        project_cache[project_name] = project_entry
+    
+    _PROJECT_CACHE.clear()
+    _PROJECT_CACHE.update(project_cache)
     
     # 构建最终数据结构
     dashboard_data = {
@@ -239,17 +478,100 @@ def collect_data():
         "version": "1.0.0"
     }
     
-    # 写入输出文件
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(dashboard_data, f, indent=2, ensure_ascii=False)
+    # 逐个项目流式写入临时文件，再原子替换输出文件
+    meta = {key: value for key, value in dashboard_data.items() if key != "projects"}
+    write_dashboard_json(OUTPUT_FILE, projects, meta, pretty=pretty)
+    if shard:
+        write_shards(projects, meta, dirty=recomputed, pretty=pretty)
+    if snapshot:
+        size = write_snapshot(SNAPSHOT_FILE, projects, meta)
+        print(f"Snapshot: {SNAPSHOT_FILE} ({size} bytes)")
+    if history:
+        # 只有重新计算过的项目可能产生新样本，未变化的序列由存储端去重
+        samples = get_history_store().record_pass(projects, only=recomputed)
+        print(f"History: {samples} samples -> {HISTORY_DB}")
+    if diff:
+        events = get_findings_diff().diff(projects, only=recomputed, ts=dashboard_data["last_updated"])
+        append_changes(events)
+        added = sum(1 for e in events if e["change"] == "added")
+        print(f"Changes: +{added} -{len(events) - added} -> {CHANGES_FILE}")
+    if index and _FINDINGS_INDEX.update(projects, only=recomputed):
+        # 每轮都按当前项目集合更新: 没有重新计算的项目时也会移除已删除的项目
+        _FINDINGS_INDEX.save()
+        print(f"Findings: {len(_FINDINGS_INDEX.postings)} distinct -> {FINDINGS_INDEX_FILE}")
     
     print(f"Data collected at {datetime.now().isoformat()}")
     print(f"Output: {OUTPUT_FILE}")
     print(f"Projects: {len(projects)}")
+    print(f"Elapsed: {time.perf_counter() - started:.3f}s "
+          f"({len(jobs)} tool reads, {reparsed} reparsed, "
+          f"{len(recomputed)} projects recomputed, workers={workers})")
     
     return dashboard_data
 
 
+def shard_filename(project_name):
+    """项目分片文件名: 可读的 slug + 名称哈希（避免不同名称 slug 相同）"""
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", project_name).strip("-.").lower() or "project"
+    digest = hashlib.sha1(project_name.encode("utf-8")).hexdigest()[:8]
+    return f"{slug[:48]}-{digest}.json"
+
+
+def manifest_entry(project):
+    """清单条目: 卡片列表所需的最少字段"""
+    if isinstance(project, Project):
+        target_count, found = project.target_count, project.found
+    else:
+        target_count = len(project.get("targets", []))
+        found = sum(
+            tool.get("found", 0)
+            for target in project.get("targets", [])
+            for tool in target.get("tools", [])
+        )
+    return {
+        "name": project.get("name", "Unknown"),
+        "status": project.get("status", "pending"),
+        "progress": project.get("progress", 0),
+        "targetCount": target_count,
+        "found": found,
+        "last_updated": project.get("last_updated"),
+        "file": f"{SHARD_PROJECTS_DIR}/{shard_filename(project.get('name', 'Unknown'))}"
+    }
+
+
+def write_shards(projects, meta, dirty=None, pretty=False):
+    """写出分片数据: SHARD_DIR/projects/<项目>.json + SHARD_DIR/manifest.json
+    
+    dirty 为本轮重新计算过的项目名集合，其余已存在的分片文件不再重写；
+    为 None 时全部重写。清单最后写入，读者看到的清单总是指向完整分片
+    """
+    projects_dir = os.path.join(SHARD_DIR, SHARD_PROJECTS_DIR)
+    os.makedirs(projects_dir, exist_ok=True)
+    indent = 2 if pretty else None
+    separators = None if pretty else (",", ":")
+    
+    entries = []
+    for project in projects:
+        entry = manifest_entry(project)
+        path = os.path.join(SHARD_DIR, entry["file"])
+        if dirty is None or entry["name"] in dirty or not os.path.exists(path):
+            with atomic_open(path) as f:
+                json.dump(project, f, indent=indent, separators=separators, ensure_ascii=False,
+                          default=json_default)
+        entries.append(entry)
+    
+    # 清理已删除项目的分片
+    live = {os.path.basename(entry["file"]) for entry in entries}
+    for name in os.listdir(projects_dir):
+        if name.endswith(".json") and name not in live:
+            os.remove(os.path.join(projects_dir, name))
+    
+    manifest = dict(meta, projects=entries)
+    with atomic_open(os.path.join(SHARD_DIR, SHARD_MANIFEST)) as f:
+        json.dump(manifest, f, indent=indent, separators=separators, ensure_ascii=False)
+    return manifest
+
+
 def simulate_scan_data():
     """生成模拟扫描数据（用于测试）"""
     # 确保目录存在
@@ -300,12 +622,108 @@ def simulate_scan_data():
     print("Simulated scan data created")
 
 
+def run_daemon(workers=COLLECT_WORKERS, interval=DAEMON_INTERVAL, jitter=DAEMON_JITTER,
+               watch=False, render=False, full_scan=DAEMON_FULL_SCAN):
+    """常驻模式: 目标列表、解析结果和进程快照留在内存中，按间隔增量刷新
+    
+    watch=True 时通过 inotify 监听 SCAN_PROC_DIR，文件变化立即刷新，
+    interval 退化为最长等待时间；事件丢失（队列溢出、目录重建）时以及每隔 full_scan 秒
+    做一次全量扫描。render=True 时每轮同时生成看板 HTML
+    """
+    watcher = None
+    if watch:
+        from scan_watcher import DirectoryWatcher
+        os.makedirs(SCAN_PROC_DIR, exist_ok=True)
+        watcher = DirectoryWatcher(SCAN_PROC_DIR)
+        print(f"Watching {SCAN_PROC_DIR} ({'inotify' if watcher.uses_inotify else 'polling'})")
+    if render:
+        import dashboard
+    
+    print(f"Collector daemon started: interval={interval}s, jitter={jitter}s")
+    changed = None
+    last_full = None
+    try:
+        while True:
+            now = time.monotonic()
+            if last_full is None or now - last_full >= full_scan:
+                changed = None
+            if changed is None:
+                last_full = now
+            try:
+                snapshot = take_snapshot()
+                data = collect_data(workers=workers, changed=changed)
+                if render:
+                    dashboard.generate_dashboard(data=data, snapshot=snapshot, sharded=SHARD_OUTPUT)
+            except Exception as e:
+                # 单轮失败不影响常驻进程
+                print(f"Collection pass failed: {e}")
+            
+            # 抖动避免多个实例同时扫描磁盘
+            delay = max(1.0, interval + random.uniform(-jitter, jitter))
+            if watcher:
+                changed = watcher.wait(delay)
+            else:
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if watcher:
+            watcher.close()
+
+
 if __name__ == "__main__":
-    import sys
+    import argparse
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--simulate":
+    parser = argparse.ArgumentParser(description="Collect vulnerability scan data")
+    parser.add_argument("--simulate", action="store_true", help="Create simulated scan data first")
+    parser.add_argument("-w", "--workers", type=int, default=COLLECT_WORKERS,
+                        help=f"Parallel read workers (default: {COLLECT_WORKERS}, 1 = serial)")
+    parser.add_argument("--pretty", action="store_true",
+                        help="Write indented JSON for debugging (default: compact)")
+    parser.add_argument("--shard", action="store_true",
+                        help=f"Also write per-project shards and a manifest to {SHARD_DIR}")
+    parser.add_argument("--snapshot", action="store_true",
+                        help=f"Also write the compact binary snapshot {SNAPSHOT_FILE}")
+    parser.add_argument("--history", action="store_true",
+                        help=f"Append per-tool progress/findings samples to {HISTORY_DB}")
+    parser.add_argument("--diff", action="store_true",
+                        help=f"Append added/removed endpoints, vulns and ports to {CHANGES_FILE}")
+    parser.add_argument("--index", action="store_true",
+                        help=f"Write the deduplicated findings table and per-target references to {FINDINGS_INDEX_FILE}")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep running and re-collect incrementally on a schedule")
+    parser.add_argument("--interval", type=float, default=DAEMON_INTERVAL,
+                        help=f"Daemon refresh interval in seconds (default: {DAEMON_INTERVAL})")
+    parser.add_argument("--jitter", type=float, default=DAEMON_JITTER,
+                        help=f"Random +/- jitter added to each interval (default: {DAEMON_JITTER})")
+    parser.add_argument("--watch", action="store_true",
+                        help=f"Daemon mode woken early by changes in {SCAN_PROC_DIR} (inotify)")
+    parser.add_argument("--full-scan", type=float, default=DAEMON_FULL_SCAN,
+                        help=f"With --watch, rescan all scan files at least this often in seconds (default: {DAEMON_FULL_SCAN})")
+    parser.add_argument("--render", action="store_true",
+                        help="In daemon mode, also regenerate the dashboard HTML each pass")
+    args = parser.parse_args()
+    
+    if args.pretty:
+        OUTPUT_PRETTY = True
+    if args.shard:
+        SHARD_OUTPUT = True
+    if args.snapshot:
+        SNAPSHOT_OUTPUT = True
+    if args.history:
+        HISTORY_OUTPUT = True
+    if args.diff:
+        DIFF_OUTPUT = True
+    if args.index:
+        INDEX_OUTPUT = True
+    
+    if args.simulate:
         # 生成模拟数据用于测试
         simulate_scan_data()
     
-    # 执行数据收集
-    collect_data()
+    if args.daemon or args.watch:
+        run_daemon(workers=args.workers, interval=args.interval, jitter=args.jitter,
+                   watch=args.watch, render=args.render, full_scan=args.full_scan)
+    else:
+        # 执行数据收集
+        collect_data(workers=args.workers)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 发现项差异
+每轮收集后把各目标的 endpoints / vulns / ports 列表与上一轮比较，
+把新增和消失的条目（带首次发现时间）追加到 JSONL 变更流，
+下游（看板、同步、告警）只需按偏移读取增量
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from atomic_writer import atomic_write_text
+
+# 上一轮的发现项状态: {项目: {目标: {工具: {类别: {条目: 首次发现时间}}}}}
+FINDINGS_STATE = "/tmp/vuln_dashboard_findings.json"
+# 变更流，每行一个事件
+CHANGES_FILE = "/tmp/vuln_dashboard_changes.jsonl"
+# 变更流超过此大小时轮转为 CHANGES_FILE.1
+MAX_CHANGES_BYTES = 16 * 1024 * 1024
+
+# 参与比较的工具数据列表字段
+FINDING_LISTS = ("endpoints", "vulns", "ports")
+
+
+def _event(ts, project, target, tool, kind, change, finding, first_seen):
+    return {
+        "ts": ts,
+        "project": project,
+        "target": target,
+        "tool": tool,
+        "kind": kind,
+        "change": change,
+        "finding": finding,
+        "first_seen": first_seen
+    }
+
+
+def _removed_all(ts, project, targets, events, target=None):
+    """整个项目或目标消失时，把其所有条目记为 removed"""
+    for target_name, tools in targets.items():
+        if target is not None and target_name != target:
+            continue
+        for tool_name, kinds in tools.items():
+            for kind, seen in kinds.items():
+                for finding, first_seen in seen.items():
+                    events.append(_event(ts, project, target_name, tool_name, kind, "removed",
+                                         finding, first_seen))
+
+
+class FindingsDiff:
+    """保存上一轮的发现项集合，计算本轮的增删"""
+
+    def __init__(self, state_file=FINDINGS_STATE):
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        # 状态文件不存在时，第一轮只建立基线，不输出事件
+        self.baseline = not os.path.exists(state_file)
+        self.state = {}
+        if not self.baseline:
+            try:
+                with open(state_file, "r") as f:
+                    self.state = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                self.baseline = True
+
+    def diff(self, projects, only=None, ts=None):
+        """比较本轮数据，更新状态并返回变更事件列表
+
+        only 为本轮重新计算过的项目名集合，其余项目的发现项不可能变化，直接跳过
+        """
+        ts = ts or datetime.now().isoformat()
+        events = []
+        with self._lock:
+            names = set()
+            for project in projects:
+                name = project.get("name", "Unknown")
+                names.add(name)
+                if only is not None and name not in only and name in self.state:
+                    continue
+                self._diff_project(ts, name, project.get("targets", []), events)
+
+            # 从配置中删除的项目
+            for name in set(self.state) - names:
+                _removed_all(ts, name, self.state.pop(name), events)
+
+            if self.baseline:
+                self.baseline = False
+                events = []
+                self.save()
+            elif events:
+                self.save()
+        return events
+
+    def _diff_project(self, ts, project, targets, events):
+        old_targets = self.state.get(project, {})
+        new_targets = {}
+        for target in targets:
+            target_name = target.get("name", "")
+            old_tools = old_targets.get(target_name, {})
+            new_tools = {}
+            for tool in target.get("tools", []):
+                tool_name = tool.get("name", "")
+                old_kinds = old_tools.get(tool_name, {})
+                new_kinds = {}
+                for kind in FINDING_LISTS:
+                    items = tool.get(kind)
+                    if not items and kind not in old_kinds:
+                        continue
+                    old_seen = old_kinds.get(kind, {})
+                    current = {str(item) for item in items or ()}
+                    if current == old_seen.keys():
+                        # 集合未变化，沿用原字典（含首次发现时间）
+                        new_kinds[kind] = old_seen
+                        continue
+                    seen = {}
+                    for finding in current:
+                        first_seen = old_seen.get(finding)
+                        if first_seen is None:
+                            first_seen = ts
+                            events.append(_event(ts, project, target_name, tool_name, kind, "added",
+                                                 finding, first_seen))
+                        seen[finding] = first_seen
+                    for finding in old_seen.keys() - current:
+                        events.append(_event(ts, project, target_name, tool_name, kind, "removed",
+                                             finding, old_seen[finding]))
+                    if seen:
+                        new_kinds[kind] = seen
+                if new_kinds:
+                    new_tools[tool_name] = new_kinds
+            if new_tools:
+                new_targets[target_name] = new_tools
+
+        # 从项目中删除的目标
+        for target_name in old_targets.keys() - {t.get("name", "") for t in targets}:
+            _removed_all(ts, project, old_targets, events, target=target_name)
+
+        if new_targets:
+            self.state[project] = new_targets
+        else:
+            self.state.pop(project, None)
+
+    def save(self):
+        atomic_write_text(self.state_file, json.dumps(self.state, separators=(",", ":"), ensure_ascii=False))
+
+
+def _read_generation(f):
+    """变更流首行的代号，返回 (代号, 首个事件的偏移)；没有首行代号的旧文件返回 (None, 0)"""
+    f.seek(0)
+    line = f.readline()
+    if line.endswith(b"\n"):
+        try:
+            header = json.loads(line)
+        except json.JSONDecodeError:
+            header = None
+        if isinstance(header, dict) and isinstance(header.get("generation"), str):
+            return header["generation"], len(line)
+    return None, 0
+
+
+def _start_changes(path):
+    """原子创建只含代号行的新变更流，代号为随机值，与 inode 是否复用无关"""
+    header = json.dumps({"generation": os.urandom(8).hex()}, separators=(",", ":"))
+    atomic_write_text(path, header + "\n")
+
+
+def append_changes(events, path=CHANGES_FILE):
+    """把事件追加到变更流，超过 MAX_CHANGES_BYTES 时先轮转
+
+    新文件（包括轮转后的文件）首行写入新的代号；没有代号行的旧文件也轮转一次
+    """
+    if not events:
+        return
+    try:
+        with open(path, "rb") as f:
+            rotate = (os.fstat(f.fileno()).st_size > MAX_CHANGES_BYTES
+                      or _read_generation(f)[0] is None)
+    except FileNotFoundError:
+        _start_changes(path)
+    else:
+        if rotate:
+            os.replace(path, path + ".1")
+            _start_changes(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in events))
+
+
+def read_changes(offset=0, limit=1000, path=CHANGES_FILE, generation=None):
+    """从字节偏移 offset 起读取最多 limit 个事件，返回 (事件列表, 下一次的偏移, 变更流代号)
+
+    代号取自文件首行，每次创建或轮转时随机生成。调用方把上次返回的代号和偏移一起传回，
+    代号不同（已轮转，即使新文件已超过原偏移）或偏移不在事件范围内时从第一个事件读取
+    """
+    events = []
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return events, 0, None
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        token, start = _read_generation(f)
+        if (generation is not None and generation != token) or not start <= offset <= size:
+            offset = start
+        f.seek(offset)
+        while len(events) < limit:
+            line = f.readline()
+            # 只消费完整的行，写了一半的行留到下一次
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return events, offset, token
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 发现项规范化与去重索引
+把各工具输出的端口、漏洞描述和端点规范化（端口统一为整数、描述合并空白、
+端点统一斜杠），每个不同的发现项只存一份并分配整数 ID，
+目标只保存 ID 引用；倒排索引回答"哪些目标有发现项 X"
+"""
+
+import argparse
+import json
+import re
+import threading
+
+from atomic_writer import atomic_write_text
+
+FINDINGS_INDEX_FILE = "/tmp/vuln_dashboard_findings_index.json"
+
+_WHITESPACE = re.compile(r"\s+")
+_SLASHES = re.compile(r"/{2,}")
+
+
+def canonical_port(value):
+    """80 / "80" / "80/tcp" -> 80，无效端口返回 None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        port = value
+    else:
+        text = str(value).strip().split("/", 1)[0]
+        if not text.isdigit():
+            return None
+        port = int(text)
+    return port if 0 < port < 65536 else None
+
+
+def canonical_vuln(value):
+    """合并空白，去掉 Nikto 行首的 "+ " 和句末的句号"""
+    text = _WHITESPACE.sub(" ", str(value)).strip()
+    if text.startswith("+ "):
+        text = text[2:]
+    text = text.rstrip(". ")
+    return text or None
+
+
+def canonical_endpoint(value):
+    """补全开头的 "/"，合并重复斜杠；保留末尾斜杠（"/admin" 与 "/admin/" 可能是不同的资源）"""
+    text = str(value).strip()
+    if not text:
+        return None
+    if not text.startswith("/") and "://" not in text:
+        text = "/" + text
+    scheme, sep, rest = text.rpartition("://")
+    return scheme + sep + _SLASHES.sub("/", rest)
+
+
+# 列表字段 -> (规范化函数, 去重键)
+CANONICALIZERS = {
+    "ports": (canonical_port, lambda port: port),
+    "vulns": (canonical_vuln, str.casefold),
+    "endpoints": (canonical_endpoint, lambda path: path),
+}
+
+
+def normalize_list(kind, items):
+    """规范化并去重一个发现项列表，保持首次出现的顺序；端口按数值排序"""
+    entry = CANONICALIZERS.get(kind)
+    if entry is None or not isinstance(items, list):
+        return items
+    canonical, key = entry
+    seen = set()
+    result = []
+    for item in items:
+        value = canonical(item)
+        if value is None:
+            continue
+        k = key(value)
+        if k not in seen:
+            seen.add(k)
+            result.append(value)
+    if kind == "ports":
+        result.sort()
+    return result
+
+
+class FindingsIndex:
+    """发现项 ID 表 + 目标引用 + 倒排索引"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # ID -> (类别, 值)
+        self.findings = []
+        # (类别, 去重键) -> ID
+        self._ids = {}
+        # ID -> {(项目, 目标, 工具)}
+        self.postings = {}
+        # 项目 -> {目标: {工具: (ID, ...)}}
+        self.refs = {}
+
+    def intern(self, kind, value):
+        """返回发现项 ID，首次出现时分配新 ID"""
+        key = (kind, CANONICALIZERS[kind][1](value))
+        fid = self._ids.get(key)
+        if fid is None:
+            fid = self._ids[key] = len(self.findings)
+            self.findings.append((kind, value))
+        return fid
+
+    def lookup(self, kind, value):
+        """按原始值查找发现项 ID，不存在时返回 None"""
+        entry = CANONICALIZERS.get(kind)
+        if entry is None:
+            return None
+        value = entry[0](value)
+        if value is None:
+            return None
+        return self._ids.get((kind, entry[1](value)))
+
+    def _unlink(self, project):
+        for target, tools in self.refs.pop(project, {}).items():
+            for tool, ids in tools.items():
+                for fid in ids:
+                    holders = self.postings.get(fid)
+                    if holders:
+                        holders.discard((project, target, tool))
+                        if not holders:
+                            del self.postings[fid]
+
+    def update(self, projects, only=None):
+        """按本轮数据更新索引；only 为有变化的项目名集合，其余项目沿用原引用
+
+        不在 projects 中的项目（已从 targets.json 删除）每次都会被移除，
+        不再被引用的发现项超过一半时压缩 ID 表。返回重建和移除的项目数，为 0 时索引没有变化
+        """
+        with self._lock:
+            names = set()
+            updated = 0
+            for project in projects:
+                name = project.get("name", "Unknown")
+                names.add(name)
+                if only is not None and name not in only and name in self.refs:
+                    continue
+                updated += 1
+                self._unlink(name)
+                targets = {}
+                for target in project.get("targets", []):
+                    target_name = target.get("name", "")
+                    tools = {}
+                    for tool in target.get("tools", []):
+                        ids = []
+                        for kind in CANONICALIZERS:
+                            for value in normalize_list(kind, tool.get(kind) or []):
+                                ids.append(self.intern(kind, value))
+                        if ids:
+                            tool_name = tool.get("name", "")
+                            tools[tool_name] = tuple(ids)
+                            for fid in ids:
+                                self.postings.setdefault(fid, set()).add((name, target_name, tool_name))
+                    if tools:
+                        targets[target_name] = tools
+                self.refs[name] = targets
+            for name in set(self.refs) - names:
+                updated += 1
+                self._unlink(name)
+            if len(self.findings) > 2 * len(self.postings):
+                self._compact()
+            return updated
+
+    def _compact(self):
+        """丢弃不再被任何目标引用的发现项，按原顺序重新编号"""
+        live = sorted(self.postings)
+        remap = {old: new for new, old in enumerate(live)}
+        self.findings = [self.findings[fid] for fid in live]
+        self._ids = {key: remap[fid] for key, fid in self._ids.items() if fid in remap}
+        self.postings = {remap[fid]: holders for fid, holders in self.postings.items()}
+        self.refs = {
+            project: {
+                target: {tool: tuple(remap[fid] for fid in ids) for tool, ids in tools.items()}
+                for target, tools in targets.items()
+            }
+            for project, targets in self.refs.items()
+        }
+
+    def targets_with(self, fid):
+        """拥有该发现项的 [(项目, 目标, 工具)]"""
+        return sorted(self.postings.get(fid, ()))
+
+    def search(self, kind=None, q=""):
+        """按类别和子串筛选发现项，按受影响目标数降序"""
+        needle = q.casefold()
+        result = [
+            {"id": fid, "kind": k, "value": value, "targets": len(holders)}
+            for fid, holders in self.postings.items()
+            for k, value in (self.findings[fid],)
+            if (kind is None or k == kind) and needle in str(value).casefold()
+        ]
+        result.sort(key=lambda f: (-f["targets"], f["id"]))
+        return result
+
+    def to_json(self):
+        """紧凑表示: 发现项表 + 各目标的 ID 引用"""
+        return {
+            "findings": [[kind, value] for kind, value in self.findings],
+            "refs": self.refs,
+        }
+
+    def save(self, path=FINDINGS_INDEX_FILE):
+        atomic_write_text(path, json.dumps(self.to_json(), separators=(",", ":"), ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query findings across all targets")
+    parser.add_argument("--data", default="/tmp/vuln_dashboard_data.json", help="Dashboard data file")
+    parser.add_argument("--kind", choices=sorted(CANONICALIZERS), help="Finding kind")
+    parser.add_argument("-q", "--query", default="", help="Substring to match")
+    parser.add_argument("--targets", action="store_true", help="List affected targets for each match")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as f:
+        projects = json.load(f).get("projects", [])
+    index = FindingsIndex()
+    index.update(projects)
+    for finding in index.search(args.kind, args.query):
+        print(f"[{finding['id']}] {finding['kind']:<9} {finding['targets']:>5} targets  {finding['value']}")
+        if args.targets:
+            for project, target, tool in index.targets_with(finding["id"]):
+                print(f"        {project} / {target} ({tool})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 扫描历史时序存储
+每轮收集后把每个 (项目, 目标, 工具) 的状态、进度和发现数写入 SQLite，
+只在数值变化时追加样本；旧的原始样本按小时降采样，超过保留期后删除。
+提供进度速率和发现数随时间变化的查询
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+HISTORY_DB = "/tmp/vuln_dashboard_history.db"
+
+# 原始样本保留天数，之后降采样为每小时一个样本
+RAW_RETENTION_DAYS = 7
+# 小时样本保留天数
+HOURLY_RETENTION_DAYS = 180
+# 两次维护（降采样/清理）之间的最短间隔（秒）
+MAINTENANCE_INTERVAL = 3600
+
+# 状态以整数存储，节省空间
+STATUS_CODES = {"pending": 0, "waiting": 0, "scanning": 1, "running": 1, "completed": 2, "done": 2,
+                "paused": 3, "failed": 4}
+STATUS_NAMES = {0: "pending", 1: "scanning", 2: "completed", 3: "paused", 4: "failed"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    target TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    UNIQUE (project, target, tool)
+);
+CREATE TABLE IF NOT EXISTS samples (
+    series_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    progress INTEGER NOT NULL,
+    scanned INTEGER NOT NULL,
+    found INTEGER NOT NULL,
+    PRIMARY KEY (series_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS samples_hourly (
+    series_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    progress INTEGER NOT NULL,
+    scanned INTEGER NOT NULL,
+    found INTEGER NOT NULL,
+    PRIMARY KEY (series_id, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# 原始样本与小时样本的合并视图
+_ALL_SAMPLES = "(SELECT * FROM samples UNION ALL SELECT * FROM samples_hourly)"
+
+
+class HistoryStore:
+    """SQLite 时序存储"""
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # (项目, 目标, 工具) -> 序列 id
+        self._series = {
+            (project, target, tool): sid
+            for sid, project, target, tool in self._conn.execute("SELECT id, project, target, tool FROM series")
+        }
+        # 序列 id -> 最近一次写入的值，用于去重
+        self._last = {
+            sid: (status, progress, scanned, found)
+            for sid, status, progress, scanned, found in self._conn.execute(
+                f"SELECT s.series_id, s.status, s.progress, s.scanned, s.found FROM {_ALL_SAMPLES} s "
+                f"JOIN (SELECT series_id, MAX(ts) AS ts FROM {_ALL_SAMPLES} GROUP BY series_id) m "
+                "ON s.series_id = m.series_id AND s.ts = m.ts"
+            )
+        }
+
+    def close(self):
+        self._conn.close()
+
+    def _series_id(self, project, target, tool):
+        key = (project, target, tool)
+        sid = self._series.get(key)
+        if sid is None:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO series (project, target, tool) VALUES (?, ?, ?)", key
+            )
+            sid = cur.lastrowid if cur.rowcount else self._conn.execute(
+                "SELECT id FROM series WHERE project = ? AND target = ? AND tool = ?", key
+            ).fetchone()[0]
+            self._series[key] = sid
+        return sid
+
+    def record_pass(self, projects, ts=None, only=None):
+        """记录一轮收集结果，只写入数值有变化的序列，返回写入的样本数
+
+        only 为本轮有变化的项目名集合，其余项目直接跳过
+        """
+        ts = int(ts if ts is not None else time.time())
+        rows = []
+        with self._lock:
+            for project in projects:
+                name = project.get("name", "Unknown")
+                if only is not None and name not in only:
+                    continue
+                for target in project.get("targets", []):
+                    for tool in target.get("tools", []):
+                        sid = self._series_id(name, target.get("name", ""), tool.get("name", ""))
+                        value = (
+                            STATUS_CODES.get(tool.get("status"), 0),
+                            int(tool.get("progress", 0) or 0),
+                            int(tool.get("scanned", 0) or 0),
+                            int(tool.get("found", 0) or 0),
+                        )
+                        if self._last.get(sid) != value:
+                            self._last[sid] = value
+                            rows.append((sid, ts) + value)
+            if rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+            self._conn.commit()
+            self._maybe_maintain(ts)
+        return len(rows)
+
+    def _maybe_maintain(self, now):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'maintained_at'").fetchone()
+        if row and now - int(row[0]) < MAINTENANCE_INTERVAL:
+            return
+        self.maintain(now)
+
+    def maintain(self, now=None):
+        """降采样与保留策略: 旧原始样本按小时取最后一个值，过期小时样本删除"""
+        now = int(now if now is not None else time.time())
+        raw_cutoff = now - RAW_RETENTION_DAYS * 86400
+        hourly_cutoff = now - HOURLY_RETENTION_DAYS * 86400
+        conn = self._conn
+        # 每个 (序列, 小时) 保留该小时内最后一个样本
+        conn.execute(
+            "INSERT OR REPLACE INTO samples_hourly "
+            "SELECT s.series_id, (s.ts / 3600) * 3600, s.status, s.progress, s.scanned, s.found "
+            "FROM samples s JOIN ("
+            "  SELECT series_id, MAX(ts) AS ts FROM samples WHERE ts < ? GROUP BY series_id, ts / 3600"
+            ") m ON s.series_id = m.series_id AND s.ts = m.ts",
+            (raw_cutoff,)
+        )
+        conn.execute("DELETE FROM samples WHERE ts < ?", (raw_cutoff,))
+        conn.execute("DELETE FROM samples_hourly WHERE ts < ?", (hourly_cutoff,))
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('maintained_at', ?)", (str(now),))
+        conn.commit()
+
+    def _series_filter(self, project=None, target=None, tool=None):
+        clauses, params = [], []
+        for column, value in (("project", project), ("target", target), ("tool", tool)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return (" AND ".join(clauses) or "1"), params
+
+    def history(self, project, target, tool, since=0, until=None):
+        """单个序列的样本 [(ts, status, progress, scanned, found)]"""
+        until = until if until is not None else int(time.time()) + 1
+        sid = self._series.get((project, target, tool))
+        if sid is None:
+            return []
+        rows = self._conn.execute(
+            f"SELECT ts, status, progress, scanned, found FROM {_ALL_SAMPLES} "
+            "WHERE series_id = ? AND ts >= ? AND ts < ? ORDER BY ts",
+            (sid, since, until)
+        ).fetchall()
+        return [(ts, STATUS_NAMES.get(status, "pending"), progress, scanned, found)
+                for ts, status, progress, scanned, found in rows]
+
+    def progress_rate(self, project=None, target=None, tool=None, since=None):
+        """各序列在时间窗口内的进度速率（百分比/小时）
+
+        返回 [{"project", "target", "tool", "progress", "rate_per_hour", "eta_hours"}]
+        """
+        since = since if since is not None else int(time.time()) - 86400
+        where, params = self._series_filter(project, target, tool)
+        # 一次窗口查询取出每个序列窗口内的首末样本
+        rows = self._conn.execute(
+            "SELECT project, target, tool, first_ts, first_progress, last_ts, last_progress FROM ("
+            "  SELECT se.id, se.project, se.target, se.tool,"
+            "    FIRST_VALUE(s.ts) OVER w AS first_ts, FIRST_VALUE(s.progress) OVER w AS first_progress,"
+            "    LAST_VALUE(s.ts) OVER w AS last_ts, LAST_VALUE(s.progress) OVER w AS last_progress,"
+            "    ROW_NUMBER() OVER w AS n"
+            f"  FROM series se JOIN {_ALL_SAMPLES} s ON s.series_id = se.id"
+            f"  WHERE {where} AND s.ts >= ?"
+            "  WINDOW w AS (PARTITION BY se.id ORDER BY s.ts"
+            "               ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)"
+            ") WHERE n = 1 ORDER BY id",
+            params + [since]
+        ).fetchall()
+        result = []
+        for proj, tgt, tl, first_ts, first_progress, last_ts, last_progress in rows:
+            hours = (last_ts - first_ts) / 3600
+            rate = (last_progress - first_progress) / hours if hours > 0 else None
+            eta = (100 - last_progress) / rate if rate and rate > 0 else None
+            result.append({
+                "project": proj, "target": tgt, "tool": tl, "progress": last_progress,
+                "rate_per_hour": round(rate, 3) if rate is not None else None,
+                "eta_hours": round(eta, 2) if eta is not None else None,
+            })
+        return result
+
+    def findings_over_time(self, project=None, tool=None, since=None, until=None, bucket=3600):
+        """发现数随时间变化: [(桶起始时间, 总发现数)]
+
+        每个桶内取各序列截至该桶的最新发现数求和（阶梯函数，未变化的序列沿用旧值）
+        """
+        now = int(time.time())
+        since = since if since is not None else now - 7 * 86400
+        until = until if until is not None else now + 1
+        where, params = self._series_filter(project, None, tool)
+        start = since - since % bucket
+        # SQL 内完成聚合: 每个序列在窗口开始前的最新值作为基线（桶 -1），
+        # 窗口内每个 (序列, 桶) 取最后一个样本，与前一个值相减得到增量后按桶求和
+        deltas = dict(self._conn.execute(
+            f"WITH sel AS (SELECT id FROM series WHERE {where}), "
+            "base AS (SELECT id AS series_id, -1 AS b, COALESCE("
+            "  (SELECT found FROM samples WHERE series_id = sel.id AND ts < ? ORDER BY ts DESC LIMIT 1),"
+            "  (SELECT found FROM samples_hourly WHERE series_id = sel.id AND ts < ? ORDER BY ts DESC LIMIT 1),"
+            "  0) AS found FROM sel), "
+            "win AS (SELECT s.series_id, (s.ts - ?) / ? AS b, s.found, MAX(s.ts) "
+            f"  FROM {_ALL_SAMPLES} s JOIN sel ON s.series_id = sel.id "
+            "  WHERE s.ts >= ? AND s.ts < ? GROUP BY s.series_id, b), "
+            "steps AS (SELECT b, found - LAG(found, 1, 0) OVER (PARTITION BY series_id ORDER BY b) AS delta "
+            "  FROM (SELECT series_id, b, found FROM base UNION ALL SELECT series_id, b, found FROM win)) "
+            "SELECT b, SUM(delta) FROM steps GROUP BY b",
+            params + [start, start, start, bucket, start, until]
+        ).fetchall())
+
+        total = deltas.get(-1, 0)
+        points = []
+        for i, bucket_ts in enumerate(range(start, until, bucket)):
+            total += deltas.get(i, 0)
+            points.append((bucket_ts, total))
+        return points
+
+    def stats(self):
+        """存储概况"""
+        count = lambda table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return {
+            "series": count("series"),
+            "samples": count("samples"),
+            "samples_hourly": count("samples_hourly"),
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+
+def _parse_time(value):
+    """命令行时间参数: Unix 时间戳或 ISO 格式"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return int(datetime.fromisoformat(value).timestamp())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the scan history store")
+    parser.add_argument("--db", default=HISTORY_DB, help=f"History database (default: {HISTORY_DB})")
+    parser.add_argument("--project", help="Filter by project")
+    parser.add_argument("--target", help="Filter by target")
+    parser.add_argument("--tool", help="Filter by tool")
+    parser.add_argument("--since", help="Start time (unix timestamp or ISO format)")
+    parser.add_argument("--until", help="End time (unix timestamp or ISO format)")
+    parser.add_argument("--rate", action="store_true", help="Show progress rate per series")
+    parser.add_argument("--findings", action="store_true", help="Show findings over time")
+    parser.add_argument("--bucket", type=int, default=3600, help="Findings bucket size in seconds")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.db)
+    since, until = _parse_time(args.since), _parse_time(args.until)
+    if args.rate:
+        print(json.dumps(store.progress_rate(args.project, args.target, args.tool, since),
+                         indent=2, ensure_ascii=False))
+    elif args.findings:
+        for ts, found in store.findings_over_time(args.project, args.tool, since, until, args.bucket):
+            print(f"{datetime.fromtimestamp(ts).isoformat()}  {found}")
+    else:
+        print(json.dumps(store.stats(), indent=2))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 进程清单
+每轮只读取一次 /proc/*/cmdline，按 (工具, 目标) 建立索引，
+替代逐个目标调用 pgrep / ps aux 的做法
+"""
+
+import os
+import subprocess
+from urllib.parse import urlsplit
+
+PROC_DIR = "/proc"
+
+# 识别的扫描工具（可执行文件名，小写）
+KNOWN_TOOLS = ("strix", "nikto", "nmap")
+
+# 解释器，工具以脚本形式运行时需要看下一个参数
+INTERPRETERS = ("python", "python3", "perl", "ruby", "sh", "bash", "node")
+
+# 包装命令 -> (带值的选项, 选项之后需要跳过的位置参数个数)
+# 例如 Nmap SYN 扫描需要 root，通常以 "sudo nmap -sS ..." 启动
+WRAPPERS = {
+    "sudo": ({"-u", "-g", "-C", "-h", "-p", "-D", "-r", "-t", "-U", "-T", "-R",
+              "--user", "--group", "--close-from", "--host", "--prompt", "--chdir",
+              "--role", "--type", "--other-user", "--command-timeout", "--chroot"}, 0),
+    "nohup": (set(), 0),
+    "timeout": ({"-s", "-k", "--signal", "--kill-after"}, 1),
+    "env": ({"-u", "-C", "-S", "--unset", "--chdir", "--split-string"}, 0),
+    "nice": ({"-n", "--adjustment"}, 0),
+    "ionice": ({"-c", "-n", "-p", "-P", "-u", "--class", "--classdata", "--pid", "--pgid", "--uid"}, 0),
+    "stdbuf": ({"-i", "-o", "-e", "--input", "--output", "--error"}, 0),
+    "setsid": (set(), 0),
+}
+
+
+def _exe_name(arg):
+    """取参数的可执行名: 去掉路径和扩展名，转小写"""
+    name = os.path.basename(arg).lower()
+    for ext in (".py", ".pl", ".rb", ".sh"):
+        if name.endswith(ext):
+            return name[:-len(ext)]
+    return name
+
+
+def _unwrap(argv):
+    """跳过开头的包装命令（sudo nmap ...、timeout 3600 strix ... 等）及其选项，返回实际命令的 argv"""
+    while argv:
+        spec = WRAPPERS.get(_exe_name(argv[0]))
+        if spec is None:
+            return argv
+        value_options, positionals = spec
+        i = 1
+        while i < len(argv):
+            arg = argv[i]
+            if arg == "--":
+                i += 1
+                break
+            if arg.startswith("-") and len(arg) > 1:
+                # 带值的选项（"-u root"）多跳过一个参数；"-uroot"、"--signal=KILL" 自带值
+                i += 2 if arg in value_options else 1
+            elif "=" in arg and _exe_name(argv[0]) == "env":
+                # env 的 NAME=value
+                i += 1
+            else:
+                break
+        # timeout 的时长等位置参数
+        argv = argv[i + positionals:]
+    return argv
+
+
+def _identify_tool(argv):
+    """判断命令行属于哪个扫描工具，返回 (工具, 工具参数)，不是则返回 (None, [])"""
+    argv = _unwrap(argv)
+    if not argv:
+        return None, []
+    exe = _exe_name(argv[0])
+    if exe in KNOWN_TOOLS:
+        return exe, argv[1:]
+    if exe.rstrip("0123456789.") in INTERPRETERS:
+        # 跳过解释器选项，找到脚本名
+        for i, arg in enumerate(argv[1:], 1):
+            if arg.startswith("-"):
+                continue
+            name = _exe_name(arg)
+            return (name, argv[i + 1:]) if name in KNOWN_TOOLS else (None, [])
+    return None, []
+
+
+def _target_tokens(args):
+    """从工具参数中提取可能的目标标识（原值、key=value 的值、URL 主机名）"""
+    tokens = set()
+    for arg in args:
+        if "=" in arg and arg.startswith("-"):
+            arg = arg.split("=", 1)[1]
+        if not arg or arg.startswith("-"):
+            continue
+        tokens.add(arg)
+        if "://" in arg:
+            host = urlsplit(arg).hostname
+            if host:
+                tokens.add(host)
+    return tokens
+
+
+class ProcessSnapshot:
+    """某一时刻的扫描进程快照"""
+
+    def __init__(self, processes):
+        # processes: [(pid, argv), ...]
+        self.processes = processes
+        self._counts = {tool: 0 for tool in KNOWN_TOOLS}
+        self._index = {}
+
+        for pid, argv in processes:
+            tool, args = _identify_tool(argv)
+            if tool is None:
+                continue
+            self._counts[tool] += 1
+            for token in _target_tokens(args):
+                self._index.setdefault((tool, token), []).append(pid)
+
+    def count(self, tool_name):
+        """某个工具的进程数"""
+        return self._counts.get(tool_name.lower(), 0)
+
+    def pids(self, tool_name, target_name):
+        """扫描指定目标的工具进程 PID 列表"""
+        return self._index.get((tool_name.lower(), target_name), [])
+
+    def is_running(self, tool_name, target_name):
+        """指定工具是否正在扫描指定目标"""
+        return (tool_name.lower(), target_name) in self._index
+
+    def summary(self):
+        """与 dashboard.get_scan_status() 相同结构的进程统计"""
+        counts = {tool: self._counts[tool] for tool in KNOWN_TOOLS}
+        counts["total"] = sum(self._counts.values())
+        return counts
+
+
+def _read_proc():
+    """读取 /proc/*/cmdline，返回 [(pid, argv)]"""
+    own_pid = os.getpid()
+    processes = []
+    for entry in os.scandir(PROC_DIR):
+        if not entry.name.isdigit():
+            continue
+        pid = int(entry.name)
+        if pid == own_pid:
+            continue
+        try:
+            with open(os.path.join(entry.path, "cmdline"), "rb") as f:
+                raw = f.read()
+        except OSError:
+            # 进程已退出或无权限
+            continue
+        if not raw:
+            # 内核线程
+            continue
+        argv = raw.rstrip(b"\0").decode("utf-8", "replace").split("\0")
+        processes.append((pid, argv))
+    return processes
+
+
+def _read_ps():
+    """没有 /proc 的系统（如 macOS）退回到单次 ps 调用"""
+    own_pid = os.getpid()
+    result = subprocess.run(["ps", "-axo", "pid=,args="], capture_output=True, text=True)
+    processes = []
+    for line in result.stdout.splitlines():
+        parts = line.strip().split(None, 1)
+        if len(parts) != 2 or not parts[0].isdigit():
+            continue
+        pid = int(parts[0])
+        if pid != own_pid:
+            processes.append((pid, parts[1].split()))
+    return processes
+
+
+def take_snapshot():
+    """采集一次进程快照"""
+    try:
+        if os.path.isdir(PROC_DIR):
+            return ProcessSnapshot(_read_proc())
+        return ProcessSnapshot(_read_ps())
+    except Exception as e:
+        print(f"Error reading process table: {e}")
+        return ProcessSnapshot([])
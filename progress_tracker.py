@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 日志进度估算
+为每个扫描日志记录已读取的字节偏移，每轮只读取新追加的内容，
+按工具对应的进度行格式（如 Nmap --stats-every 输出）解析进度，
+并根据进度变化速率估算剩余时间
+"""
+
+import os
+import re
+import threading
+import time
+
+# 单次最多读取的新增字节，超出时只读日志末尾
+MAX_READ_BYTES = 4 * 1024 * 1024
+
+# 计算速率时使用的历史窗口（秒）
+RATE_WINDOW = 600
+
+# 通用进度格式: "45%" / "progress: 45" / "progress=45.5"
+GENERIC_PROGRESS = [
+    re.compile(r"progress\s*[:=]\s*(\d{1,3}(?:\.\d+)?)", re.I),
+    re.compile(r"(\d{1,3}(?:\.\d+)?)\s*%"),
+]
+
+# 工具名 -> {"progress": [正则...], "done": [正则...]}
+LOG_PATTERNS = {
+    "Nmap": {
+        # "SYN Stealth Scan Timing: About 45.23% done; ETC: 14:05 (0:01:23 remaining)"
+        "progress": [re.compile(r"About (\d{1,3}(?:\.\d+)?)% done")],
+        "done": [re.compile(r"^Nmap done:")],
+    },
+    "Nikto": {
+        "progress": GENERIC_PROGRESS,
+        "done": [re.compile(r"^\+ End Time:"), re.compile(r"host\(s\) tested")],
+    },
+    "Strix": {
+        "progress": GENERIC_PROGRESS,
+        "done": [re.compile(r"scan (?:completed|finished)", re.I)],
+    },
+}
+
+
+class LogState:
+    """单个日志文件的读取位置和进度估算"""
+
+    __slots__ = ("inode", "offset", "partial", "progress", "done", "samples")
+
+    def __init__(self, inode):
+        self.inode = inode
+        self.offset = 0
+        self.partial = b""
+        self.progress = None
+        self.done = False
+        # [(时间, 进度)]，用于计算速率
+        self.samples = []
+
+    def rate(self):
+        """进度速率（百分比/秒），样本不足时为 None"""
+        if len(self.samples) < 2:
+            return None
+        (t0, p0), (t1, p1) = self.samples[0], self.samples[-1]
+        if t1 <= t0 or p1 <= p0:
+            return None
+        return (p1 - p0) / (t1 - t0)
+
+    def eta_seconds(self):
+        """按当前速率估算的剩余秒数"""
+        if self.done or self.progress is None:
+            return None
+        rate = self.rate()
+        if not rate:
+            return None
+        return int((100 - self.progress) / rate)
+
+
+class ProgressTracker:
+    """跟踪多个扫描日志的进度，每次只解析新增字节"""
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _parse_lines(self, tool_name, state, lines, now):
+        patterns = LOG_PATTERNS.get(tool_name, {"progress": GENERIC_PROGRESS, "done": []})
+        progress = None
+        for line in lines:
+            if any(p.search(line) for p in patterns["done"]):
+                state.done = True
+                continue
+            for pattern in patterns["progress"]:
+                match = pattern.search(line)
+                if match:
+                    value = float(match.group(1))
+                    if 0 <= value <= 100:
+                        progress = value
+                    break
+
+        if state.done:
+            state.progress = 100.0
+        elif progress is not None:
+            state.progress = progress
+            state.samples.append((now, progress))
+            # 只保留窗口内的样本（至少保留首尾两个）
+            while len(state.samples) > 2 and now - state.samples[0][0] > RATE_WINDOW:
+                state.samples.pop(0)
+
+    def update(self, tool_name, path):
+        """读取日志新增内容并更新估算，返回 LogState；日志不存在时返回 None"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._states.pop(path, None)
+            return None
+
+        with self._lock:
+            state = self._states.get(path)
+            # 日志被轮转或截断时从头读取
+            if state is None or state.inode != st.st_ino or st.st_size < state.offset:
+                state = LogState(st.st_ino)
+                self._states[path] = state
+
+        if st.st_size > state.offset:
+            if st.st_size - state.offset > MAX_READ_BYTES:
+                # 积压过多（如首次遇到大日志）: 旧的进度行已无意义，只读末尾
+                state.offset = st.st_size - MAX_READ_BYTES
+                state.partial = b""
+            try:
+                with open(path, "rb") as f:
+                    f.seek(state.offset)
+                    chunk = f.read(st.st_size - state.offset)
+            except OSError:
+                return state
+            state.offset += len(chunk)
+            data = state.partial + chunk
+            lines = data.split(b"\n")
+            # 最后一段可能是写了一半的行，留到下一轮
+            state.partial = lines.pop()[-4096:]
+            self._parse_lines(
+                tool_name, state,
+                (line.decode("utf-8", "replace") for line in lines),
+                time.time()
+            )
+        return state
+
+    def forget(self, path):
+        with self._lock:
+            self._states.pop(path, None)
+
+
+# 收集脚本共享的全局实例
+TRACKER = ProgressTracker()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 原始扫描输出解析
+直接读取 Nmap -oX / Nikto XML / Nikto JSON 输出，转换为收集脚本使用的摘要格式。
+XML 采用 iterparse 增量解析并及时释放已处理的节点，内存与扫描规模无关；
+扫描仍在进行（文件未写完）时返回已解析部分
+"""
+
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+# 列表字段最多保留的条目数，计数字段不受影响
+MAX_LIST_ITEMS = 1000
+
+# 超过该大小的 Nikto JSON 不整体读入，按块扫描（与 progress_tracker 的单次读取上限相同）
+MAX_READ_BYTES = 4 * 1024 * 1024
+READ_CHUNK = 64 * 1024
+
+
+def _iterparse(path, events=("start", "end")):
+    """增量解析 XML；文件被截断（扫描进行中）时在出错处停止"""
+    try:
+        for event, elem in ET.iterparse(path, events=events):
+            yield event, elem
+    except ET.ParseError:
+        return
+
+
+def load_nmap_xml(path):
+    """解析 Nmap -oX 输出，返回 Nmap 摘要格式
+
+    open_ports_list 为去重后的开放端口（最多 65535 个），
+    open_ports 为所有主机上开放端口的总数
+    """
+    root = None
+    services_per_host = 0
+    hosts_done = 0
+    open_total = 0
+    open_ports = set()
+    progress = 0
+    finished = False
+
+    for event, elem in _iterparse(path):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+
+        tag = elem.tag
+        if tag == "scaninfo":
+            services_per_host += int(elem.get("numservices", 0) or 0)
+        elif tag == "taskprogress":
+            try:
+                progress = max(progress, int(float(elem.get("percent", 0))))
+            except ValueError:
+                pass
+        elif tag == "port":
+            state = elem.find("state")
+            if state is not None and state.get("state") == "open":
+                open_total += 1
+                try:
+                    open_ports.add(int(elem.get("portid")))
+                except (TypeError, ValueError):
+                    pass
+        elif tag == "host":
+            hosts_done += 1
+            # 主机处理完后释放整棵子树
+            elem.clear()
+            if root is not None:
+                root.clear()
+        elif tag == "finished":
+            finished = True
+
+    return {
+        "status": "completed" if finished else ("scanning" if root is not None else "pending"),
+        "progress": 100 if finished else min(progress, 99),
+        "ports_scanned": services_per_host * max(hosts_done, 1) if services_per_host else 0,
+        "open_ports": open_total,
+        "open_ports_list": sorted(open_ports)[:MAX_LIST_ITEMS]
+    }
+
+
+def load_nikto_xml(path):
+    """解析 Nikto -Format xml 输出，返回 Nikto 摘要格式"""
+    root = None
+    vulns = []
+    found = 0
+    tested = 0
+    finished = False
+
+    for event, elem in _iterparse(path):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+
+        tag = elem.tag
+        if tag == "item":
+            found += 1
+            description = (elem.findtext("description") or "").strip()
+            if description and len(vulns) < MAX_LIST_ITEMS:
+                vulns.append(description)
+            elem.clear()
+        elif tag == "statistics":
+            try:
+                tested = int(elem.get("itemstested", 0))
+            except ValueError:
+                pass
+            finished = finished or bool(elem.get("endtime"))
+        elif tag == "scandetails":
+            elem.clear()
+
+    return {
+        "status": "completed" if finished else ("scanning" if root is not None else "pending"),
+        "progress": 100 if finished else 0,
+        "items_scanned": tested,
+        "vulns_found": found,
+        "vulnerabilities": vulns
+    }
+
+
+# Nikto JSON 中的 "msg" 字段，用于解析未写完的文件和按块扫描大文件
+_NIKTO_MSG = re.compile(r'"msg"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def _nikto_messages(chunks):
+    """按块扫描 "msg" 字段，返回 (问题数, 问题列表, 最后一个非空白字符)
+
+    块末尾未完成的匹配留到下一块；超过一块仍未结束的 "msg" 视为无效并丢弃，内存只与块大小有关
+    """
+    vulns = []
+    found = 0
+    tail = ""
+    last = ""
+    for chunk in chunks:
+        stripped = chunk.rstrip()
+        if stripped:
+            last = stripped[-1]
+        text = tail + chunk
+        end = 0
+        for match in _NIKTO_MSG.finditer(text):
+            found += 1
+            if len(vulns) < MAX_LIST_ITEMS:
+                vulns.append(json.loads(f'"{match.group(1)}"'))
+            end = match.end()
+        start = text.rfind('"msg"', end)
+        # 没有未完成的匹配时保留末尾几个字符，以免 "msg" 本身被块边界截断
+        tail = text[start:] if start >= 0 else text[max(end, len(text) - 4):]
+        if len(tail) > READ_CHUNK:
+            tail = tail[-4:]
+    return found, vulns, last
+
+
+def _nikto_scanned(found, vulns, finished):
+    return {
+        "status": "completed" if finished else "scanning",
+        "progress": 100 if finished else 0,
+        "items_scanned": 0,
+        "vulns_found": found,
+        "vulnerabilities": vulns
+    }
+
+
+def _nikto_native(hosts, finished):
+    vulns = []
+    found = 0
+    for host in hosts:
+        for item in host.get("vulnerabilities", []):
+            found += 1
+            msg = item.get("msg") if isinstance(item, dict) else item
+            if msg and len(vulns) < MAX_LIST_ITEMS:
+                vulns.append(str(msg).strip())
+    return _nikto_scanned(found, vulns, finished)
+
+
+def load_nikto_json(path):
+    """读取 Nikto JSON: 兼容摘要格式和 Nikto -Format json 原生输出
+
+    不超过 MAX_READ_BYTES 的文件整体解析。更大的文件只可能是原生输出（摘要格式很小），
+    按 READ_CHUNK 分块扫描 "msg" 字段，以文件是否以 ] 或 } 结尾判断扫描是否完成
+    """
+    with open(path, "r") as f:
+        if os.fstat(f.fileno()).st_size > MAX_READ_BYTES:
+            found, vulns, last = _nikto_messages(iter(lambda: f.read(READ_CHUNK), ""))
+            return _nikto_scanned(found, vulns, finished=last in ("]", "}"))
+        text = f.read()
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        # 扫描进行中，文件尚未写完: 提取已输出的问题
+        found, vulns, _ = _nikto_messages((text,))
+        return _nikto_scanned(found, vulns, finished=False)
+
+    # 原生输出: 主机列表，或单个主机对象，漏洞条目为对象
+    if isinstance(data, list):
+        return _nikto_native(data, finished=True)
+    vulns = data.get("vulnerabilities")
+    if isinstance(vulns, list) and ("host" in data or any(isinstance(v, dict) for v in vulns)):
+        return _nikto_native([data], finished=True)
+    return data
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 内存数据模型
+项目 / 目标 / 工具结果的 __slots__ 类，由收集脚本构建，看板和同步脚本共用。
+构建时一次性计算聚合值（进度、状态、目标数、发现数、各状态工具数），
+之后不再遍历嵌套结构；同时提供与 JSON 结构一致的只读映射接口（get / [] / in / items），
+按 JSON 字典编写的代码无需修改，序列化时通过 json_default 转换
+"""
+
+import abc
+
+# 工具结果中的列表字段（同一工具只有一个）
+LIST_FIELDS = ("endpoints", "vulns", "ports")
+
+# 状态 -> 看板显示文本
+STATUS_TEXT = {"scanning": "扫描中", "done": "已完成", "waiting": "等待中", "completed": "已完成"}
+
+
+class _Record(abc.ABC):
+    """按 JSON 键读取属性的只读映射接口，子类实现 get 和 to_dict"""
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def get(self, key, default=None):
+        """按 JSON 键取值"""
+
+    @abc.abstractmethod
+    def to_dict(self):
+        """与 JSON 结构一致的字典（嵌套对象保持为模型对象）"""
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __eq__(self, other):
+        if isinstance(other, _Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+
+_MISSING = object()
+
+
+class ToolResult(_Record):
+    """单个工具对单个目标的扫描结果"""
+
+    __slots__ = ("name", "status", "progress", "scanned", "found", "list_field", "findings", "extra")
+
+    def __init__(self, name, status="pending", progress=0, scanned=0, found=0,
+                 list_field=None, findings=None, extra=None):
+        self.name = name
+        self.status = status
+        self.progress = progress
+        self.scanned = scanned
+        self.found = found
+        # 列表字段名（endpoints / vulns / ports）及其内容，没有列表时为 None
+        self.list_field = list_field
+        self.findings = findings
+        # 其余字段（如 eta_seconds），没有时为 None
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        list_field = next((field for field in LIST_FIELDS if field in data), None)
+        extra = {
+            key: value for key, value in data.items()
+            if key not in ("name", "status", "progress", "scanned", "found", list_field)
+        }
+        return cls(
+            data.get("name", ""),
+            data.get("status", "pending"),
+            data.get("progress", 0),
+            data.get("scanned", 0),
+            data.get("found", 0),
+            list_field,
+            data.get(list_field) if list_field else None,
+            extra or None,
+        )
+
+    def get(self, key, default=None):
+        if key in ("name", "status", "progress", "scanned", "found"):
+            return getattr(self, key)
+        if key == self.list_field:
+            return self.findings
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def __contains__(self, key):
+        return (key in ("name", "status", "progress", "scanned", "found") or key == self.list_field
+                or bool(self.extra and key in self.extra))
+
+    def to_dict(self):
+        result = {
+            "name": self.name,
+            "status": self.status,
+            "progress": self.progress,
+            "scanned": self.scanned,
+            "found": self.found
+        }
+        if self.list_field:
+            result[self.list_field] = self.findings
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+
+class Target(_Record):
+    """扫描目标及其各工具结果，构建时计算平均进度和发现数"""
+
+    __slots__ = ("name", "tools", "progress", "found", "scanning", "completed")
+
+    def __init__(self, name, tools):
+        self.name = name
+        self.tools = tools
+        progress = 0
+        found = 0
+        scanning = False
+        completed = True
+        for tool in tools:
+            progress += tool.progress or 0
+            found += tool.found or 0
+            if tool.status == "scanning":
+                scanning = True
+            elif tool.status != "completed":
+                completed = False
+        # 工具平均进度（未取整），没有工具时为 0
+        self.progress = progress / len(tools) if tools else 0
+        self.found = found
+        self.scanning = scanning
+        # 除扫描中以外的工具都已完成
+        self.completed = completed
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("name", ""), [ToolResult.from_dict(tool) for tool in data.get("tools", [])])
+
+    def get(self, key, default=None):
+        if key == "name":
+            return self.name
+        if key == "tools":
+            return self.tools
+        return default
+
+    def to_dict(self):
+        return {"name": self.name, "tools": self.tools}
+
+
+class Project(_Record):
+    """项目及其全部目标，构建时计算进度、状态和汇总计数"""
+
+    __slots__ = ("name", "targets", "status", "progress", "last_updated",
+                 "target_count", "found", "status_counts")
+
+    def __init__(self, name, targets, status=None, progress=None, last_updated=None):
+        self.name = name
+        self.targets = targets
+        self.last_updated = last_updated
+        self.target_count = len(targets)
+
+        total_progress = 0
+        found = 0
+        scanning = False
+        completed = True
+        # 工具状态 -> 工具数
+        counts = {}
+        for target in targets:
+            total_progress += target.progress
+            found += target.found
+            scanning = scanning or target.scanning
+            completed = completed and target.completed
+            for tool in target.tools:
+                counts[tool.status] = counts.get(tool.status, 0) + 1
+        self.found = found
+        self.status_counts = counts
+
+        # 与 calculate_project_progress / get_project_status 的规则一致；
+        # 从已有数据文件构建时沿用文件中的值
+        if progress is None:
+            progress = int(total_progress / len(targets)) if targets else 0
+        if status is None:
+            if not targets:
+                status = "pending"
+            elif scanning:
+                status = "scanning"
+            elif completed:
+                status = "completed"
+            else:
+                status = "pending"
+        self.progress = progress
+        self.status = status
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get("name", "Unknown"),
+            [Target.from_dict(target) for target in data.get("targets", [])],
+            status=data.get("status"),
+            progress=data.get("progress"),
+            last_updated=data.get("last_updated"),
+        )
+
+    def get(self, key, default=None):
+        if key in ("name", "status", "progress", "targets"):
+            return getattr(self, key)
+        if key == "last_updated" and self.last_updated is not None:
+            return self.last_updated
+        return default
+
+    def to_dict(self):
+        result = {
+            "name": self.name,
+            "status": self.status,
+            "progress": self.progress,
+            "targets": self.targets
+        }
+        if self.last_updated is not None:
+            result["last_updated"] = self.last_updated
+        return result
+
+    def card(self, index):
+        """看板卡片数据，直接使用预先计算的汇总值"""
+        return {
+            "index": index,
+            "name": self.name,
+            "status": self.status,
+            "progress": self.progress,
+            "statusText": STATUS_TEXT.get(self.status, "未知"),
+            "targetCount": self.target_count,
+            "found": self.found
+        }
+
+
+def json_default(value):
+    """json.dumps(default=...) 钩子: 把模型对象转换为 JSON 结构"""
+    if isinstance(value, _Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 扫描目录监听
+Linux 下通过 inotify 等待 SCAN_PROC_DIR 中的文件变化，
+其他系统退回到定时比较目录快照。
+事件队列溢出或目录被删除、移走时无法得知具体变化，wait() 返回 None 要求调用方全量重新扫描
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+# inotify 事件掩码
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+# 内核生成的事件: 队列溢出（事件已丢失）、监听已被移除（目录被删除等）
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+# 出现这些事件时无法得知哪些文件变化，需要重新添加监听并全量扫描
+RESCAN_MASK = IN_Q_OVERFLOW | IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF
+
+# struct inotify_event 头: wd, mask, cookie, len
+_EVENT_HEADER = struct.Struct("iIII")
+
+# 收到首个事件后再等待一小段时间，合并同一批写入
+SETTLE_SECONDS = 0.2
+
+# 轮询模式下的扫描间隔
+POLL_INTERVAL = 1.0
+
+
+def _inotify_open():
+    """创建 inotify 实例，返回 (fd, libc)；不支持时返回 (None, None)"""
+    if not hasattr(os, "O_NONBLOCK"):
+        return None, None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+    except OSError:
+        return None, None
+    if not all(hasattr(libc, name) for name in ("inotify_init1", "inotify_add_watch", "inotify_rm_watch")):
+        return None, None
+
+    fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None, None
+    return fd, libc
+
+
+def _scan_dir(path):
+    """目录快照: 文件名 -> (inode, mtime_ns, size)"""
+    snapshot = {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                snapshot[entry.name] = (st.st_ino, st.st_mtime_ns, st.st_size)
+    except OSError:
+        pass
+    return snapshot
+
+
+class DirectoryWatcher:
+    """监听单个目录的文件变化"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd, self._libc = _inotify_open()
+        # 当前监听描述符，None 表示目录不存在等原因尚未监听
+        self._wd = None
+        if self._fd is not None and not self._add_watch():
+            os.close(self._fd)
+            self._fd = None
+        self._snapshot = None if self._fd is not None else _scan_dir(path)
+
+    @property
+    def uses_inotify(self):
+        return self._fd is not None
+
+    def _add_watch(self):
+        """（重新）监听目录，成功时返回 True"""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(self.path), WATCH_MASK)
+        self._wd = wd if wd >= 0 else None
+        return self._wd is not None
+
+    def _drain(self):
+        """读出所有待处理的 inotify 事件，返回涉及的文件名
+
+        队列溢出、监听被移除或目录被删除、移走时返回 None（需要全量扫描），并重新添加监听
+        """
+        names = set()
+        rescan = False
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & RESCAN_MASK:
+                    rescan = True
+                    if mask & IN_MOVE_SELF and wd == self._wd:
+                        # 目录被移走后旧监听仍跟随原目录，移除后按路径重新监听
+                        self._libc.inotify_rm_watch(self._fd, wd)
+                    if mask & (IN_IGNORED | IN_MOVE_SELF) and wd == self._wd:
+                        self._wd = None
+                elif name:
+                    names.add(os.fsdecode(name))
+        if rescan:
+            if self._wd is None:
+                self._add_watch()
+            return None
+        return names
+
+    def _poll(self, deadline):
+        """轮询模式: 比较前后两次目录快照"""
+        while True:
+            current = _scan_dir(self.path)
+            changed = {
+                name for name in self._snapshot.keys() | current.keys()
+                if self._snapshot.get(name) != current.get(name)
+            }
+            self._snapshot = current
+            if changed:
+                return changed
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            time.sleep(min(POLL_INTERVAL, remaining))
+
+    def wait(self, timeout):
+        """等待目录变化，返回变化的文件名集合；超时返回空集合，
+        无法得知具体变化（事件丢失、目录重建）时返回 None"""
+        deadline = time.monotonic() + timeout
+        if self._fd is None:
+            return self._poll(deadline)
+        if self._wd is None:
+            # 目录被删除后尚未重建: 按轮询间隔重试监听，重建成功时全量扫描
+            while not self._add_watch():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(POLL_INTERVAL, remaining))
+            return None
+
+        readable, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not readable:
+            return set()
+        time.sleep(SETTLE_SECONDS)
+        return self._drain()
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
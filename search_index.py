@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 全文与分面搜索
+以 (项目, 目标) 为文档，对项目名、目标主机名、端点、漏洞描述和开放端口建立倒排索引，
+支持 "port:8443 status:scanning nginx" 形式的查询，并按项目状态和工具统计分面计数。
+按项目增量更新，只重新索引有变化的项目
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import re
+import shlex
+import threading
+
+from findings_index import canonical_port
+
+# 查询字段 -> 索引字段
+FIELD_ALIASES = {
+    "name": "name", "project": "name",
+    "target": "target", "host": "target",
+    "endpoint": "endpoint", "path": "endpoint",
+    "vuln": "vuln",
+    "port": "port",
+    "status": "status",
+    "tool": "tool",
+}
+# 不带字段的词在这些字段中查找（前缀匹配），纯数字还会匹配端口
+TEXT_FIELDS = ("name", "target", "endpoint", "vuln")
+
+# 状态归一化，与看板筛选按钮一致
+STATUS_FACETS = {
+    "scanning": "scanning", "running": "scanning",
+    "done": "done", "completed": "done",
+    "waiting": "waiting", "pending": "waiting",
+}
+
+_TOKEN = re.compile(r"[0-9a-z一-鿿]+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text).lower())
+
+
+def _index_digest(project):
+    """建立索引用到的字段（名称、状态、目标名、工具名、端点、漏洞、端口、是否有发现）的哈希
+
+    项目未变化时跳过重新索引；不依赖 last_updated，时间戳未更新或缺失时也能发现变化
+    """
+    fields = [project.get("name", "Unknown"), project.get("status")]
+    for target in project.get("targets", []):
+        fields.append(target.get("name", ""))
+        for tool in target.get("tools", []):
+            fields.append((tool.get("name", ""), tool.get("endpoints"), tool.get("vulns"),
+                           tool.get("ports"), bool(tool.get("found"))))
+    return hashlib.blake2b(repr(fields).encode("utf-8"), digest_size=16).digest()
+
+
+class SearchIndex:
+    """(项目, 目标) 文档的倒排索引"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (字段, 词) -> {文档 id}
+        self.postings = {}
+        # 字段 -> 排序后的词表，用于前缀匹配；None 表示需要重建
+        self._vocab = {}
+        # 文档 id -> (项目名, 目标名, 状态分面, 有发现的工具)
+        self.docs = {}
+        # 文档 id -> 该文档的全部索引键，删除时使用
+        self._doc_keys = {}
+        # 项目名 -> [文档 id]
+        self._project_docs = {}
+        # 项目名 -> 索引字段的哈希，未变化的项目不重新索引
+        self._versions = {}
+        self._next_id = 0
+
+    def _remove_project(self, name):
+        for doc_id in self._project_docs.pop(name, ()):
+            for key in self._doc_keys.pop(doc_id, ()):
+                docs = self.postings.get(key)
+                if docs is not None:
+                    docs.discard(doc_id)
+                    if not docs:
+                        del self.postings[key]
+                        self._vocab[key[0]] = None
+            self.docs.pop(doc_id, None)
+        self._versions.pop(name, None)
+
+    def _index_project(self, project, digest=None):
+        name = project.get("name", "Unknown")
+        status = STATUS_FACETS.get(project.get("status"), project.get("status") or "waiting")
+        name_keys = {("name", term) for term in tokenize(name)}
+        postings, vocab = self.postings, self._vocab
+        doc_ids = []
+        for target in project.get("targets", []):
+            doc_id = self._next_id
+            self._next_id += 1
+            doc_ids.append(doc_id)
+            # 先在集合中去重（端点、漏洞描述的词大量重复），再写入倒排表
+            keys = set(name_keys)
+            keys.update(("target", term) for term in tokenize(target.get("name", "")))
+            keys.add(("status", status))
+            tools = []
+            for tool in target.get("tools", []):
+                endpoints = tool.get("endpoints") or ()
+                vulns = tool.get("vulns") or ()
+                ports = [p for p in map(canonical_port, tool.get("ports") or ()) if p is not None]
+                if endpoints:
+                    keys.update([("endpoint", term) for term in set(tokenize(" ".join(map(str, endpoints))))])
+                if vulns:
+                    keys.update([("vuln", term) for term in set(tokenize(" ".join(map(str, vulns))))])
+                keys.update(("port", str(port)) for port in ports)
+                if endpoints or vulns or ports or tool.get("found"):
+                    tool_name = tool.get("name", "").lower()
+                    tools.append(tool_name)
+                    keys.add(("tool", tool_name))
+            for key in keys:
+                docs = postings.get(key)
+                if docs is None:
+                    docs = postings[key] = set()
+                    vocab[key[0]] = None
+                docs.add(doc_id)
+            self._doc_keys[doc_id] = keys
+            self.docs[doc_id] = (name, target.get("name", ""), status, tuple(tools))
+        self._project_docs[name] = doc_ids
+        self._versions[name] = digest if digest is not None else _index_digest(project)
+
+    def update(self, projects, only=None):
+        """增量更新: 重新索引 only 中或索引字段变化的项目，删除已消失的项目
+
+        返回重新索引的项目数
+        """
+        count = 0
+        with self._lock:
+            names = set()
+            for project in projects:
+                name = project.get("name", "Unknown")
+                names.add(name)
+                digest = None
+                if name in self._versions:
+                    if only is not None and name not in only:
+                        continue
+                    digest = _index_digest(project)
+                    if only is None and self._versions[name] == digest:
+                        continue
+                    self._remove_project(name)
+                self._index_project(project, digest)
+                count += 1
+            for name in set(self._project_docs) - names:
+                self._remove_project(name)
+        return count
+
+    def _prefix(self, field, prefix):
+        """字段中以 prefix 开头的词对应的文档并集"""
+        vocab = self._vocab.get(field)
+        if vocab is None:
+            vocab = self._vocab[field] = sorted(term for f, term in self.postings if f == field)
+        result = set()
+        i = bisect.bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            result |= self.postings[(field, vocab[i])]
+            i += 1
+        return result
+
+    def _match_clause(self, field, value):
+        """单个查询条件的文档集合"""
+        if field == "port":
+            port = canonical_port(value)
+            return set(self.postings.get(("port", str(port)), ())) if port is not None else set()
+        if field == "status":
+            status = STATUS_FACETS.get(value.lower(), value.lower())
+            return set(self.postings.get(("status", status), ()))
+        if field == "tool":
+            return set(self.postings.get(("tool", value.lower()), ()))
+
+        fields = (field,) if field else TEXT_FIELDS
+        result = None
+        # 多个词须同时出现（各自前缀匹配），如 "x-frame" -> x* AND frame*
+        for term in tokenize(value):
+            matched = set()
+            for f in fields:
+                matched |= self._prefix(f, term)
+            if not field and term.isdigit():
+                # 不带字段的数字同时匹配开放端口
+                matched |= self.postings.get(("port", term), set())
+            result = matched if result is None else result & matched
+            if not result:
+                break
+        return result if result is not None else set()
+
+    def search(self, query):
+        """执行查询，返回匹配的文档 id 集合
+
+        语法: 空格分隔的条件取交集；field:value 限定字段（name/target/endpoint/vuln/port/status/tool），
+        前缀 "-" 表示排除；不带字段的词在名称、目标、端点和漏洞中前缀匹配
+        """
+        try:
+            parts = shlex.split(query)
+        except ValueError:
+            parts = query.split()
+
+        include, exclude = [], []
+        for part in parts:
+            negate = part.startswith("-") and len(part) > 1
+            if negate:
+                part = part[1:]
+            field, sep, value = part.partition(":")
+            if sep and field.lower() in FIELD_ALIASES:
+                clause = (FIELD_ALIASES[field.lower()], value)
+            else:
+                clause = (None, part)
+            (exclude if negate else include).append(clause)
+
+        with self._lock:
+            if include:
+                sets = sorted((self._match_clause(f, v) for f, v in include), key=len)
+                result = sets[0]
+                for other in sets[1:]:
+                    if not result:
+                        break
+                    result &= other
+            else:
+                result = set(self.docs)
+            for f, v in exclude:
+                if not result:
+                    break
+                result -= self._match_clause(f, v)
+        return result
+
+    def facets(self, doc_ids):
+        """按项目状态和有发现的工具统计文档数"""
+        status, tools = {}, {}
+        docs = self.docs
+        for doc_id in doc_ids:
+            _, _, doc_status, doc_tools = docs[doc_id]
+            status[doc_status] = status.get(doc_status, 0) + 1
+            for tool in doc_tools:
+                tools[tool] = tools.get(tool, 0) + 1
+        return {"status": status, "tool": tools}
+
+    def group_by_project(self, doc_ids):
+        """项目名 -> [匹配的目标名]"""
+        result = {}
+        for doc_id in sorted(doc_ids):
+            name, target, _, _ = self.docs[doc_id]
+            result.setdefault(name, []).append(target)
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search projects, targets and findings")
+    parser.add_argument("query", help='Query, e.g. "port:8443 status:scanning"')
+    parser.add_argument("--data", default="/tmp/vuln_dashboard_data.json", help="Dashboard data file")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as f:
+        projects = json.load(f).get("projects", [])
+    index = SearchIndex()
+    index.update(projects)
+    doc_ids = index.search(args.query)
+    for name, targets in index.group_by_project(doc_ids).items():
+        print(f"{name}: {', '.join(targets)}")
+    print(f"{len(doc_ids)} targets, facets: {json.dumps(index.facets(doc_ids), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,46 +2,80 @@
 """
 漏洞扫描看板 - GitHub 同步脚本
 自动将生成的 HTML 推送到 GitHub 仓库
-支持版本记录
+支持版本记录；常驻模式下合并一段时间内的多次变化为一次提交，后台推送
 """
 
+import hashlib
 import json
 import os
+import re
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
+from atomic_writer import atomic_open
+from scan_model import LIST_FIELDS
+
 # 配置
 GITHUB_REPO = "https://github.com/yuyouquan/vuln-scan-dashboard"
 GITHUB_USER = "yuyouquan"
 REPO_NAME = "vuln-scan-dashboard"
+REMOTE_URL = f"https://github.com/{GITHUB_USER}/{REPO_NAME}.git"
 LOCAL_REPO_PATH = "/tmp/vuln-dashboard-git"
 HTML_SOURCE_DIR = "/tmp/vuln_dashboard_html"
 HTML_INDEX_FILE = "index.html"
+DASHBOARD_DATA_FILE = "/tmp/vuln_dashboard_data.json"
 
 # Git 配置
 GIT_AUTHOR_NAME = "Vuln Dashboard Bot"
 GIT_AUTHOR_EMAIL = "bot@vuln-dashboard.local"
 
-# 版本记录文件
-VERSION_FILE = "versions.json"
+# 版本记录: 每行一条 JSON，只追加；旧的 versions.json 首次读取时自动转换
+VERSION_LOG = "versions.jsonl"
+LEGACY_VERSION_FILE = "versions.json"
+# 每隔多少个版本在记录中写一次全部项目摘要（检查点），其余版本只记录变化的项目
+VERSION_CHECKPOINT = 50
 CHANGELOG_FILE = "CHANGELOG.md"
 
+# 计算内容哈希时忽略的易变字段（每轮都会变化的时间戳）
+VOLATILE_FIELDS = frozenset({"last_updated", "generatedAt"})
+# HTML 中的易变文本: 内嵌数据里的时间戳、简单 HTML 的页脚时间
+VOLATILE_HTML = (
+    (re.compile(r'"(last_updated|generatedAt)":\s*"[^"]*"'), r'"\1":""'),
+    (re.compile(r"Last Updated: [^<]*"), "Last Updated: "),
+)
+
+# 静态站点导出模式下由导出程序管理的路径（相对仓库根目录）；
+# 仓库导出不再生成 .gz，保留这些路径以便暂存旧版本提交过的 .gz 的删除
+EXPORT_PATHS = ("index.html", "index.html.gz", "search.json", "search.json.gz", "status.json", "status.json.gz",
+                "list", "projects", "assets")
+
+# 常驻模式: 源文件检查间隔和合并窗口（秒），窗口内的多次变化只提交一次
+SYNC_POLL_INTERVAL = 5
+SYNC_WINDOW = 60
+
+# 推送失败后的重试间隔（秒），每次翻倍直到上限
+PUSH_BACKOFF = 5
+PUSH_BACKOFF_MAX = 600
+# 单次同步（非常驻）时的推送尝试次数
+PUSH_ATTEMPTS = 3
 
-def run_command(cmd, cwd=None, check=True):
-    """执行 shell 命令"""
+
+def run_command(args, cwd=None, check=True):
+    """执行命令（参数列表，不经过 shell）"""
     try:
         result = subprocess.run(
-            cmd,
-            shell=True,
+            args,
             cwd=cwd,
             capture_output=True,
             text=True
         )
         if check and result.returncode != 0:
-            print(f"Command failed: {cmd}")
+            print(f"Command failed: {' '.join(args)}")
             print(f"Error: {result.stderr}")
             return None
         return result.stdout.strip()
@@ -50,28 +84,36 @@ def run_command(cmd, cwd=None, check=True):
         return None
 
 
-def init_repo():
+def git(*args, repo=LOCAL_REPO_PATH, check=True):
+    """在仓库中执行 git 子命令，提交身份通过 -c 传入，无需单独的 git config 调用"""
+    return run_command(
+        ["git", "-c", f"user.name={GIT_AUTHOR_NAME}", "-c", f"user.email={GIT_AUTHOR_EMAIL}", *args],
+        cwd=repo,
+        check=check
+    )
+
+
+def init_repo(repo=LOCAL_REPO_PATH, remote=REMOTE_URL):
     """初始化 Git 仓库"""
-    if os.path.exists(LOCAL_REPO_PATH):
-        print(f"Repository already exists at {LOCAL_REPO_PATH}")
+    if os.path.exists(repo):
+        print(f"Repository already exists at {repo}")
         return True
-    
-    # 尝试克隆现有仓库
-    clone_url = f"https://github.com/{GITHUB_USER}/{REPO_NAME}.git"
+
+    # 尝试克隆现有仓库（remote 也可以是本地裸仓库路径）
     result = subprocess.run(
-                ["git", "clone", clone_url, LOCAL_REPO_PATH],
+                ["git", "clone", remote, repo],
                 capture_output=True,
                 text=True
             )
-    
+
     if result.returncode != 0:
         # 仓库不存在，创建新仓库
         print("Repository does not exist, creating new one...")
-        os.makedirs(LOCAL_REPO_PATH, exist_ok=True)
-        run_command("git init", cwd=LOCAL_REPO_PATH)
-        run_command(f"git config user.name '{GIT_AUTHOR_NAME}'", cwd=LOCAL_REPO_PATH)
-        run_command(f"git config user.email '{GIT_AUTHOR_EMAIL}'", cwd=LOCAL_REPO_PATH)
-        
+        os.makedirs(repo, exist_ok=True)
+        git("init", repo=repo)
+        git("config", "user.name", GIT_AUTHOR_NAME, repo=repo)
+        git("config", "user.email", GIT_AUTHOR_EMAIL, repo=repo)
+
         # 创建初始 README
         readme_content = f"""# {REPO_NAME}
 
@@ -94,168 +136,431 @@ This dashboard displays the status of vulnerability scans using Strix, Nikto, an
 
 ## Auto-generated by Vuln Dashboard
 """
-        with open(os.path.join(LOCAL_REPO_PATH, "README.md"), 'w') as f:
+        with open(os.path.join(repo, "README.md"), 'w') as f:
             f.write(readme_content)
-        
+
         # 初始提交
-        run_command("git add README.md", cwd=LOCAL_REPO_PATH)
-        run_command('git commit -m "Initial commit"', cwd=LOCAL_REPO_PATH)
-        
-        # 注意: 需要手动创建 GitHub 仓库并配置 remote
+        git("add", "README.md", repo=repo)
+        git("commit", "-m", "Initial commit", repo=repo)
+
+        # 注意: 需要手动创建 GitHub 仓库，推送前配置 remote
+        git("remote", "add", "origin", remote, repo=repo)
         print(f"Please create repository at {GITHUB_REPO} manually")
         return True
-    
+
     # 配置 git
-    run_command(f"git config user.name '{GIT_AUTHOR_NAME}'", cwd=LOCAL_REPO_PATH)
-    run_command(f"git config user.email '{GIT_AUTHOR_EMAIL}'", cwd=LOCAL_REPO_PATH)
-    
+    git("config", "user.name", GIT_AUTHOR_NAME, repo=repo)
+    git("config", "user.email", GIT_AUTHOR_EMAIL, repo=repo)
+
     return True
 
 
-def load_html_content():
-    """加载 HTML 内容"""
+def load_dashboard_data():
+    """加载看板数据，文件不存在或无法解析时返回 None"""
+    try:
+        with open(DASHBOARD_DATA_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_html_source():
+    """读取已导出的看板 HTML，不存在时返回 None"""
     html_path = os.path.join(HTML_SOURCE_DIR, HTML_INDEX_FILE)
-    
     if not os.path.exists(html_path):
-        # 尝试从 dashboard 数据生成简单 HTML
-        dashboard_data_path = "/tmp/vuln_dashboard_data.json"
-        if os.path.exists(dashboard_data_path):
-            with open(dashboard_data_path, 'r') as f:
-                data = json.load(f)
-            return generate_simple_html(data)
-        else:
-            print(f"HTML file not found: {html_path}")
-            return None
-    
+        return None
     with open(html_path, 'r', encoding='utf-8') as f:
         return f.read()
 
 
-def generate_simple_html(data):
-    """从 dashboard 数据生成简单的 HTML"""
-    import json
-    
-    projects_html = ""
-    for project in data.get("projects", []):
-        targets_html = ""
-        for target in project.get("targets", []):
-            tools_html = ""
-            for tool in target.get("tools", []):
-                status_class = "status-pending"
-                if tool.get("status") == "scanning":
-                    status_class = "status-scanning"
-                elif tool.get("status") == "completed":
-                    status_class = "status-completed"
-                
-                tools_html += f"""
-                <div class="tool-card">
-                    <h4>{tool.get('name')}</h4>
-                    <span class="status {status_class}">{tool.get('status')}</span>
-                    <div class="progress-bar">
-                        <div class="progress-fill" style="width: {tool.get('progress', 0)}%"></div>
-                    </div>
-                    <p>Progress: {tool.get('progress', 0)}%</p>
-                    <p>Scanned: {tool.get('scanned', 0)}</p>
-                    <p>Found: {tool.get('found', 0)}</p>
-                </div>
-                """
-            
-            targets_html += f"""
-            <div class="target-card">
-                <h3>{target.get('name')}</h3>
-                <div class="tools-grid">
-                    {tools_html}
-                </div>
-            </div>
-            """
-        
-        proj_status_class = "status-pending"
-        if project.get("status") == "scanning":
-            proj_status_class = "status-scanning"
-        elif project.get("status") == "completed":
-            proj_status_class = "status-completed"
-        
-        projects_html += f"""
-        <div class="project-card">
-            <h2>{project.get('name')}</h2>
-            <span class="status {proj_status_class}">{project.get('status')}</span>
-            <div class="progress-bar">
-                <div class="progress-fill" style="width: {project.get('progress', 0)}%"></div>
-            </div>
-            <div class="targets-container">
-                {targets_html}
-            </div>
-        </div>
-        """
-    
-    html = f"""<!DOCTYPE html>
+def load_html_content(data=None):
+    """加载 HTML 内容，没有导出的 HTML 时从看板数据生成"""
+    html_content = load_html_source()
+    if html_content is not None:
+        return html_content
+
+    # 尝试从 dashboard 数据生成简单 HTML
+    if data is None:
+        data = load_dashboard_data()
+    if data is not None:
+        return generate_simple_html(data)
+    print(f"HTML file not found: {os.path.join(HTML_SOURCE_DIR, HTML_INDEX_FILE)}")
+    return None
+
+
+# 简单 HTML 页面的页头和页尾，项目片段写在两者之间
+SIMPLE_HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Vulnerability Scan Dashboard</title>
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f5f5f5; padding: 20px; }}
-        .container {{ max-width: 1200px; margin: 0 auto; }}
-        h1 {{ text-align: center; margin-bottom: 30px; color: #333; }}
-        .project-card {{ background: white; border-radius: 8px; padding: 20px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .target-card {{ background: #f9f9f9; border-radius: 6px; padding: 15px; margin: 15px 0; }}
-        .tools-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }}
-        .tool-card {{ background: white; border-radius: 4px; padding: 15px; border: 1px solid #eee; }}
-        .tool-card h4 {{ margin-bottom: 10px; color: #555; }}
-        .progress-bar {{ background: #e0e0e0; border-radius: 10px; height: 20px; overflow: hidden; margin: 10px 0; }}
-        .progress-fill {{ background: linear-gradient(90deg, #4CAF50, #8BC34A); height: 100%; transition: width 0.3s; }}
-        .status {{ display: inline-block; padding: 4px 12px; border-radius: 12px; font-size: 12px; font-weight: bold; text-transform: uppercase; }}
-        .status-pending {{ background: #9e9e9e; color: white; }}
-        .status-scanning {{ background: #2196F3; color: white; }}
-        .status-completed {{ background: #4CAF50; color: white; }}
-        .last-updated {{ text-align: center; color: #888; margin-top: 20px; font-size: 14px; }}
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f5f5f5; padding: 20px; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        h1 { text-align: center; margin-bottom: 30px; color: #333; }
+        .project-card { background: white; border-radius: 8px; padding: 20px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .target-card { background: #f9f9f9; border-radius: 6px; padding: 15px; margin: 15px 0; }
+        .tools-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }
+        .tool-card { background: white; border-radius: 4px; padding: 15px; border: 1px solid #eee; }
+        .tool-card h4 { margin-bottom: 10px; color: #555; }
+        .progress-bar { background: #e0e0e0; border-radius: 10px; height: 20px; overflow: hidden; margin: 10px 0; }
+        .progress-fill { background: linear-gradient(90deg, #4CAF50, #8BC34A); height: 100%; transition: width 0.3s; }
+        .status { display: inline-block; padding: 4px 12px; border-radius: 12px; font-size: 12px; font-weight: bold; text-transform: uppercase; }
+        .status-pending { background: #9e9e9e; color: white; }
+        .status-scanning { background: #2196F3; color: white; }
+        .status-completed { background: #4CAF50; color: white; }
+        .last-updated { text-align: center; color: #888; margin-top: 20px; font-size: 14px; }
     </style>
 </head>
 <body>
     <div class="container">
         <h1>🔒 Vulnerability Scan Dashboard</h1>
-        {projects_html}
-        <p class="last-updated">Last Updated: {data.get('last_updated', 'N/A')}</p>
+        """
+
+SIMPLE_HTML_FOOT = """
+        <p class="last-updated">Last Updated: {last_updated}</p>
     </div>
 </body>
 </html>
 """
-    return html
 
 
-def load_version_history():
-    """加载版本历史"""
-    version_path = os.path.join(LOCAL_REPO_PATH, VERSION_FILE)
-    
-    if os.path.exists(version_path):
-        with open(version_path, 'r') as f:
-            return json.load(f)
-    
-    return {"versions": []}
+def _status_class(status):
+    if status == "scanning":
+        return "status-scanning"
+    if status == "completed":
+        return "status-completed"
+    return "status-pending"
 
 
-def save_version_history(history):
-    """保存版本历史"""
-    version_path = os.path.join(LOCAL_REPO_PATH, VERSION_FILE)
-    with open(version_path, 'w') as f:
-        json.dump(history, f, indent=2)
+def render_project_fragment(project):
+    """渲染单个项目的 HTML 片段（工具、目标片段先收集到列表，最后一次拼接）"""
+    parts = []
+    append = parts.append
+    append(f"""
+        <div class="project-card">
+            <h2>{project.get('name')}</h2>
+            <span class="status {_status_class(project.get("status"))}">{project.get('status')}</span>
+            <div class="progress-bar">
+                <div class="progress-fill" style="width: {project.get('progress', 0)}%"></div>
+            </div>
+            <div class="targets-container">
+                """)
+    for target in project.get("targets", []):
+        append(f"""
+            <div class="target-card">
+                <h3>{target.get('name')}</h3>
+                <div class="tools-grid">
+                    """)
+        for tool in target.get("tools", []):
+            append(f"""
+                <div class="tool-card">
+                    <h4>{tool.get('name')}</h4>
+                    <span class="status {_status_class(tool.get("status"))}">{tool.get('status')}</span>
+                    <div class="progress-bar">
+                        <div class="progress-fill" style="width: {tool.get('progress', 0)}%"></div>
+                    </div>
+                    <p>Progress: {tool.get('progress', 0)}%</p>
+                    <p>Scanned: {tool.get('scanned', 0)}</p>
+                    <p>Found: {tool.get('found', 0)}</p>
+                </div>
+                """)
+        append("""
+                </div>
+            </div>
+            """)
+    append("""
+            </div>
+        </div>
+        """)
+    return "".join(parts)
+
+
+def iter_simple_html(data):
+    """逐块生成简单 HTML: 页头、各项目片段、页尾"""
+    yield SIMPLE_HTML_HEAD
+    for project in data.get("projects", []):
+        yield render_project_fragment(project)
+    yield SIMPLE_HTML_FOOT.format(last_updated=data.get('last_updated', 'N/A'))
+
+
+def write_simple_html(data, path):
+    """把简单 HTML 逐块写入 path（原子替换），不在内存中拼出整页；返回 content_hash"""
+    return write_html(path, iter_simple_html(data))
+
+
+def generate_simple_html(data):
+    """从 dashboard 数据生成简单的 HTML"""
+    return "".join(iter_simple_html(data))
+
+
+def _legacy_versions(repo):
+    """旧的 versions.json（最新在前，最多 50 条）中的记录，按时间顺序返回；只读，不修改文件"""
+    try:
+        with open(os.path.join(repo, LEGACY_VERSION_FILE), 'r') as f:
+            versions = json.load(f).get("versions", [])
+    except (OSError, ValueError, AttributeError):
+        return []
+    return versions[::-1]
+
+
+def _migrate_version_file(repo):
+    """把旧的 versions.json 转换为追加式的 versions.jsonl
+
+    只在追加版本记录（随后提交）时调用，读取路径不修改工作区
+    """
+    legacy_path = os.path.join(repo, LEGACY_VERSION_FILE)
+    log_path = os.path.join(repo, VERSION_LOG)
+    if not os.path.exists(legacy_path) or os.path.exists(log_path):
+        return
+    with open(log_path, 'w') as f:
+        for entry in _legacy_versions(repo):
+            f.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+    # 已跟踪时同时暂存删除
+    git("rm", "-q", "--ignore-unmatch", "--", LEGACY_VERSION_FILE, repo=repo)
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
+
+
+def _read_versions(repo):
+    """按时间顺序逐条读取版本记录；还没有 versions.jsonl 时读取旧的 versions.json"""
+    try:
+        f = open(os.path.join(repo, VERSION_LOG), 'r', encoding='utf-8')
+    except FileNotFoundError:
+        yield from _legacy_versions(repo)
+        return
+    except OSError:
+        return
+    with f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # 跳过写到一半的行
+                continue
+
+
+def iter_versions(repo=LOCAL_REPO_PATH, since=None, until=None):
+    """按时间顺序逐条读取版本记录，可按 ISO 时间范围 [since, until] 筛选"""
+    for entry in _read_versions(repo):
+        timestamp = entry.get("timestamp", "")
+        if since and timestamp < since:
+            continue
+        if until and timestamp > until:
+            continue
+        yield entry
+
+
+def _reversed_versions(f, block=4096):
+    """从文件末尾向前逐条读取版本记录（跳过无法解析的行），只读取用到的部分"""
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    partial = b""
+    while end > 0:
+        start = max(0, end - block)
+        f.seek(start)
+        lines = (f.read(end - start) + partial).split(b"\n")
+        end = start
+        # 第一段可能是被块边界截断的行，留到读取前一块时拼接
+        partial = lines.pop(0) if start > 0 else b""
+        for line in reversed(lines):
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
 
 
-def generate_version_tag():
-    """生成版本标签"""
-    return datetime.now().strftime("v%Y%m%d-%H%M%S")
+def latest_version(repo=LOCAL_REPO_PATH):
+    """最近一条版本记录（只读文件末尾），没有时返回 {}"""
+    try:
+        with open(os.path.join(repo, VERSION_LOG), 'rb') as f:
+            return next(_reversed_versions(f), {})
+    except FileNotFoundError:
+        legacy = _legacy_versions(repo)
+        return legacy[-1] if legacy else {}
+    except OSError:
+        return {}
+
+
+def find_position(tag, repo=LOCAL_REPO_PATH):
+    """版本在记录中的位置（从 1 开始），不存在或有多条同名记录时返回 None
+
+    "latest" 表示最近一条，"#N" 表示第 N 条，可用于选择旧记录中标签重复的版本
+    """
+    count = 0
+    matches = []
+    for count, entry in enumerate(_read_versions(repo), 1):
+        if entry.get("version") == tag:
+            matches.append(count)
+    if tag == "latest":
+        return count or None
+    if tag.startswith("#") and tag[1:].isdigit():
+        position = int(tag[1:])
+        return position if 1 <= position <= count else None
+    if len(matches) > 1:
+        print(f"Ambiguous version {tag}: {len(matches)} entries, select one with #N")
+        return None
+    return matches[0] if matches else None
+
+
+def find_version(tag, repo=LOCAL_REPO_PATH):
+    """按版本标签查找记录（规则同 find_position），不存在或有歧义时返回 None"""
+    if tag == "latest":
+        return latest_version(repo) or None
+    position = find_position(tag, repo)
+    if position is None:
+        return None
+    for index, entry in enumerate(_read_versions(repo), 1):
+        if index == position:
+            return entry
+    return None
 
 
-def update_changelog(history):
+def _apply_projects(state, entry):
+    """把一条版本记录的项目摘要应用到 state（项目名 -> 摘要）
+
+    新记录（delta）只含相对上一版本变化的项目和 removed 列表；
+    旧记录的 projects 是全部项目；没有 projects 的记录不改变 state
+    """
+    projects = entry.get("projects")
+    if projects is None:
+        return
+    if not entry.get("delta"):
+        state.clear()
+    state.update(projects)
+    for name in entry.get("removed", ()):
+        state.pop(name, None)
+
+
+def replay_projects(repo=LOCAL_REPO_PATH, positions=()):
+    """重放版本记录，返回 {位置: (记录, 该版本时的全部项目摘要)}"""
+    wanted = set(positions)
+    state = {}
+    result = {}
+    for index, entry in enumerate(_read_versions(repo), 1):
+        _apply_projects(state, entry)
+        if index in wanted:
+            result[index] = (entry, dict(state))
+            if len(result) == len(wanted):
+                break
+    return result
+
+
+def latest_projects(repo=LOCAL_REPO_PATH):
+    """最近版本的全部项目摘要，返回 (项目摘要, 最近的检查点之后的版本数)
+
+    从文件末尾向前读到最近的检查点（含全部项目的记录），只重放其后的变化，
+    读取量与版本总数无关；没有检查点时版本数为 None
+    """
+    entries = []
+    try:
+        with open(os.path.join(repo, VERSION_LOG), 'rb') as f:
+            for entry in _reversed_versions(f):
+                if entry.get("projects") is not None and not entry.get("delta"):
+                    break
+                entries.append(entry)
+            else:
+                entry = None
+    except OSError:
+        # 旧的 versions.json 不含项目摘要
+        return {}, None
+    state = {}
+    if entry is not None:
+        _apply_projects(state, entry)
+    for later in reversed(entries):
+        _apply_projects(state, later)
+    return state, (len(entries) if entry is not None else None)
+
+
+def append_version(entry, repo=LOCAL_REPO_PATH):
+    """追加一条版本记录，返回追加前的文件长度（提交失败时用于回滚）"""
+    _migrate_version_file(repo)
+    log_path = os.path.join(repo, VERSION_LOG)
+    with open(log_path, 'a', encoding='utf-8') as f:
+        offset = f.tell()
+        f.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+    return offset
+
+
+def load_version_history(repo=LOCAL_REPO_PATH):
+    """加载版本历史（最新在前）"""
+    versions = list(iter_versions(repo))
+    versions.reverse()
+    return {"versions": versions}
+
+
+def version_stats(data):
+    """从看板数据计算版本统计和各项目摘要 {项目名: [状态, 进度, 目标数, 发现数]}"""
+    stats = {"projects": 0, "targets": 0, "tools": 0, "found": 0, "status": {}}
+    stats.update((field, 0) for field in LIST_FIELDS)
+    projects = {}
+    for project in data.get("projects", []):
+        targets = project.get("targets", [])
+        found = 0
+        for target in targets:
+            for tool in target.get("tools", []):
+                stats["tools"] += 1
+                found += tool.get("found", 0) or 0
+                for field in LIST_FIELDS:
+                    stats[field] += len(tool.get(field) or ())
+        status = project.get("status", "pending")
+        stats["projects"] += 1
+        stats["targets"] += len(targets)
+        stats["found"] += found
+        stats["status"][status] = stats["status"].get(status, 0) + 1
+        projects[project.get("name", "Unknown")] = [status, project.get("progress", 0), len(targets), found]
+    return stats, projects
+
+
+def diff_versions(old, new, old_projects, new_projects):
+    """比较两条版本记录: 统计差值和项目的增加、删除、变化
+
+    old_projects / new_projects 为两个版本时的全部项目摘要（由 replay_projects 重放得到）
+    """
+    old_stats, new_stats = old.get("stats") or {}, new.get("stats") or {}
+    stats = {
+        key: new_stats.get(key, 0) - old_stats.get(key, 0)
+        for key in new_stats.keys() | old_stats.keys()
+        if key != "status" and new_stats.get(key, 0) != old_stats.get(key, 0)
+    }
+    changed = {
+        name: {"from": old_projects[name], "to": summary}
+        for name, summary in new_projects.items()
+        if name in old_projects and old_projects[name] != summary
+    }
+    return {
+        "from": old.get("version"),
+        "to": new.get("version"),
+        "stats": stats,
+        "added": sorted(new_projects.keys() - old_projects.keys()),
+        "removed": sorted(old_projects.keys() - new_projects.keys()),
+        "changed": changed,
+    }
+
+
+def generate_version_tag(repo=LOCAL_REPO_PATH):
+    """生成版本标签 vYYYYmmdd-HHMMSS；同一秒内已有版本时追加序号（-2、-3 ...）"""
+    tag = datetime.now().strftime("v%Y%m%d-%H%M%S")
+    latest = latest_version(repo).get("version", "")
+    if latest == tag:
+        return f"{tag}-2"
+    base, _, sequence = latest.rpartition("-")
+    if base == tag and sequence.isdigit():
+        return f"{tag}-{int(sequence) + 1}"
+    return tag
+
+
+def update_changelog(latest, repo=LOCAL_REPO_PATH):
     """更新 CHANGELOG"""
-    changelog_path = os.path.join(LOCAL_REPO_PATH, CHANGELOG_FILE)
-    
-    latest = history["versions"][0] if history["versions"] else {}
+    changelog_path = os.path.join(repo, CHANGELOG_FILE)
+
     version = latest.get("version", "v1.0.0")
     date = latest.get("timestamp", datetime.now().isoformat())
-    
+
     changelog_content = f"""# Changelog
 
 ## [{version}] - {date}
@@ -268,118 +573,480 @@ def update_changelog(history):
 
 *Auto-generated by Vuln Dashboard*
 """
-    
+
     with open(changelog_path, 'w') as f:
         f.write(changelog_content)
 
 
-def sync_to_github(commit_message=None):
-    """同步到 GitHub"""
-    print("Starting GitHub sync...")
-    
-    # 初始化仓库
-    if not init_repo():
-        print("Failed to initialize repository")
-        return False
-    
-    # 加载 HTML 内容
-    html_content = load_html_content()
-    if not html_content:
-        print("No HTML content to sync")
-        return False
-    
+def _strip_volatile(value):
+    """去掉 VOLATILE_FIELDS（任意层级的字典）"""
+    if isinstance(value, dict):
+        return {key: _strip_volatile(item) for key, item in value.items() if key not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def data_hash(data):
+    """规范化看板数据的 SHA-256: 去掉易变字段，键排序后编码"""
+    text = json.dumps(_strip_volatile(data), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _mask_volatile(text):
+    # 易变文本都在同一行内，按块或按行处理结果相同
+    for pattern, replacement in VOLATILE_HTML:
+        text = pattern.sub(replacement, text)
+    return text.encode("utf-8")
+
+
+def content_hash(chunks):
+    """HTML 内容（字符串或逐块的可迭代对象）的 SHA-256，先把生成时间等易变文本替换为固定占位"""
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    digest = hashlib.sha256()
+    for text in chunks:
+        digest.update(_mask_volatile(text))
+    return digest.hexdigest()
+
+
+def file_hash(path):
+    """文件内容的 content_hash（逐行读取），文件不存在时为 None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return content_hash(f)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def write_html(path, chunks):
+    """逐块原子写入 HTML，同时计算 content_hash"""
+    digest = hashlib.sha256()
+    with atomic_open(path) as f:
+        for text in chunks:
+            f.write(text)
+            digest.update(_mask_volatile(text))
+    return digest.hexdigest()
+
+
+def commit_dashboard(html_content, data=None, commit_message=None, repo=LOCAL_REPO_PATH):
+    """把 HTML 写入仓库并提交（不推送）
+
+    html_content 为 None 时由 data 逐块渲染简单 HTML 直接写入仓库。
+    忽略易变字段后，HTML 与仓库中的 index.html 相同、数据哈希与最近版本相同时，
+    不写文件、不提交；只暂存本次写入的文件。
+    返回新版本标签，内容未变化时返回 None，git 失败时返回 False
+    """
+    html_path = os.path.join(repo, HTML_INDEX_FILE)
+
+    def chunks():
+        return (html_content,) if html_content is not None else iter_simple_html(data)
+
+    data_digest = data_hash(data) if data is not None else None
+
+    latest = latest_version(repo)
+    # 旧版本记录没有 data_hash 时只比较 HTML
+    same_data = data_digest is None or latest.get("data_hash", data_digest) == data_digest
+    # 数据已变化时不必先比较 HTML，直接写入（只渲染一遍）
+    if same_data and file_hash(html_path) == content_hash(chunks()):
+        print("Dashboard unchanged, nothing to commit")
+        return None
+
     # 写入 HTML 文件
-    html_path = os.path.join(LOCAL_REPO_PATH, HTML_INDEX_FILE)
-    with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
+    digest = write_html(html_path, chunks())
+
     print(f"HTML written to {html_path}")
-    
-    # 加载并更新版本历史
-    history = load_version_history()
-    
-    # 生成新版本
-    new_version = generate_version_tag()
+
+    return _commit_version([HTML_INDEX_FILE], data, commit_message, repo,
+                           content_hash=digest, data_hash=data_digest)
+
+
+def commit_static_site(data, commit_message=None, repo=LOCAL_REPO_PATH):
+    """把多页静态站点导出到仓库并提交（不推送）
+
+    是否提交只看数据哈希是否与最近版本相同，不看本次重写了多少文件:
+    上次提交失败时版本记录已回退，已导出但未提交的文件会在这次一起提交。
+    导出时内容未变化的文件不重写，git 只看到真正变化的页面。返回值同 commit_dashboard
+    """
+    import dashboard
+
+    data_digest = data_hash(data)
+    latest = latest_version(repo)
+    if latest.get("data_hash") == data_digest and latest.get("export"):
+        print("Dashboard unchanged, nothing to commit")
+        return None
+
+    # GitHub Pages 不会返回 .gz 副本，仓库中不导出
+    dashboard.export_static_site(repo, data, gzip_files=False)
+    return _commit_version(EXPORT_PATHS, data, commit_message, repo,
+                           data_hash=data_digest, export=True)
+
+
+def _commit_version(paths, data, commit_message, repo, **fields):
+    """追加版本记录、更新 CHANGELOG，只暂存 paths 和版本文件后提交
+
+    版本记录保存全局统计和相对上一版本变化的项目摘要（delta），每 VERSION_CHECKPOINT 个版本
+    保存一次全部项目（检查点）；某个版本的全部项目由 replay_projects 重放得到
+    """
+    # 生成新版本，统计值从看板数据计算
+    new_version = generate_version_tag(repo)
+    stats, projects = version_stats(data) if data is not None else (None, None)
     version_entry = {
         "version": new_version,
         "timestamp": datetime.now().isoformat(),
         "message": commit_message or f"Update dashboard - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        "projects_count": len(json.loads(html_content).get("projects", []))
+        "projects_count": stats["projects"] if stats else None,
+        **fields,
+        "stats": stats
     }
-    
-    # 添加到历史（保留最近 50 个版本）
-    history["versions"].insert(0, version_entry)
-    history["versions"] = history["versions"][:50]
-    
-    save_version_history(history)
-    update_changelog(history)
-    
-    # Git 操作
-    run_command("git add .", cwd=LOCAL_REPO_PATH)
-    
-    # 检查是否有更改
-    status = run_command("git status --porcelain", cwd=LOCAL_REPO_PATH)
-    if not status:
-        print("No changes to commit")
-        return True
-    
-    # 提交
+    if projects is not None:
+        previous, since_checkpoint = latest_projects(repo)
+        if since_checkpoint is None or since_checkpoint + 1 >= VERSION_CHECKPOINT:
+            # 检查点: 记录全部项目，之后的读取不必重放更早的记录
+            version_entry["projects"] = projects
+        else:
+            version_entry["delta"] = True
+            version_entry["projects"] = {
+                name: summary for name, summary in projects.items() if previous.get(name) != summary
+            }
+            version_entry["removed"] = sorted(previous.keys() - projects.keys())
+
+    # 追加到版本记录（不再截断）
+    offset = append_version(version_entry, repo)
+    update_changelog(version_entry, repo)
+
+    # Git 操作: 只暂存本次写入的文件，内容已确认变化，无需 git status；
+    # -A 同时暂存其中被删除的文件。已删除但仍被跟踪的路径也要传给 git add，
+    # 工作区和索引中都没有的路径会让 git add 报错，需要去掉
+    tracked = (git("ls-files", "--", *paths, repo=repo) or "").splitlines()
+    paths = [
+        path for path in paths
+        if os.path.exists(os.path.join(repo, path))
+        or any(name == path or name.startswith(path + "/") for name in tracked)
+    ]
     commit_msg = commit_message or f"Update dashboard - {new_version}"
-    run_command(f'git commit -m "{commit_msg}"', cwd=LOCAL_REPO_PATH)
-    
-    # 尝试推送到 GitHub
-    # 注意: 需要配置 GitHub token 或 SSH 密钥
-    push_result = run_command("git push origin main", cwd=LOCAL_REPO_PATH, check=False)
-    
-    if push_result is None:
-        # 可能是 main 分支不存在，尝试 master
-        push_result = run_command("git push origin master", cwd=LOCAL_REPO_PATH, check=False)
-    
-    if push_result is None:
+    if (git("add", "-A", "--", *paths, VERSION_LOG, CHANGELOG_FILE, repo=repo) is None
+            or git("commit", "-m", commit_msg, repo=repo) is None):
+        # 撤销版本记录，下次运行不会误判为已同步
+        os.truncate(os.path.join(repo, VERSION_LOG), offset)
+        return False
+
+    return new_version
+
+
+def push(repo=LOCAL_REPO_PATH):
+    """推送当前分支到 origin 的同名分支（main 或 master 均可）"""
+    # 注意: 推送到 GitHub 需要配置 token 或 SSH 密钥
+    return git("push", "origin", "HEAD", repo=repo) is not None
+
+
+def push_with_retry(repo=LOCAL_REPO_PATH, attempts=PUSH_ATTEMPTS, backoff=PUSH_BACKOFF):
+    """推送，失败时按指数退避重试 attempts 次"""
+    for attempt in range(attempts):
+        if push(repo):
+            return True
+        if attempt + 1 < attempts:
+            print(f"Push failed, retrying in {backoff}s")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, PUSH_BACKOFF_MAX)
+    return False
+
+
+class BackgroundPusher:
+    """后台推送线程: 有新提交时推送，失败后按指数退避重试；
+    等待重试期间产生的新提交由同一次推送带上"""
+
+    def __init__(self, repo=LOCAL_REPO_PATH, backoff=PUSH_BACKOFF, backoff_max=PUSH_BACKOFF_MAX):
+        self.repo = repo
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.failures = 0
+        self._lock = threading.Lock()
+        # 提交序号: 请求推送时递增，推送成功时记录推送开始时的序号
+        self._requested = 0
+        self._pushed = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sync-push", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self):
+        with self._lock:
+            return self._requested > self._pushed
+
+    def kick(self):
+        """有新提交，请求推送"""
+        with self._lock:
+            self._requested += 1
+        self._wake.set()
+
+    def _push_pending(self):
+        with self._lock:
+            generation = self._requested
+        if generation <= self._pushed:
+            return True
+        if not push(self.repo):
+            return False
+        with self._lock:
+            self._pushed = max(self._pushed, generation)
+        return True
+
+    def _run(self):
+        delay = self.backoff
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if self._push_pending():
+                self.failures = 0
+                delay = self.backoff
+                print(f"Pushed to {GITHUB_REPO}")
+                continue
+            self.failures += 1
+            print(f"Push failed ({self.failures}), retrying in {delay}s")
+            # 等待期间 kick() 只登记新提交，退避结束后一起推送
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, self.backoff_max)
+            self._wake.set()
+
+    def close(self):
+        """停止线程，仍有未推送的提交时做最后一次尝试"""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        if self.pending and not self._push_pending():
+            print("Warning: some commits were not pushed")
+            return False
+        return True
+
+
+def commit_changes(commit_message=None, repo=LOCAL_REPO_PATH, export=False):
+    """加载看板数据，提交单页 HTML（export=True 时为多页静态站点）；返回值同 commit_dashboard"""
+    data = load_dashboard_data()
+    if export:
+        if data is None:
+            print("No dashboard data to export")
+            return False
+        return commit_static_site(data, commit_message, repo)
+
+    # 加载 HTML 内容
+    html_content = load_html_source()
+    if html_content is None and data is None:
+        print("No HTML content to sync")
+        return False
+    return commit_dashboard(html_content, data, commit_message, repo)
+
+
+def sync_to_github(commit_message=None, repo=LOCAL_REPO_PATH, remote=REMOTE_URL, export=False):
+    """同步到 GitHub"""
+    print("Starting GitHub sync...")
+
+    # 初始化仓库
+    if not init_repo(repo, remote):
+        print("Failed to initialize repository")
+        return False
+
+    new_version = commit_changes(commit_message, repo, export)
+    if new_version is False:
+        return False
+    if new_version is None:
+        return True
+
+    if not push_with_retry(repo):
         print("Warning: Failed to push to GitHub")
         print("Changes committed locally. Push manually with:")
-        print(f"  cd {LOCAL_REPO_PATH}")
-        print("  git push origin main")
+        print(f"  cd {repo}")
+        print("  git push origin HEAD")
         return False
-    
+
     print(f"Successfully synced to GitHub: {GITHUB_REPO}")
     print(f"Version: {new_version}")
-    
+
     return True
 
 
-def show_version_history():
-    """显示版本历史"""
-    history = load_version_history()
-    
+def _source_signature():
+    """HTML 源文件和看板数据的 (mtime_ns, size)，用于发现变化"""
+    signature = []
+    for path in (os.path.join(HTML_SOURCE_DIR, HTML_INDEX_FILE), DASHBOARD_DATA_FILE):
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class SyncEngine:
+    """常驻同步: 源文件首次变化后等待合并窗口，窗口内的多次变化只生成一次提交，
+    推送交给后台线程"""
+
+    def __init__(self, repo=LOCAL_REPO_PATH, window=SYNC_WINDOW, commit_message=None, export=False):
+        self.repo = repo
+        self.window = window
+        self.commit_message = commit_message
+        self.export = export
+        self.pusher = BackgroundPusher(repo)
+        self._signature = None
+        # 首个未提交变化的时间，None 表示没有待提交的变化
+        self._dirty_since = None
+
+    def notify(self, now=None):
+        """登记一次变化（同进程内的生成脚本可直接调用）"""
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic() if now is None else now
+
+    def poll(self, now=None):
+        """检查源文件，合并窗口到期时提交；返回是否产生了新提交"""
+        now = time.monotonic() if now is None else now
+        signature = _source_signature()
+        if signature != self._signature:
+            self._signature = signature
+            self.notify(now)
+        if self._dirty_since is not None and now - self._dirty_since >= self.window:
+            return self.flush()
+        return False
+
+    def flush(self):
+        """立即提交待同步的变化"""
+        self._dirty_since = None
+        new_version = commit_changes(self.commit_message, self.repo, self.export)
+        if not new_version:
+            return False
+        print(f"Committed {new_version}")
+        self.pusher.kick()
+        return True
+
+    def close(self):
+        """提交未到期的变化，并尽量推送"""
+        if self._dirty_since is not None:
+            self.flush()
+        return self.pusher.close()
+
+
+def run_daemon(repo=LOCAL_REPO_PATH, remote=REMOTE_URL, window=SYNC_WINDOW,
+               interval=SYNC_POLL_INTERVAL, commit_message=None, export=False):
+    """常驻模式: 按 interval 检查源文件，合并 window 秒内的变化后提交并在后台推送"""
+    if not init_repo(repo, remote):
+        print("Failed to initialize repository")
+        return False
+
+    engine = SyncEngine(repo, window, commit_message, export)
+    print(f"Sync daemon started: window={window}s, poll={interval}s")
+    try:
+        while True:
+            try:
+                engine.poll()
+            except Exception as e:
+                # 单轮失败不影响常驻进程
+                print(f"Sync pass failed: {e}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    return engine.close()
+
+
+def _format_stats(stats):
+    if not stats:
+        return "  (no stats)"
+    return (f"  projects {stats['projects']}, targets {stats['targets']}, found {stats['found']}, "
+            + ", ".join(f"{field} {stats.get(field, 0)}" for field in LIST_FIELDS))
+
+
+def show_version_history(repo=LOCAL_REPO_PATH, since=None, until=None, limit=10):
+    """显示版本历史（最新在前），可按时间范围筛选；limit 为 0 时不限条数"""
+    versions = deque(iter_versions(repo, since, until), maxlen=limit or None)
+
     print("\n=== Version History ===")
-    for v in history["versions"][:10]:
+    for v in reversed(versions):
         print(f"{v['version']} - {v['timestamp']}")
         print(f"  {v['message']}")
+        print(_format_stats(v.get("stats")))
+        if v.get("data_hash"):
+            print(f"  data {v['data_hash'][:12]}")
         print()
 
 
+def show_version_diff(old_tag, new_tag="latest", repo=LOCAL_REPO_PATH):
+    """显示两个版本之间的统计差值和项目变化"""
+    positions = []
+    for tag in (old_tag, new_tag):
+        position = find_position(tag, repo)
+        if position is None:
+            print(f"Version not found: {tag}")
+            return False
+        positions.append(position)
+
+    states = replay_projects(repo, positions)
+    (old, old_projects), (new, new_projects) = states[positions[0]], states[positions[1]]
+    diff = diff_versions(old, new, old_projects, new_projects)
+    print(f"\n=== {diff['from']} -> {diff['to']} ===")
+    if old.get("data_hash") and old.get("data_hash") == new.get("data_hash"):
+        print("Data unchanged")
+    for key, delta in sorted(diff["stats"].items()):
+        print(f"  {key:<10} {delta:+d}")
+    for name in diff["added"]:
+        print(f"  + {name}")
+    for name in diff["removed"]:
+        print(f"  - {name}")
+    for name, change in sorted(diff["changed"].items()):
+        (old_status, old_progress, old_targets, old_found) = change["from"]
+        (status, progress, targets, found) = change["to"]
+        print(f"  ~ {name}: {old_status} {old_progress}% -> {status} {progress}%, "
+              f"targets {old_targets} -> {targets}, found {old_found} -> {found}")
+    return True
+
+
 def main():
     """主函数"""
     import argparse
-    
+
     parser = argparse.ArgumentParser(description="Sync dashboard to GitHub")
     parser.add_argument("-m", "--message", help="Commit message")
     parser.add_argument("--history", action="store_true", help="Show version history")
+    parser.add_argument("--since", help="With --history, only versions at or after this ISO time")
+    parser.add_argument("--until", help="With --history, only versions at or before this ISO time")
+    parser.add_argument("--limit", type=int, default=10,
+                        help="With --history, number of versions to show (0 = all, default: 10)")
+    parser.add_argument("--diff", nargs="+", metavar="VERSION",
+                        help="Compare two versions by tag, 'latest' or log position '#N' (second defaults to latest)")
     parser.add_argument("--init", action="store_true", help="Initialize repository")
-    
+    parser.add_argument("--repo", default=LOCAL_REPO_PATH,
+                        help=f"Local working copy (default: {LOCAL_REPO_PATH})")
+    parser.add_argument("--remote", default=REMOTE_URL,
+                        help="Remote to clone from when the working copy is missing (URL or bare repo path)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep running, coalesce changes and push in the background")
+    parser.add_argument("--export", action="store_true",
+                        help="Publish a paginated static site (8/16/32 cards per page, per-project JSON) instead of one page")
+    parser.add_argument("--window", type=float, default=SYNC_WINDOW,
+                        help=f"Daemon coalescing window in seconds (default: {SYNC_WINDOW})")
+    parser.add_argument("--interval", type=float, default=SYNC_POLL_INTERVAL,
+                        help=f"Daemon source check interval in seconds (default: {SYNC_POLL_INTERVAL})")
+
     args = parser.parse_args()
-    
+
     if args.history:
-        show_version_history()
+        show_version_history(args.repo, args.since, args.until, args.limit)
         return
-    
+
+    if args.diff:
+        success = show_version_diff(*args.diff[:2], repo=args.repo)
+        sys.exit(0 if success else 1)
+
     if args.init:
-        init_repo()
+        init_repo(args.repo, args.remote)
         return
-    
+
+    if args.daemon:
+        success = run_daemon(args.repo, args.remote, args.window, args.interval, args.message, args.export)
+        sys.exit(0 if success else 1)
+
     # 执行同步
-    success = sync_to_github(args.message)
+    success = sync_to_github(args.message, args.repo, args.remote, args.export)
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,44 @@
+from binary_snapshot import SnapshotReader, load_snapshot, write_snapshot
+
+PROJECTS = [
+    {
+        "name": "alpha",
+        "status": "running",
+        "progress": 42.5,
+        "last_updated": "2026-01-01T00:00:00",
+        "owner": "team-a",
+        "targets": [
+            {
+                "name": "a.com",
+                "note": "primary",
+                "tools": [
+                    {"name": "Nmap", "status": "completed", "progress": 100, "scanned": 1000,
+                     "found": 3, "eta_seconds": None, "ports": [22, 80, "443/tcp"]},
+                    {"name": "Nikto", "status": "running", "progress": 37.5, "scanned": -1,
+                     "found": -2, "eta_seconds": 120, "endpoints": ["/", "/admin/"]},
+                    {"name": "Strix", "status": "pending", "found": 2 ** 40,
+                     "vulns": ["XSS"], "ports": [8080], "severity": {"high": 1}},
+                ],
+            },
+            {"name": "b.com"},
+        ],
+    },
+    {"name": "beta", "status": None, "progress": 0, "last_updated": "", "targets": []},
+    {"name": "gamma", "targets": [{"name": "c.com", "tools": [
+        {"name": "Nmap", "ports": ["80", "443"], "found": 1.5},
+        {"name": "Nmap", "ports": "80,443", "eta_seconds": -5, "progress": True},
+    ]}]},
+]
+
+
+def test_round_trip_is_lossless(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    write_snapshot(str(path), PROJECTS)
+    assert load_snapshot(str(path)) == {"projects": PROJECTS}
+    with SnapshotReader(str(path)) as reader:
+        assert [reader.get(p["name"]) for p in PROJECTS] == PROJECTS
+        cards = reader.cards()
+    assert cards[0]["progress"] == 42.5
+    assert cards[0]["found"] == 3 - 2 + 2 ** 40
+    assert cards[1]["status"] is None
+    assert cards[2]["found"] == 1.5
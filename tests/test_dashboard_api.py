@@ -0,0 +1,41 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+import dashboard
+
+DATA = {"projects": [{"name": "p", "targets": [{"name": "t.com", "tools": [{"name": "Nmap", "ports": [22, 80]}]}]}]}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps(DATA))
+    monkeypatch.setattr(dashboard, "load_projects", lambda: DATA)
+    index = dashboard.ProjectIndex(str(data_file))
+    handler = type("Handler", (dashboard.DashboardHandler,), {"index": index, "hub": dashboard.EventHub()})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _status(url):
+    try:
+        with urlopen(url) as response:
+            return response.status, json.load(response)
+    except HTTPError as e:
+        return e.code, None
+
+
+def test_finding_by_id(server):
+    status, body = _status(f"{server}/api/findings/1")
+    assert status == 200 and body["value"] == 80
+    assert body["targets"] == [{"project": "p", "target": "t.com", "tool": "Nmap"}]
+    for bad in ("-1", "-2", "2", "+1", "x"):
+        assert _status(f"{server}/api/findings/{bad}")[0] == 404
@@ -0,0 +1,59 @@
+import json
+import os
+
+import findings_diff
+from findings_diff import append_changes, read_changes
+
+
+def test_reader_restarts_after_rotation(tmp_path, monkeypatch):
+    path = str(tmp_path / "changes.jsonl")
+    monkeypatch.setattr(findings_diff, "MAX_CHANGES_BYTES", 100)
+    append_changes([{"n": i} for i in range(20)], path)
+    events, offset, generation = read_changes(0, 3, path)
+    assert [e["n"] for e in events] == [0, 1, 2]
+
+    # 轮转后的新文件已超过原偏移
+    append_changes([{"n": i, "pad": "x" * 40} for i in range(20, 25)], path)
+    events, offset, generation = read_changes(offset, 100, path, generation)
+    assert [e["n"] for e in events] == [20, 21, 22, 23, 24]
+    assert read_changes(offset, 100, path, generation) == ([], offset, generation)
+
+
+def test_generation_survives_inode_reuse(tmp_path):
+    path = str(tmp_path / "changes.jsonl")
+    append_changes([{"n": i} for i in range(5)], path)
+    events, offset, generation = read_changes(0, 100, path)
+    assert [e["n"] for e in events] == list(range(5)) and generation
+
+    # 新的变更流原地写入同一个 inode，且已超过原偏移
+    other = str(tmp_path / "other.jsonl")
+    append_changes([{"n": i, "pad": "x" * 10} for i in range(10, 15)], other)
+    inode = os.stat(path).st_ino
+    with open(other, "rb") as src, open(path, "r+b") as dst:
+        dst.truncate()
+        dst.write(src.read())
+    assert os.stat(path).st_ino == inode and os.path.getsize(path) > offset
+
+    events, offset, new_generation = read_changes(offset, 100, path, generation)
+    assert new_generation != generation
+    assert [e["n"] for e in events] == list(range(10, 15))
+
+
+def test_legacy_feed_without_generation(tmp_path):
+    path = str(tmp_path / "changes.jsonl")
+    with open(path, "w") as f:
+        f.write('{"n":0}\n{"n":1}\n')
+    events, offset, generation = read_changes(0, 100, path)
+    assert [e["n"] for e in events] == [0, 1] and generation is None
+
+    append_changes([{"n": 2}], path)
+    with open(path + ".1") as f:
+        assert f.read() == '{"n":0}\n{"n":1}\n'
+    with open(path) as f:
+        assert "generation" in json.loads(f.readline())
+    events, offset, generation = read_changes(offset, 100, path, generation)
+    assert [e["n"] for e in events] == [2] and generation
+
+
+def test_missing_feed(tmp_path):
+    assert read_changes(0, 10, str(tmp_path / "missing.jsonl")) == ([], 0, None)
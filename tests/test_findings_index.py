@@ -0,0 +1,54 @@
+from findings_index import FindingsIndex, canonical_endpoint
+from tool_parsers import PARSERS
+
+
+def test_endpoint_keeps_trailing_slash():
+    assert canonical_endpoint("admin/") == "/admin/"
+    assert canonical_endpoint("//admin//login") == "/admin/login"
+    assert canonical_endpoint("/admin") != canonical_endpoint("/admin/")
+    assert canonical_endpoint("https://a.com//x/") == "https://a.com/x/"
+
+
+def test_findings_are_normalized_only_in_the_index():
+    tools = []
+    raw = {
+        "endpoints": ["admin/", "//admin/", "/admin"],
+        "ports": ["443/tcp", 443, "80", "bogus"],
+        "vulns": ["+ X-Frame-Options  missing.", "x-frame-options missing"],
+    }
+    for field, values in raw.items():
+        parser = next(p for p in PARSERS.values() if field in p.lists)
+        tool = parser.convert({parser.lists[field]: values})
+        assert tool[field] == values
+        tools.append(dict(tool, name=parser.name))
+
+    index = FindingsIndex()
+    index.update([{"name": "p", "targets": [{"name": "t", "tools": tools}]}])
+    assert sorted(f["value"] for f in index.search("endpoints")) == ["/admin", "/admin/"]
+    assert index.lookup("endpoints", "//admin/") == index.lookup("endpoints", "admin/")
+    assert sorted(f["value"] for f in index.search("ports")) == [80, 443]
+    assert index.lookup("ports", "443/tcp") == index.lookup("ports", 443)
+    assert [f["value"] for f in index.search("vulns")] == ["X-Frame-Options missing"]
+
+
+def _project(name, ports):
+    return {"name": name, "targets": [{"name": f"{name}.com", "tools": [{"name": "Nmap", "ports": ports}]}]}
+
+
+def test_removed_projects_are_pruned_and_findings_compacted():
+    index = FindingsIndex()
+    assert index.update([_project("a", [22, 80]), _project("b", list(range(1000, 1010)))]) == 2
+    # b 已从 targets.json 删除，本轮没有重新计算的项目
+    assert index.update([_project("a", [22, 80])], only=set()) == 1
+    assert set(index.refs) == {"a"}
+    assert index.update([_project("a", [22, 80])], only=set()) == 0
+
+    assert len(index.findings) == 2
+    assert sorted(value for _, value in index.findings) == [22, 80]
+    fid = index.lookup("ports", 80)
+    assert index.findings[fid] == ("ports", 80)
+    assert index.targets_with(fid) == [("a", "a.com", "Nmap")]
+    assert sorted(index.to_json()["refs"]["a"]["a.com"]["Nmap"]) == [0, 1]
+    # 压缩后新的发现项继续分配 ID
+    index.update([_project("a", [22, 80, 443])], only={"a"})
+    assert index.lookup("ports", 443) == 2
@@ -0,0 +1,105 @@
+import random
+
+import history_store
+from history_store import HistoryStore
+
+DAY = 86400
+NOW = 1_800_000_000 - 1_800_000_000 % 3600
+
+
+def _project(name, tools):
+    return {"name": name, "targets": [{"name": f"{name}.com", "tools": [
+        {"name": tool, "status": "running", "progress": progress, "found": found}
+        for tool, (progress, found) in tools.items()
+    ]}]}
+
+
+def _naive_findings(store, since, until, bucket):
+    """逐行在 Python 中分桶的参考实现"""
+    rows = store._conn.execute(
+        f"SELECT series_id, ts, found FROM {history_store._ALL_SAMPLES} WHERE ts < ? ORDER BY ts", (until,)
+    ).fetchall()
+    current, points, i = {}, [], 0
+    for bucket_ts in range(since - since % bucket, until, bucket):
+        while i < len(rows) and rows[i][1] < bucket_ts + bucket:
+            current[rows[i][0]] = rows[i][2]
+            i += 1
+        points.append((bucket_ts, sum(current.values())))
+    return points
+
+
+def test_record_pass_skips_unchanged_values(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.db"))
+    assert store.record_pass([_project("a", {"Nmap": (10, 1), "Nuclei": (0, 0)})], ts=NOW) == 2
+    assert store.record_pass([_project("a", {"Nmap": (10, 1), "Nuclei": (5, 0)})], ts=NOW + 60) == 1
+    assert store.record_pass([_project("a", {"Nmap": (90, 3)})], ts=NOW + 120, only=set()) == 0
+    store.close()
+
+    store = HistoryStore(str(tmp_path / "h.db"))
+    assert store.record_pass([_project("a", {"Nmap": (10, 1), "Nuclei": (5, 0)})], ts=NOW + 180) == 0
+    assert store.history("a", "a.com", "Nuclei", since=0, until=NOW + 600) == [
+        (NOW, "scanning", 0, 0, 0), (NOW + 60, "scanning", 5, 0, 0)]
+
+
+def test_maintain_downsamples_and_expires(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.db"))
+    old = NOW - 10 * DAY
+    expired = NOW - (history_store.HOURLY_RETENTION_DAYS + 1) * DAY
+    store.record_pass([_project("a", {"Nmap": (1, 0)})], ts=expired)
+    for minute, progress in enumerate((10, 20, 30)):
+        store.record_pass([_project("a", {"Nmap": (progress, minute)})], ts=old + minute * 60)
+    store.record_pass([_project("a", {"Nmap": (40, 3)})], ts=old + 3600)
+    store.record_pass([_project("a", {"Nmap": (50, 4)})], ts=NOW)
+    store.maintain(NOW)
+
+    assert store.stats()["samples"] == 1
+    assert store.stats()["samples_hourly"] == 2
+    # 每小时保留最后一个样本，过期小时样本被删除
+    assert store.history("a", "a.com", "Nmap", since=0, until=NOW + 1) == [
+        (old, "scanning", 30, 0, 2), (old + 3600, "scanning", 40, 0, 3), (NOW, "scanning", 50, 0, 4)]
+    # 维护间隔内不再重复维护
+    store.record_pass([_project("a", {"Nmap": (60, 5)})], ts=NOW + 60)
+    assert store.stats()["samples"] == 2
+
+
+def test_findings_over_time_matches_stepwise_reference(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.db"))
+    rng = random.Random(7)
+    found = {f"p{i}": 0 for i in range(6)}
+    for ts in range(NOW - 12 * DAY, NOW, 1800):
+        for name in rng.sample(sorted(found), 2):
+            found[name] += rng.randint(-1, 3)
+        store.record_pass([_project(name, {"Nmap": (0, value)}) for name, value in found.items()], ts=ts)
+    store.maintain(NOW)
+    assert store.stats()["samples_hourly"] and store.stats()["samples"]
+
+    for since, until, bucket in ((NOW - 9 * DAY, NOW, 3600), (NOW - 3 * DAY + 1234, NOW + 1, 86400),
+                                 (NOW - 20 * DAY, NOW - 11 * DAY, 7200)):
+        assert store.findings_over_time(since=since, until=until, bucket=bucket) == \
+            _naive_findings(store, since, until, bucket)
+
+    # 窗口开始前的值作为基线，窗口内没有样本的序列沿用旧值
+    points = store.findings_over_time(since=NOW + DAY, until=NOW + DAY + 7200)
+    assert [total for _, total in points] == [sum(found.values())] * 2
+    only = store.findings_over_time(project="p0", since=NOW - DAY, until=NOW, bucket=DAY)
+    assert len(only) == 2 and only[-1] == (NOW - NOW % DAY, found["p0"])
+
+
+def test_progress_rate_uses_window_endpoints(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.db"))
+    store.record_pass([_project("a", {"Nmap": (0, 0), "Nuclei": (50, 0)}), _project("b", {"Nmap": (10, 0)})],
+                      ts=NOW - 3 * 3600)
+    store.record_pass([_project("a", {"Nmap": (20, 0), "Nuclei": (50, 0)}), _project("b", {"Nmap": (10, 0)})],
+                      ts=NOW - 2 * 3600)
+    store.record_pass([_project("a", {"Nmap": (40, 0), "Nuclei": (50, 0)}), _project("b", {"Nmap": (10, 0)})],
+                      ts=NOW)
+
+    rates = store.progress_rate(since=NOW - 2 * 3600 - 1)
+    assert rates == [{"project": "a", "target": "a.com", "tool": "Nmap", "progress": 40,
+                      "rate_per_hour": 10.0, "eta_hours": 6.0}]
+
+    rates = {(r["project"], r["tool"]): r for r in store.progress_rate(since=0)}
+    assert rates[("a", "Nmap")]["rate_per_hour"] == round(40 / 3, 3)
+    assert rates[("a", "Nuclei")]["rate_per_hour"] is None
+    assert rates[("b", "Nmap")]["eta_hours"] is None
+    assert [r["tool"] for r in store.progress_rate(project="a", tool="Nuclei", since=0)] == ["Nuclei"]
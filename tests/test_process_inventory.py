@@ -0,0 +1,33 @@
+from process_inventory import ProcessSnapshot
+
+
+def test_wrapped_commands_are_identified():
+    snapshot = ProcessSnapshot([
+        (1, ["sudo", "nmap", "-sS", "www.example.com"]),
+        (2, ["nohup", "nikto", "-h", "https://a.com"]),
+        (3, ["timeout", "3600", "strix", "--target", "b.com"]),
+        (4, ["sudo", "-u", "root", "-E", "nice", "-n", "10", "/usr/bin/nmap", "c.com"]),
+        (5, ["timeout", "-s", "KILL", "--kill-after=10", "1h", "env", "LANG=C", "stdbuf", "-oL",
+             "ionice", "-c", "3", "setsid", "python3", "-u", "/opt/strix/strix.py", "d.com"]),
+        (6, ["nice", "-10", "perl", "nikto.pl", "-h", "e.com"]),
+    ])
+    assert snapshot.summary() == {"strix": 2, "nikto": 2, "nmap": 2, "total": 6}
+    assert snapshot.is_running("Nmap", "www.example.com")
+    assert snapshot.is_running("Nikto", "a.com")
+    assert snapshot.is_running("Strix", "b.com")
+    assert snapshot.pids("nmap", "c.com") == [4]
+    assert snapshot.is_running("strix", "d.com")
+    assert snapshot.is_running("nikto", "e.com")
+    # 包装命令自身的参数不是目标
+    assert not snapshot.is_running("nmap", "root")
+    assert not snapshot.is_running("strix", "3600")
+
+
+def test_wrappers_without_tool_are_ignored():
+    snapshot = ProcessSnapshot([
+        (1, ["sudo", "-u", "nmap", "vim"]),
+        (2, ["timeout", "10", "sleep", "nmap"]),
+        (3, ["nohup"]),
+        (4, ["grep", "nikto"]),
+    ])
+    assert snapshot.summary()["total"] == 0
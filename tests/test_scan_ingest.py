@@ -0,0 +1,26 @@
+import json
+
+import scan_ingest
+from scan_ingest import load_nikto_json
+
+HOSTS = [{"host": f"h{h}.com", "vulnerabilities": [
+    {"id": str(i), "msg": f'Issue {h}-{i}: "quoted" é \\ /path/' + 'x' * (i % 50)} for i in range(300)
+]} for h in range(3)]
+
+
+def test_large_nikto_json_is_scanned_in_chunks(tmp_path, monkeypatch):
+    path = tmp_path / "a_nikto.json"
+    path.write_text(json.dumps(HOSTS, ensure_ascii=False), encoding="utf-8")
+    whole = load_nikto_json(str(path))
+    assert whole["status"] == "completed" and whole["vulns_found"] == 900
+
+    monkeypatch.setattr(scan_ingest, "MAX_READ_BYTES", 1024)
+    monkeypatch.setattr(scan_ingest, "READ_CHUNK", 97)
+    assert load_nikto_json(str(path)) == whole
+
+    text = path.read_text(encoding="utf-8")
+    path.write_text(text[:len(text) // 2], encoding="utf-8")
+    partial = load_nikto_json(str(path))
+    assert partial["status"] == "scanning"
+    assert 0 < partial["vulns_found"] < 900
+    assert partial["vulnerabilities"] == whole["vulnerabilities"][:partial["vulns_found"]]
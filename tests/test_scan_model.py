@@ -0,0 +1,92 @@
+import json
+import random
+
+import pytest
+
+import data_collector
+import dashboard
+from scan_model import Project, Target, ToolResult, _Record, json_default
+
+TOOL = {"name": "Nuclei", "status": "scanning", "progress": 40, "scanned": 12, "found": 3,
+        "vulns": [{"id": "CVE-1"}], "eta_seconds": 90}
+
+
+def _random_project(rng, name):
+    targets = []
+    for t in range(rng.randint(0, 4)):
+        tools = [{"name": f"tool{i}", "status": rng.choice(["scanning", "completed", "pending", "failed"]),
+                  "progress": rng.randint(0, 100), "scanned": rng.randint(0, 50), "found": rng.randint(0, 9)}
+                 for i in range(rng.randint(0, 3))]
+        targets.append({"name": f"{name}-{t}.com", "tools": tools})
+    return {"name": name, "targets": targets}
+
+
+def test_record_requires_get_and_to_dict():
+    with pytest.raises(TypeError):
+        _Record()
+
+    class Partial(_Record):
+        __slots__ = ()
+
+        def get(self, key, default=None):
+            return default
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_tool_result_behaves_like_its_dict():
+    tool = ToolResult.from_dict(TOOL)
+    assert tool == TOOL and tool.to_dict() == TOOL
+    assert dict(tool.items()) == TOOL and sorted(tool) == sorted(TOOL) and len(tool) == len(TOOL)
+    for key, value in TOOL.items():
+        assert key in tool and tool[key] == value and tool.get(key) == value
+    assert "ports" not in tool and tool.get("ports", []) == []
+    with pytest.raises(KeyError):
+        tool["ports"]
+    assert json.loads(json.dumps(tool, default=json_default)) == TOOL
+    assert not hasattr(tool, "__dict__")
+
+
+def test_project_round_trips_through_json():
+    data = {"name": "alpha", "status": "scanning", "progress": 40, "last_updated": "2026-01-01T00:00:00",
+            "targets": [{"name": "a.com", "tools": [TOOL, {"name": "Nmap", "status": "completed",
+                                                          "progress": 100, "scanned": 1, "found": 2,
+                                                          "ports": [80]}]}]}
+    project = Project.from_dict(data)
+    assert project == data
+    assert project["targets"][0]["tools"][1]["ports"] == [80]
+    assert json.loads(json.dumps(project, default=json_default)) == data
+    assert "last_updated" not in Project("beta", [])
+    with pytest.raises(TypeError):
+        hash(project)
+
+
+def test_precomputed_aggregates_match_dict_rules():
+    rng = random.Random(3)
+    projects = []
+    for i in range(200):
+        raw = _random_project(rng, f"p{i}")
+        project = Project(raw["name"], [Target.from_dict(target) for target in raw["targets"]])
+        projects.append(project)
+
+        assert project.progress == data_collector.calculate_project_progress(raw["targets"])
+        assert project.status == data_collector.get_project_status(raw["targets"])
+        assert project.target_count == len(raw["targets"])
+        assert project.found == sum(tool["found"] for t in raw["targets"] for tool in t["tools"])
+        counts = {}
+        for target in raw["targets"]:
+            for tool in target["tools"]:
+                counts[tool["status"]] = counts.get(tool["status"], 0) + 1
+        assert project.status_counts == counts
+
+    # 预计算的卡片与按字典计算的卡片一致
+    as_dicts = [json.loads(json.dumps(project, default=json_default)) for project in projects]
+    assert dashboard.build_cards(projects) == dashboard.build_cards(as_dicts)
+
+
+def test_from_dict_keeps_stored_status_and_progress():
+    project = Project.from_dict({"name": "x", "status": "paused", "progress": 7,
+                                 "targets": [{"name": "a", "tools": [TOOL]}]})
+    assert project.status == "paused" and project.progress == 7
+    assert project.found == 3 and project.targets[0].progress == 40
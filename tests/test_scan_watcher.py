@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+import data_collector
+import scan_watcher
+from scan_watcher import IN_Q_OVERFLOW, DirectoryWatcher, _EVENT_HEADER
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    directory = tmp_path / "scans"
+    directory.mkdir()
+    w = DirectoryWatcher(str(directory))
+    if not w.uses_inotify:
+        pytest.skip("inotify not available")
+    yield w
+    w.close()
+
+
+def test_directory_recreated_forces_rescan(watcher, tmp_path):
+    directory = tmp_path / "scans"
+    (directory / "a_nmap.xml").write_text("x")
+    assert watcher.wait(1) == {"a_nmap.xml"}
+
+    (directory / "a_nmap.xml").unlink()
+    directory.rmdir()
+    assert watcher.wait(1) is None
+    directory.mkdir()
+    assert watcher.wait(2) is None
+    (directory / "b_nikto.json").write_text("{}")
+    assert watcher.wait(1) == {"b_nikto.json"}
+
+
+def test_queue_overflow_forces_rescan(watcher):
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    real_fd, watcher._fd = watcher._fd, read_fd
+    try:
+        os.write(write_fd, _EVENT_HEADER.pack(-1, IN_Q_OVERFLOW, 0, 0))
+        assert watcher._drain() is None
+    finally:
+        watcher._fd = real_fd
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+class _FakeWatcher:
+    results = []
+
+    def __init__(self, path):
+        self.uses_inotify = True
+
+    def wait(self, timeout):
+        return self.results.pop(0)
+
+    def close(self):
+        pass
+
+
+def test_daemon_falls_back_to_full_passes(tmp_path, monkeypatch):
+    passes = []
+
+    def collect(workers=None, changed=None):
+        passes.append(changed)
+        if len(passes) == 5:
+            raise KeyboardInterrupt
+        return {}
+
+    clock = iter(range(0, 1000, 10))
+    monkeypatch.setattr(data_collector, "SCAN_PROC_DIR", str(tmp_path))
+    monkeypatch.setattr(data_collector, "collect_data", collect)
+    monkeypatch.setattr(data_collector, "take_snapshot", lambda: None)
+    monkeypatch.setattr(data_collector.time, "monotonic", lambda: next(clock))
+    monkeypatch.setattr(scan_watcher, "DirectoryWatcher", _FakeWatcher)
+    _FakeWatcher.results = [{"a"}, None, {"b"}, {"c"}]
+
+    data_collector.run_daemon(interval=1, jitter=0, watch=True, full_scan=15)
+    # 首轮全量；事件丢失后全量；距上次全量达到 full_scan 后全量
+    assert passes == [None, {"a"}, None, {"b"}, None]
@@ -0,0 +1,25 @@
+from search_index import SearchIndex
+
+
+def _projects(vulns, status="scanning", last_updated="2026-01-01T00:00:00"):
+    project = {"name": "alpha", "status": status,
+               "targets": [{"name": "a.com", "tools": [{"name": "Nikto", "vulns": vulns, "found": len(vulns)}]}]}
+    if last_updated is not None:
+        project["last_updated"] = last_updated
+    return [project]
+
+
+def test_changed_fields_are_reindexed_with_same_timestamp():
+    index = SearchIndex()
+    assert index.update(_projects(["X-Frame-Options missing"])) == 1
+    assert index.search("frame")
+    assert index.update(_projects(["X-Frame-Options missing"])) == 0
+
+    # last_updated 未变，索引字段变了
+    assert index.update(_projects(["Outdated nginx"])) == 1
+    assert not index.search("frame")
+    assert index.search("vuln:nginx")
+
+    assert index.update(_projects(["Outdated nginx"], status="completed", last_updated=None)) == 1
+    assert index.search("status:done")
+    assert not index.search("status:scanning")
@@ -0,0 +1,35 @@
+import json
+import os
+
+from dashboard import export_static_site
+from process_inventory import ProcessSnapshot
+
+DATA = {"projects": [
+    {"name": f"p{i}", "status": "running" if i % 2 else "completed", "progress": i,
+     "targets": [{"name": f"t{i}.com", "tools": [{"name": "Nmap", "status": "completed", "found": i}]}]}
+    for i in range(20)
+]}
+
+
+def _read_tree(root):
+    tree = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                tree[os.path.relpath(path, root)] = f.read()
+    return tree
+
+
+def test_unchanged_pages_are_byte_identical(tmp_path):
+    export_static_site(str(tmp_path), DATA, ProcessSnapshot([]))
+    before = _read_tree(tmp_path)
+    snapshot = ProcessSnapshot([(1, ["nmap", "t1.com"])])
+    files, changed = export_static_site(str(tmp_path), DATA, snapshot)
+    after = _read_tree(tmp_path)
+
+    assert before.keys() == after.keys()
+    assert [name for name in after if after[name] != before[name]] == ["status.json"]
+    assert changed == 1
+    assert json.loads(after["status.json"])["status"]["nmap"] == 1
+    assert b"generatedAt" not in after["index.html"]
@@ -0,0 +1,88 @@
+import json
+import subprocess
+import time
+
+import pytest
+
+import sync_github
+from sync_github import BackgroundPusher, SyncEngine
+
+
+def _remote_log(bare):
+    result = subprocess.run(["git", "--git-dir", bare, "log", "--format=%s", "--all"],
+                            capture_output=True, text=True)
+    return result.stdout.split("\n")[:-1] if result.returncode == 0 else []
+
+
+def _remote_file(bare, path):
+    return subprocess.run(["git", "--git-dir", bare, "show", f"HEAD:{path}"],
+                          capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    bare = str(tmp_path / "remote.git")
+    subprocess.run(["git", "init", "-q", "--bare", bare], check=True)
+    repo = str(tmp_path / "wc")
+    assert sync_github.init_repo(repo, bare)
+    data_file = tmp_path / "data.json"
+    monkeypatch.setattr(sync_github, "DASHBOARD_DATA_FILE", str(data_file))
+    monkeypatch.setattr(sync_github, "HTML_SOURCE_DIR", str(tmp_path / "no-html"))
+
+    def write(marker):
+        data_file.write_text(json.dumps({"projects": [{"name": marker, "status": "running", "progress": 1}]}))
+
+    return repo, bare, write
+
+
+def test_rapid_changes_coalesce_into_one_pushed_commit(setup):
+    repo, bare, write = setup
+    engine = SyncEngine(repo, window=60)
+    write("first")
+    assert not engine.poll(now=0)
+    write("second-change")
+    assert not engine.poll(now=10)
+    write("third-change-longer")
+    assert not engine.poll(now=30)
+    assert not engine.poll(now=59)
+    assert engine.poll(now=61)
+    # 窗口过后没有新变化不再提交
+    assert not engine.poll(now=200)
+    assert engine.close()
+
+    assert len(_remote_log(bare)) == 1
+    html = _remote_file(bare, "index.html")
+    assert "third-change-longer" in html and "second-change" not in html
+
+
+def test_failed_push_is_retried_without_blocking_commits(setup):
+    repo, bare, write = setup
+    sync_github.git("remote", "set-url", "origin", bare + "-missing", repo=repo)
+    engine = SyncEngine(repo, window=0)
+    engine.pusher.close()
+    engine.pusher = BackgroundPusher(repo, backoff=0.05, backoff_max=0.2)
+
+    write("one")
+    started = time.monotonic()
+    assert engine.poll(now=0)
+    write("two-two")
+    assert engine.poll(now=1)
+    # 推送失败时提交照常进行，不等待推送
+    assert time.monotonic() - started < 5
+    deadline = time.monotonic() + 5
+    while engine.pusher.failures < 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert engine.pusher.failures >= 2
+    assert engine.pusher.pending
+    assert _remote_log(bare) == []
+
+    # 远程恢复后退避重试把积压的提交一起推送
+    sync_github.git("remote", "set-url", "origin", bare, repo=repo)
+    deadline = time.monotonic() + 5
+    while engine.pusher.pending and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert not engine.pusher.pending
+    assert engine.pusher.failures == 0
+    assert len(_remote_log(bare)) == 2
+    assert "two-two" in _remote_file(bare, "index.html")
+    assert engine.close()
@@ -0,0 +1,177 @@
+import json
+import os
+import subprocess
+from datetime import datetime
+
+import sync_github
+from sync_github import commit_static_site, latest_version
+
+DATA = {"projects": [
+    {"name": "alpha", "status": "running", "progress": 10,
+     "targets": [{"name": "a.com", "tools": [{"name": "Nmap", "status": "running", "found": 1}]}]}
+]}
+
+
+def _init(tmp_path):
+    repo = str(tmp_path / "repo")
+    subprocess.run(["git", "init", "-q", repo], check=True)
+    sync_github.git("commit", "-q", "--allow-empty", "-m", "init", repo=repo)
+    return repo
+
+
+def _porcelain(repo):
+    return sync_github.git("status", "--porcelain", repo=repo)
+
+
+def test_static_site_is_committed_after_failed_commit(tmp_path, monkeypatch):
+    repo = _init(tmp_path)
+    real_git = sync_github.git
+
+    def failing_git(*args, **kwargs):
+        if args[0] == "commit":
+            return None
+        return real_git(*args, **kwargs)
+
+    monkeypatch.setattr(sync_github, "git", failing_git)
+    assert commit_static_site(DATA, repo=repo) is False
+    assert latest_version(repo) == {}
+
+    monkeypatch.setattr(sync_github, "git", real_git)
+    tag = commit_static_site(DATA, repo=repo)
+    assert tag and latest_version(repo)["version"] == tag
+    assert _porcelain(repo) == ""
+    assert "index.html" in real_git("ls-files", repo=repo).split()
+
+
+def test_legacy_version_file_is_read_without_migrating(tmp_path):
+    repo = _init(tmp_path)
+    legacy = {"versions": [
+        {"version": "v2", "timestamp": "2026-01-02T00:00:00", "message": "second"},
+        {"version": "v1", "timestamp": "2026-01-01T00:00:00", "message": "first"},
+    ]}
+    with open(os.path.join(repo, "versions.json"), "w") as f:
+        json.dump(legacy, f)
+    sync_github.git("add", "versions.json", repo=repo)
+    sync_github.git("commit", "-q", "-m", "legacy", repo=repo)
+
+    assert [v["version"] for v in sync_github.iter_versions(repo)] == ["v1", "v2"]
+    assert latest_version(repo)["version"] == "v2"
+    assert sync_github.find_version("v1", repo)["message"] == "first"
+    sync_github.show_version_history(repo)
+    assert _porcelain(repo) == ""
+    assert not os.path.exists(os.path.join(repo, "versions.jsonl"))
+
+    tag = commit_static_site(DATA, repo=repo)
+    assert [v["version"] for v in sync_github.iter_versions(repo)] == ["v1", "v2", tag]
+    assert _porcelain(repo) == ""
+    assert "versions.json" not in sync_github.git("ls-files", repo=repo).split()
+
+
+class _FrozenDatetime:
+    @staticmethod
+    def now():
+        return datetime(2026, 1, 1, 12, 0, 0)
+
+
+def test_version_tags_are_unique_and_ambiguous_tags_rejected(tmp_path, monkeypatch):
+    repo = _init(tmp_path)
+    monkeypatch.setattr(sync_github, "datetime", _FrozenDatetime)
+    tags = []
+    for _ in range(3):
+        tag = sync_github.generate_version_tag(repo)
+        sync_github.append_version({"version": tag, "timestamp": ""}, repo)
+        tags.append(tag)
+    assert tags == ["v20260101-120000", "v20260101-120000-2", "v20260101-120000-3"]
+
+    sync_github.append_version({"version": "vdup", "timestamp": "", "message": "a"}, repo)
+    sync_github.append_version({"version": "vdup", "timestamp": "", "message": "b"}, repo)
+    assert sync_github.find_version("vdup", repo) is None
+    assert sync_github.find_version("#4", repo)["message"] == "a"
+    assert sync_github.find_version("#5", repo)["message"] == "b"
+    assert sync_github.find_version("#6", repo) is None
+    assert sync_github.find_version(tags[1], repo)["version"] == tags[1]
+
+
+def _fleet(count, **overrides):
+    projects = []
+    for i in range(count):
+        project = {"name": f"p{i}", "status": "running", "progress": 10,
+                   "targets": [{"name": f"t{i}", "tools": [{"name": "Nmap", "found": 1}]}]}
+        project.update(overrides.get(f"p{i}", {}))
+        projects.append(project)
+    return {"projects": projects}
+
+
+def test_version_log_stores_only_changed_projects(tmp_path, capsys):
+    repo = _init(tmp_path)
+    first = sync_github.commit_dashboard(None, _fleet(50), repo=repo)
+    second_data = _fleet(51, p3={"progress": 80, "status": "completed"})
+    del second_data["projects"][7]
+    second = sync_github.commit_dashboard(None, second_data, repo=repo)
+    assert first and second
+
+    entries = list(sync_github.iter_versions(repo))
+    assert len(entries[0]["projects"]) == 50
+    assert entries[1]["projects"] == {"p3": ["completed", 80, 1, 1], "p50": ["running", 10, 1, 1]}
+    assert entries[1]["removed"] == ["p7"]
+    assert entries[1]["stats"]["projects"] == 50
+
+    states = sync_github.replay_projects(repo, [1, 2])
+    assert len(states[2][1]) == 50 and "p7" not in states[2][1]
+    assert sync_github.latest_projects(repo) == (states[2][1], 1)
+
+    capsys.readouterr()
+    assert sync_github.show_version_diff("#1", "latest", repo)
+    out = capsys.readouterr().out
+    assert "+ p50" in out and "- p7" in out and "~ p3: running 10% -> completed 80%" in out
+
+
+def test_simple_html_streams_every_project():
+    data = _fleet(3)
+    data["projects"][1]["targets"][0]["tools"][0]["found"] = 5
+    chunks = list(sync_github.iter_simple_html(data))
+    assert len(chunks) == 5
+    assert chunks[0] == sync_github.SIMPLE_HTML_HEAD
+    assert "Found: 5" in chunks[2]
+    assert "".join(chunks) == sync_github.generate_simple_html(data)
+
+
+def test_static_site_export_skips_gzip_and_stages_deletions(tmp_path):
+    import dashboard
+
+    repo = _init(tmp_path)
+    big = _fleet(60)
+    # 旧版本导出的 .gz 和更多的列表页已提交
+    dashboard.export_static_site(repo, big)
+    sync_github.git("add", "-A", repo=repo)
+    sync_github.git("commit", "-q", "-m", "old export", repo=repo)
+    tracked = sync_github.git("ls-files", repo=repo).split()
+    assert any(name.endswith(".gz") for name in tracked)
+    assert "list/all/8/8.html" in tracked
+
+    assert commit_static_site(_fleet(3), repo=repo)
+    assert _porcelain(repo) == ""
+    tracked = sync_github.git("ls-files", repo=repo).split()
+    assert not any(name.endswith(".gz") for name in tracked)
+    assert "list/all/8/8.html" not in tracked
+    assert "list/all/8/1.html" in tracked
+
+
+def test_latest_projects_replays_from_checkpoint(tmp_path, monkeypatch):
+    repo = _init(tmp_path)
+    monkeypatch.setattr(sync_github, "VERSION_CHECKPOINT", 3)
+    for step in range(8):
+        data = _fleet(5 + step, **{f"p{step % 4}": {"progress": 10 + step}})
+        assert sync_github.commit_dashboard(None, data, repo=repo)
+
+        entries = list(sync_github.iter_versions(repo))
+        full = sync_github.replay_projects(repo, [len(entries)])[len(entries)][1]
+        state, since_checkpoint = sync_github.latest_projects(repo)
+        assert state == full
+        assert state == sync_github.version_stats(data)[1]
+        assert since_checkpoint == step % 3
+
+    checkpoints = [i for i, entry in enumerate(sync_github.iter_versions(repo)) if not entry.get("delta")]
+    assert checkpoints == [0, 3, 6]
+    with open(os.path.join(repo, "versions.jsonl"), "rb") as f:
+        assert list(sync_github._reversed_versions(f, block=7)) == list(sync_github.iter_versions(repo))[::-1]
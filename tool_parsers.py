@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+漏洞扫描看板 - 扫描工具解析器注册表
+每个工具声明自己的文件后缀和字段映射，收集脚本每轮只需一次 os.scandir，
+按文件名后缀把文件分派给对应解析器；新增工具只需注册一条声明
+"""
+
+import json
+
+from scan_ingest import load_nikto_json, load_nikto_xml, load_nmap_xml
+
+
+def load_json(path):
+    """默认加载器: 读取 JSON 摘要文件"""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class ToolParser:
+    """单个扫描工具的文件格式声明
+
+    suffixes: 文件名后缀 -> 加载器，文件名形如 {target}{suffix}，
+              同一目标存在多个文件时按声明顺序取第一个
+    fields:   看板字段 -> 源字段，数值字段缺失时为 0
+    lists:    看板列表字段 -> 源字段，缺失时为 []；保留收集到的原值，规范化只在发现项索引内进行
+    log_suffix: 日志文件名后缀（位于 SCAN_LOG_DIR，形如 vuln_scan_{target}{log_suffix}）
+    """
+
+    def __init__(self, name, suffixes, fields, lists=None, log_suffix=None):
+        self.name = name
+        self.suffixes = suffixes
+        self.fields = fields
+        self.lists = lists or {}
+        self.log_suffix = log_suffix
+
+    @property
+    def default_suffix(self):
+        return next(iter(self.suffixes))
+
+    def empty(self):
+        """未找到任何文件时的默认数据"""
+        return {
+            "name": self.name,
+            "status": "pending",
+            "progress": 0,
+            "scanned": 0,
+            "found": 0
+        }
+
+    def convert(self, data):
+        """按字段映射把源数据转换为看板工具数据"""
+        result = self.empty()
+        result["status"] = data.get("status", "pending")
+        result["progress"] = data.get("progress", 0)
+        for field, source in self.fields.items():
+            result[field] = data.get(source, 0)
+        for field, source in self.lists.items():
+            result[field] = data.get(source, [])
+        return result
+
+    def parse_file(self, path, suffix=None):
+        """读取并转换一个文件，失败时返回 None"""
+        loader = self.suffixes.get(suffix or self.default_suffix, load_json)
+        try:
+            return self.convert(loader(path))
+        except Exception:
+            return None
+
+
+# 工具名 -> 解析器
+PARSERS = {}
+
+# 文件名后缀 -> (解析器, 后缀在该解析器中的优先级)
+_SUFFIX_INDEX = {}
+
+
+def register_parser(parser):
+    """注册（或替换）一个工具解析器"""
+    old = PARSERS.get(parser.name)
+    if old:
+        for suffix in old.suffixes:
+            _SUFFIX_INDEX.pop(suffix, None)
+    PARSERS[parser.name] = parser
+    for rank, suffix in enumerate(parser.suffixes):
+        _SUFFIX_INDEX[suffix] = (parser, rank)
+    return parser
+
+
+def get_parser(tool_name):
+    return PARSERS.get(tool_name)
+
+
+def match_file(filename):
+    """按文件名匹配解析器，返回 (解析器, 目标, 后缀, 优先级) 或 None
+
+    后缀总是以目标名后的最后一个 "_" 开头，一次字典查找即可
+    """
+    target, sep, tail = filename.rpartition("_")
+    if not sep or not target:
+        return None
+    suffix = "_" + tail
+    entry = _SUFFIX_INDEX.get(suffix)
+    if entry is None:
+        return None
+    parser, rank = entry
+    return parser, target, suffix, rank
+
+
+def match_log(filename, prefix):
+    """按日志文件名匹配解析器，返回 (解析器, 目标) 或 None"""
+    if not filename.startswith(prefix):
+        return None
+    target, sep, tail = filename[len(prefix):].rpartition("_")
+    if not sep or not target:
+        return None
+    suffix = "_" + tail
+    for parser in PARSERS.values():
+        if parser.log_suffix == suffix:
+            return parser, target
+    return None
+
+
+# Strix API 扫描器 - 收集端点信息
+register_parser(ToolParser(
+    "Strix",
+    suffixes={"_strix.json": load_json},
+    fields={"scanned": "endpoints_scanned", "found": "endpoints_found"},
+    lists={"endpoints": "discovered_endpoints"},
+    log_suffix="_strix.log",
+))
+
+# Nikto Web 漏洞扫描（摘要 JSON、原生 JSON 或原生 XML）
+register_parser(ToolParser(
+    "Nikto",
+    suffixes={"_nikto.json": load_nikto_json, "_nikto.xml": load_nikto_xml},
+    fields={"scanned": "items_scanned", "found": "vulns_found"},
+    lists={"vulns": "vulnerabilities"},
+    log_suffix="_nikto.log",
+))
+
+# Nmap 端口扫描（摘要 JSON 或 -oX 原生 XML）
+register_parser(ToolParser(
+    "Nmap",
+    suffixes={"_nmap.json": load_json, "_nmap.xml": load_nmap_xml},
+    fields={"scanned": "ports_scanned", "found": "open_ports"},
+    lists={"ports": "open_ports_list"},
+    log_suffix="_nmap.log",
+))
+
+# Nuclei 模板扫描（加入 SCAN_TOOLS 后启用）
+register_parser(ToolParser(
+    "Nuclei",
+    suffixes={"_nuclei.json": load_json},
+    fields={"scanned": "templates_scanned", "found": "findings_found"},
+    lists={"vulns": "findings"},
+))
+
+# OWASP ZAP（加入 SCAN_TOOLS 后启用）
+register_parser(ToolParser(
+    "ZAP",
+    suffixes={"_zap.json": load_json},
+    fields={"scanned": "urls_scanned", "found": "alerts_found"},
+    lists={"vulns": "alerts"},
+))